@@ -2,6 +2,7 @@ import asyncio
 import os
 
 from celery import Celery
+from celery.signals import worker_init, worker_process_shutdown
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "shargain.settings.local")
 
@@ -12,13 +13,51 @@ app.config_from_object("django.conf:settings", namespace="CELERY")
 app.autodiscover_tasks()
 
 app.conf.beat_schedule = {
-    "check_for_closed_offers": {
+    "get_offer_source_html": {
         "task": "shargain.offers.tasks.get_offer_source_html",
         "schedule": 5,
-    }
+    },
+    "check_for_closed_offers": {
+        "task": "shargain.offers.tasks.check_for_closed_offers",
+        "schedule": 5 * 60,
+    },
+    "close_disappeared_offers": {
+        "task": "shargain.offers.tasks.close_disappeared_offers",
+        "schedule": 15 * 60,
+    },
+    "process_pending_telegram_updates": {
+        "task": "shargain.telegram.tasks.process_pending_telegram_updates",
+        "schedule": 60,
+    },
+    "collect_offer_source_html_garbage": {
+        "task": "shargain.offers.tasks.collect_offer_source_html_garbage",
+        "schedule": 24 * 60 * 60,
+    },
+    "rollup_checkins": {
+        "task": "shargain.offers.tasks.rollup_checkins",
+        "schedule": 15 * 60,
+    },
 }
 
 
+@worker_init.connect
+def start_metrics_exporter(**kwargs):
+    from django.conf import settings
+
+    from shargain.commons.metrics import start_worker_metrics_exporter
+    from shargain.offers.services.revalidation import ConditionalHitRatioCollector
+
+    if settings.WORKER_METRICS_PORT:
+        start_worker_metrics_exporter(settings.WORKER_METRICS_PORT, derived_collectors=[ConditionalHitRatioCollector])
+
+
+@worker_process_shutdown.connect
+def mark_metrics_process_dead(pid, **kwargs):
+    from shargain.commons.metrics import mark_worker_process_dead
+
+    mark_worker_process_dead(pid)
+
+
 async def wait(t):
     await asyncio.sleep(t)
     print(f"{t} done")
@@ -0,0 +1,32 @@
+import uuid
+
+from django.core.cache import cache
+
+
+class CacheNamespace:
+    """
+    Group of cache entries which are invalidated together.
+
+    Keys of the entries contain the current version of the namespace, so bumping the version makes all of them
+    unreachable at once (they expire on their own). The version lives in the shared cache next to the entries, hence
+    an invalidation made by one process is seen by all of them. Versions are random tokens rather than counters, so a
+    version evicted from the cache is never recreated with the value of already invalidated entries.
+    """
+
+    def __init__(self, prefix: str):
+        self.prefix = prefix
+        self.version_key = f"{prefix}:version"
+
+    def get_version(self) -> str:
+        version: str | None = cache.get(self.version_key)
+        if version is None:
+            # Another process may add the version at the same time, the one stored first wins
+            cache.add(self.version_key, uuid.uuid4().hex, timeout=None)
+            version = cache.get(self.version_key, uuid.uuid4().hex)
+        return version
+
+    def make_key(self, *parts: object) -> str:
+        return ":".join([self.prefix, self.get_version(), *map(str, parts)])
+
+    def invalidate(self) -> None:
+        cache.set(self.version_key, uuid.uuid4().hex, timeout=None)
@@ -0,0 +1,52 @@
+"""
+Prometheus metrics of Celery workers.
+
+The web process exports its metrics under ``/metrics`` (django_prometheus), but tasks run in Celery prefork child
+processes, whose metrics are not visible there. Workers are therefore run in prometheus_client's multiprocess mode:
+every process writes its metrics to files in ``PROMETHEUS_MULTIPROC_DIR`` (the variable has to be set before
+prometheus_client is imported, i.e. in the worker's environment), and an exporter started in the main worker
+process merges them on every scrape.
+"""
+
+import logging
+import os
+import shutil
+from collections.abc import Callable, Iterable
+from pathlib import Path
+
+from prometheus_client import CollectorRegistry, start_http_server
+from prometheus_client.multiprocess import MultiProcessCollector, mark_process_dead
+from prometheus_client.registry import Collector
+
+logger = logging.getLogger(__name__)
+
+
+def start_worker_metrics_exporter(
+    port: int, derived_collectors: Iterable[Callable[[Collector], Collector]] = ()
+) -> CollectorRegistry | None:
+    """
+    Starts an HTTP exporter of metrics merged from all processes of the worker. Must be called in the main worker
+    process before child processes are started, as files left by the previous run are removed.
+
+    :param derived_collectors: factories of collectors computing metrics from the merged ones (e.g. ratios), called
+        with the collector of merged metrics
+    :return: registry of the exporter; None if the exporter was not started
+    """
+    if not (path := os.environ.get("PROMETHEUS_MULTIPROC_DIR")):
+        logger.warning("Worker metrics are not exported, PROMETHEUS_MULTIPROC_DIR is not set")
+        return None
+    shutil.rmtree(path, ignore_errors=True)
+    Path(path).mkdir(parents=True)
+    registry = CollectorRegistry()
+    merged = MultiProcessCollector(registry, path=path)
+    for derived_collector in derived_collectors:
+        registry.register(derived_collector(merged))
+    start_http_server(port, registry=registry)
+    logger.info("Exporting worker metrics [port=%s]", port)
+    return registry
+
+
+def mark_worker_process_dead(pid: int):
+    """Drops live gauges of a finished worker process, counters and histograms are kept in the merged metrics."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        mark_process_dead(pid)
@@ -0,0 +1,38 @@
+import pytest
+from django.core.cache import cache
+
+from shargain.commons.cache import CacheNamespace
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+class TestCacheNamespace:
+    def test_make_key_is_stable_until_invalidated(self):
+        namespace = CacheNamespace("tests")
+        key = namespace.make_key(1, "a")
+
+        assert namespace.make_key(1, "a") == key
+        assert key.startswith("tests:")
+        assert key.endswith(":1:a")
+        namespace.invalidate()
+        assert namespace.make_key(1, "a") != key
+
+    def test_evicted_version_does_not_restore_invalidated_entries(self):
+        namespace = CacheNamespace("tests")
+        key = namespace.make_key(1)
+
+        cache.delete(namespace.version_key)
+
+        assert namespace.make_key(1) != key
+
+    def test_version_is_shared_between_instances(self):
+        key = CacheNamespace("tests").make_key(1)
+
+        CacheNamespace("tests").invalidate()
+
+        assert CacheNamespace("tests").make_key(1) != key
@@ -0,0 +1,80 @@
+"""
+Caches running on the production backend (Redis), where a hit has to be cheaper than the query it replaces.
+
+Run with TEST_REDIS_URL pointing to a disposable Redis database; skipped if Redis is not available.
+"""
+
+import os
+from unittest import mock
+
+import pytest
+import redis
+from django.core.cache import cache
+from django.test import Client
+
+from shargain.commons.application.actor import Actor
+from shargain.notifications.tests.factories import NotificationConfigFactory
+from shargain.offers.application.queries.list_targets import list_targets
+from shargain.offers.tests.factories import ScrapingUrlFactory, ScrappingTargetFactory
+from shargain.telegram.application.chat_target_resolver import ChatTargetResolver
+
+TEST_REDIS_URL = os.environ.get("TEST_REDIS_URL", "redis://localhost:6379/15")
+
+
+@pytest.fixture
+def redis_commands(settings):
+    """Switches the cache to Redis and yields a mock counting Redis commands."""
+    try:
+        redis.Redis.from_url(TEST_REDIS_URL).ping()
+    except redis.ConnectionError:
+        pytest.skip("Redis is not available")
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": TEST_REDIS_URL}
+    }
+    cache.clear()
+    with mock.patch.object(
+        redis.Redis, "execute_command", autospec=True, side_effect=redis.Redis.execute_command
+    ) as execute_command:
+        yield execute_command
+    cache.clear()
+
+
+@pytest.mark.django_db
+class TestCachesOnRedis:
+    def test_scrapping_target_list_hit(self, redis_commands, django_assert_num_queries):
+        ScrapingUrlFactory()
+        client = Client()
+        # count, targets and prefetched URLs
+        with django_assert_num_queries(3):
+            client.get("/api/scrapping-targets/")
+        redis_commands.reset_mock()
+
+        with django_assert_num_queries(0):
+            client.get("/api/scrapping-targets/")
+
+        # version of the namespace and the page
+        assert redis_commands.call_count == 2
+
+    def test_user_query_hit(self, redis_commands, django_assert_num_queries):
+        target = ScrappingTargetFactory()
+        actor = Actor(user_id=target.owner_id)
+        with django_assert_num_queries(1):
+            list_targets(actor)
+        redis_commands.reset_mock()
+
+        with django_assert_num_queries(0):
+            list_targets(actor)
+
+        assert redis_commands.call_count == 2
+
+    def test_chat_target_hit(self, redis_commands, django_assert_num_queries):
+        config = NotificationConfigFactory(chatid="42")
+        ScrappingTargetFactory(notification_config=config)
+        with django_assert_num_queries(1):
+            ChatTargetResolver.resolve(42)
+        redis_commands.reset_mock()
+
+        with django_assert_num_queries(0):
+            ChatTargetResolver.resolve(42)
+
+        assert redis_commands.call_count == 2
@@ -0,0 +1,46 @@
+from unittest import mock
+
+import pytest
+from prometheus_client import Counter, values
+
+from shargain.commons.metrics import start_worker_metrics_exporter
+from shargain.offers.services.revalidation import ConditionalHitRatioCollector
+
+
+@pytest.fixture
+def multiprocess_dir(tmp_path, monkeypatch):
+    path = tmp_path / "metrics"
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(path))
+    return path
+
+
+def _count_requests_in_child_process(pid: int, not_modified: int, modified: int):
+    """Records conditional requests the way a prefork child process of the worker does."""
+    with mock.patch.object(values, "ValueClass", values.MultiProcessValue(lambda: pid)):
+        counter = Counter("shargain_offer_conditional_requests", "", ["result"], registry=None)
+        counter.labels(result="not_modified").inc(not_modified)
+        counter.labels(result="modified").inc(modified)
+
+
+class TestWorkerMetricsExporter:
+    def test_exports_metrics_merged_from_child_processes(self, multiprocess_dir):
+        (multiprocess_dir / "stale.db").parent.mkdir()
+        (multiprocess_dir / "stale.db").write_bytes(b"")
+        with mock.patch("shargain.commons.metrics.start_http_server") as start_http_server:
+            registry = start_worker_metrics_exporter(9100, derived_collectors=[ConditionalHitRatioCollector])
+
+        assert start_http_server.call_args == mock.call(9100, registry=registry)
+        assert not (multiprocess_dir / "stale.db").exists()
+        _count_requests_in_child_process(1, not_modified=3, modified=1)
+        _count_requests_in_child_process(2, not_modified=0, modified=4)
+
+        assert registry.get_sample_value("shargain_offer_conditional_requests_total", {"result": "modified"}) == 5
+        assert registry.get_sample_value("shargain_offer_conditional_hit_ratio") == pytest.approx(3 / 8)
+
+    def test_not_started_without_multiprocess_dir(self, monkeypatch):
+        monkeypatch.delenv("PROMETHEUS_MULTIPROC_DIR", raising=False)
+
+        with mock.patch("shargain.commons.metrics.start_http_server") as start_http_server:
+            assert start_worker_metrics_exporter(9100) is None
+
+        start_http_server.assert_not_called()
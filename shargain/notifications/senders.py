@@ -1,12 +1,22 @@
 import abc
+import logging
+import threading
+import time
+from typing import Any
 
+import requests
 import telebot
 from django.conf import settings
+from requests.adapters import HTTPAdapter
 
 from shargain.notifications.models import NotificationConfig
 
+logger = logging.getLogger(__name__)
+
 
 class BaseNotificationSender(abc.ABC):
+    MAX_MESSAGE_LENGTH: int
+
     def __init__(self, notification_config: NotificationConfig):
         self._notification_config = notification_config
 
@@ -14,8 +24,28 @@ class BaseNotificationSender(abc.ABC):
     def send(self, message: str):
         pass
 
+    def send_offers(self, header: str, messages: list[str], embeds: list[dict[str, Any]]):
+        """
+        Sends notification about new offers. By default, offer messages are joined into as few messages
+        as ``MAX_MESSAGE_LENGTH`` allows, each starting with the header.
+
+        :param header: header of the notification
+        :param messages: text message of each offer
+        :param embeds: rich representation of each offer, for channels which support it
+        """
+        message = header
+        for offer_message in messages:
+            if len(message + offer_message) > self.MAX_MESSAGE_LENGTH:
+                self.send(message)
+                message = header + offer_message
+            else:
+                message += offer_message
+        self.send(message)
+
 
 class TelegramNotificationSender(BaseNotificationSender):
+    MAX_MESSAGE_LENGTH = 4096
+
     def __init__(self, notification_config: NotificationConfig, bot_token: str = ""):
         """
         :param notification_config: user's notification config
@@ -28,3 +58,123 @@ class TelegramNotificationSender(BaseNotificationSender):
     def send(self, message: str):
         bot = telebot.TeleBot(self._bot_token, parse_mode=None)
         bot.send_message(self._notification_config.chatid, message)
+
+
+class DiscordNotificationSender(BaseNotificationSender):
+    """
+    Sends notifications through a Discord webhook.
+
+    Offers are sent as embeds, up to ``MAX_EMBEDS_PER_MESSAGE`` per request. All senders share
+    a single pooled HTTP session and per-webhook rate-limit state taken from Discord's
+    ``X-RateLimit-*`` headers, so consecutive sends to the same webhook wait for the bucket to reset
+    instead of hitting 429.
+    """
+
+    MAX_MESSAGE_LENGTH = 2000
+    MAX_EMBEDS_PER_MESSAGE = 10
+    MAX_EMBEDS_TOTAL_LENGTH = 6000
+    MAX_RETRIES = 3
+    TIMEOUT = 10
+
+    _session: requests.Session | None = None
+    _session_lock = threading.Lock()
+    _rate_limit_lock = threading.Lock()
+    _blocked_until: dict[str, float] = {}
+
+    def __init__(self, notification_config: NotificationConfig):
+        assert notification_config.webhook_url, "Discord webhook url is not set"  # noqa: S101
+        super().__init__(notification_config)
+
+    @classmethod
+    def get_session(cls) -> requests.Session:
+        if cls._session is None:
+            with cls._session_lock:
+                if cls._session is None:
+                    session = requests.Session()
+                    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+                    cls._session = session
+        return cls._session
+
+    @property
+    def webhook_url(self) -> str:
+        return self._notification_config.webhook_url
+
+    def send(self, message: str):
+        self._post({"content": message})
+
+    def send_offers(self, header: str, messages: list[str], embeds: list[dict[str, Any]]):
+        self.send_embeds(embeds, content=header.strip())
+
+    def send_embeds(self, embeds: list[dict[str, Any]], content: str = ""):
+        """
+        Sends embeds in as few webhook calls as Discord allows.
+
+        :param embeds: list of Discord embed objects
+        :param content: text sent along with the first batch (e.g. notification header)
+        """
+        for batch in self.split_embeds(embeds):
+            self._post({"content": content, "embeds": batch})
+            content = ""
+
+    @classmethod
+    def split_embeds(cls, embeds: list[dict[str, Any]]) -> list[list[dict[str, Any]]]:
+        """
+        Splits embeds into batches which fit into a single webhook message.
+        """
+        batches: list[list[dict[str, Any]]] = []
+        batch: list[dict[str, Any]] = []
+        batch_length = 0
+        for embed in embeds:
+            embed_length = cls.get_embed_length(embed)
+            if batch and (
+                len(batch) >= cls.MAX_EMBEDS_PER_MESSAGE or batch_length + embed_length > cls.MAX_EMBEDS_TOTAL_LENGTH
+            ):
+                batches.append(batch)
+                batch, batch_length = [], 0
+            batch.append(embed)
+            batch_length += embed_length
+        if batch:
+            batches.append(batch)
+        return batches
+
+    @staticmethod
+    def get_embed_length(embed: dict[str, Any]) -> int:
+        return sum(len(embed.get(key) or "") for key in ("title", "description")) + len(
+            (embed.get("footer") or {}).get("text", "")
+        )
+
+    def _wait_for_rate_limit(self):
+        with self._rate_limit_lock:
+            blocked_until = self._blocked_until.get(self.webhook_url, 0.0)
+        if (delay := blocked_until - time.monotonic()) > 0:
+            logger.info("Waiting for Discord rate limit [delay=%.2f]", delay)
+            time.sleep(delay)
+
+    def _update_rate_limit(self, response: requests.Response, retry_after: float | None = None):
+        if retry_after is None:
+            if response.headers.get("X-RateLimit-Remaining") != "0":
+                return
+            retry_after = float(response.headers.get("X-RateLimit-Reset-After", 0))
+        with self._rate_limit_lock:
+            self._blocked_until[self.webhook_url] = time.monotonic() + retry_after
+
+    @staticmethod
+    def _get_retry_after(response: requests.Response) -> float:
+        try:
+            return float(response.json()["retry_after"])
+        except (ValueError, KeyError, TypeError):
+            return float(response.headers.get("Retry-After", 1))
+
+    def _post(self, payload: dict[str, Any]):
+        for _attempt in range(self.MAX_RETRIES + 1):
+            self._wait_for_rate_limit()
+            response = self.get_session().post(self.webhook_url, json=payload, timeout=self.TIMEOUT)
+            if response.status_code == 429:
+                retry_after = self._get_retry_after(response)
+                logger.warning("Discord webhook rate limited [retry_after=%s]", retry_after)
+                self._update_rate_limit(response, retry_after=retry_after)
+                continue
+            self._update_rate_limit(response)
+            response.raise_for_status()
+            return response
+        raise requests.HTTPError("Discord webhook rate limit exceeded", response=response)
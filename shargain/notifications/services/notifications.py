@@ -1,7 +1,8 @@
 from dataclasses import dataclass, field
+from typing import Any
 
 from shargain.notifications.models import NotificationChannelChoices
-from shargain.notifications.senders import TelegramNotificationSender
+from shargain.notifications.senders import DiscordNotificationSender, TelegramNotificationSender
 from shargain.offers.models import Offer, ScrappingTarget
 
 
@@ -36,34 +37,24 @@ class NewOfferNotificationService:
         self.notification_title = notification_title
 
     def run(self):
-        message = self.get_message_header()
-        for context in self.message_contexts:
-            offer_message = self.get_message_for_offer(context)
-            if len(message + offer_message) > self.get_maximum_message_length(
-                self._scrapping_target.notification_config.channel  # type: ignore
-            ):
-                self._send(message)
-                message = self.get_message_header() + offer_message
-            else:
-                message += offer_message
-        self._send(message)
-
-    def _send(self, message):
         notification_sender = self._get_notification_sender_class()(self._scrapping_target.notification_config)
-        notification_sender.send(message)
+        notification_sender.send_offers(
+            self.get_message_header(),
+            [self.get_message_for_offer(context) for context in self.message_contexts],
+            [self.get_embed_for_offer(context) for context in self.message_contexts],
+        )
 
     def _get_notification_sender_class(self):
         return self.get_notification_sender_class(
             self._scrapping_target.notification_config.channel  # type: ignore
         )
 
-    @staticmethod
-    def get_maximum_message_length(notification_channel):
-        return {NotificationChannelChoices.TELEGRAM: 4096}[notification_channel]
-
     @staticmethod
     def get_notification_sender_class(notification_channel):
-        return {NotificationChannelChoices.TELEGRAM: TelegramNotificationSender}[notification_channel]
+        return {
+            NotificationChannelChoices.TELEGRAM: TelegramNotificationSender,
+            NotificationChannelChoices.DISCORD: DiscordNotificationSender,
+        }[notification_channel]
 
     def get_message_for_offer(self, context: NotificationMessageContext) -> str:
         base_msg = (
@@ -81,5 +72,22 @@ class NewOfferNotificationService:
 
         return base_msg + "\n\n"
 
+    def get_embed_for_offer(self, context: NotificationMessageContext) -> dict[str, Any]:
+        offer = context.offer
+        description = f"za {offer.price}zł"
+        if context.map_url:
+            icon = "📍" if context.is_exact_location else "🗺️"
+            description += f"\n{icon} {context.map_url}"
+        if context.location_name:
+            description += f"\n🏙️ {context.location_name}"
+        description += context.get_distances()
+
+        embed: dict[str, Any] = {"title": offer.title[:256], "url": offer.url, "description": description}
+        if offer.main_image_url:
+            embed["thumbnail"] = {"url": offer.main_image_url}
+        if offer.published_at:
+            embed["timestamp"] = offer.published_at.isoformat()
+        return embed
+
     def get_message_header(self):
         return f"{self.notification_title.upper()}\n\n"
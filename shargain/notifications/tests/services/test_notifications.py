@@ -1,7 +1,11 @@
 """Tests for the notification service."""
 
+from unittest.mock import patch
+
 import pytest
 
+from shargain.notifications.models import NotificationChannelChoices
+from shargain.notifications.senders import DiscordNotificationSender, TelegramNotificationSender
 from shargain.notifications.services.notifications import (
     NewOfferNotificationService,
     NotificationMessageContext,
@@ -72,3 +76,44 @@ class TestGetMessageHeader:
 
         assert "MY CUSTOM TITLE" in header
         assert header == "MY CUSTOM TITLE\n\n"
+
+
+@pytest.mark.django_db
+class TestDiscordNotifications:
+    def test_discord_channel_uses_discord_sender(self):
+        assert (
+            NewOfferNotificationService.get_notification_sender_class(NotificationChannelChoices.DISCORD)
+            is DiscordNotificationSender
+        )
+
+    def test_run_sends_offers_as_embeds(self):
+        config = NotificationConfigFactory(channel=NotificationChannelChoices.DISCORD)
+        target = ScrappingTargetFactory(notification_config=config)
+        contexts = [NotificationMessageContext(offer=OfferFactory.build()) for _ in range(3)]
+        service = NewOfferNotificationService(contexts, target, "discord title")
+
+        with patch.object(DiscordNotificationSender, "send_embeds") as m_send_embeds:
+            service.run()
+
+        m_send_embeds.assert_called_once()
+        embeds = m_send_embeds.call_args.args[0]
+        assert [embed["url"] for embed in embeds] == [context.offer.url for context in contexts]
+        assert m_send_embeds.call_args.kwargs["content"] == "DISCORD TITLE"
+
+
+@pytest.mark.django_db
+class TestTelegramNotifications:
+    def test_run_joins_offers_into_messages_up_to_maximum_length(self):
+        config = NotificationConfigFactory(channel=NotificationChannelChoices.TELEGRAM)
+        target = ScrappingTargetFactory(notification_config=config)
+        contexts = [NotificationMessageContext(offer=OfferFactory.build(title="x" * 1500)) for _ in range(5)]
+        service = NewOfferNotificationService(contexts, target, "telegram title")
+
+        with patch.object(TelegramNotificationSender, "send") as m_send:
+            service.run()
+
+        messages = [call.args[0] for call in m_send.call_args_list]
+        assert len(messages) == 3
+        assert all(message.startswith("TELEGRAM TITLE\n\n") for message in messages)
+        assert all(len(message) <= TelegramNotificationSender.MAX_MESSAGE_LENGTH for message in messages)
+        assert sum(message.count(context.offer.url) for message in messages for context in contexts) == 5
@@ -0,0 +1,77 @@
+from unittest import mock
+
+import pytest
+
+from shargain.notifications.models import NotificationChannelChoices
+from shargain.notifications.senders import DiscordNotificationSender
+from shargain.notifications.tests.factories import NotificationConfigFactory
+
+
+def _response(status_code=204, headers=None, json_data=None):
+    response = mock.Mock(status_code=status_code, headers=headers or {})
+    response.json.return_value = json_data or {}
+    return response
+
+
+@pytest.fixture
+def discord_sender(db):
+    config = NotificationConfigFactory(
+        channel=NotificationChannelChoices.DISCORD, webhook_url="https://discord.com/api/webhooks/1/abc"
+    )
+    DiscordNotificationSender._blocked_until.clear()
+    return DiscordNotificationSender(config)
+
+
+@pytest.fixture
+def m_session():
+    with mock.patch.object(DiscordNotificationSender, "get_session") as m_get_session:
+        yield m_get_session.return_value
+
+
+class TestDiscordNotificationSender:
+    def test_split_embeds_packs_ten_embeds_per_message(self):
+        embeds = [{"title": f"Offer {i}", "description": "desc"} for i in range(23)]
+
+        batches = DiscordNotificationSender.split_embeds(embeds)
+
+        assert [len(batch) for batch in batches] == [10, 10, 3]
+
+    def test_split_embeds_respects_total_length_limit(self):
+        embeds = [{"title": "t", "description": "x" * 2500} for _ in range(3)]
+
+        batches = DiscordNotificationSender.split_embeds(embeds)
+
+        assert [len(batch) for batch in batches] == [2, 1]
+
+    def test_send_embeds_sends_content_only_with_first_batch(self, discord_sender, m_session):
+        m_session.post.return_value = _response()
+        embeds = [{"title": f"Offer {i}"} for i in range(12)]
+
+        discord_sender.send_embeds(embeds, content="HEADER")
+
+        assert m_session.post.call_count == 2
+        first_payload = m_session.post.call_args_list[0].kwargs["json"]
+        second_payload = m_session.post.call_args_list[1].kwargs["json"]
+        assert first_payload["content"] == "HEADER"
+        assert len(first_payload["embeds"]) == 10
+        assert second_payload["content"] == ""
+        assert len(second_payload["embeds"]) == 2
+
+    def test_post_retries_after_rate_limit(self, discord_sender, m_session):
+        m_session.post.side_effect = [_response(429, json_data={"retry_after": 0.5}), _response()]
+
+        with mock.patch("shargain.notifications.senders.time.sleep") as m_sleep:
+            discord_sender.send("message")
+
+        assert m_session.post.call_count == 2
+        assert m_sleep.call_args.args[0] == pytest.approx(0.5, abs=0.1)
+
+    def test_exhausted_bucket_delays_next_request(self, discord_sender, m_session):
+        m_session.post.return_value = _response(headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset-After": "2"})
+
+        with mock.patch("shargain.notifications.senders.time.sleep") as m_sleep:
+            discord_sender.send("first")
+            discord_sender.send("second")
+
+        m_sleep.assert_called_once()
+        assert m_sleep.call_args.args[0] == pytest.approx(2, abs=0.1)
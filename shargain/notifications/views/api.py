@@ -1,13 +1,12 @@
 import logging
 
 from django_filters import rest_framework as filters
-from rest_framework import mixins, viewsets
+from rest_framework import mixins, status, viewsets
 from rest_framework.response import Response
-from telebot.types import Update
 
 from shargain.notifications.models import NotificationConfig
 from shargain.notifications.serializers import NotificationConfigSerializer
-from shargain.telegram.bot import TelegramBot
+from shargain.telegram import update_queue
 
 logger = logging.getLogger(__name__)
 
@@ -20,9 +19,10 @@ class NotificationConfigViewSet(viewsets.ReadOnlyModelViewSet):
 
 class TelegramWebhookViewSet(mixins.CreateModelMixin, viewsets.GenericViewSet):
     def create(self, request, *args, **kwargs):
-        update = Update.de_json(request.data)
-        try:  # TODO: fix it
-            TelegramBot.get_bot().process_new_updates([update])
-        except Exception as e:
-            logger.error("Error processing telegram webhook", exc_info=e)
+        # The update is acknowledged only after it's stored; Telegram redelivers updates which weren't acknowledged
+        # with 2xx (e.g. when the database is unavailable)
+        try:
+            update_queue.put_update(request.data)
+        except ValueError:
+            return Response({"ok": False}, status=status.HTTP_400_BAD_REQUEST)
         return Response({"ok": True})
@@ -14,7 +14,13 @@ from django_better_admin_arrayfield.admin.mixins import DynamicArrayMixin
 from django_better_admin_arrayfield.models.fields import ArrayField
 
 from shargain.offers.admin.forms import ScrappingTargetAdminForm
-from shargain.offers.models import Offer, ScrapingCheckin, ScrapingUrl, ScrappingTarget
+from shargain.offers.models import (
+    Offer,
+    ScrapingCheckin,
+    ScrapingCheckinRollup,
+    ScrapingUrl,
+    ScrappingTarget,
+)
 from shargain.offers.widgets import AdminDynamicArrayWidget
 
 
@@ -152,9 +158,8 @@ class ScrapingUrlAdmin(admin.ModelAdmin):
     @admin.display(description=_("Last Check-in Time"))
     def last_checkin_time(self, obj):
         """Display the last check-in time for this URL."""
-        latest_checkin = obj.checkins.order_by("-timestamp").first()
-        if latest_checkin:
-            return latest_checkin.timestamp
+        if obj.last_checked_at:
+            return obj.last_checked_at
         return "No check-ins yet"
 
 
@@ -172,3 +177,13 @@ class ScrapingCheckinAdmin(admin.ModelAdmin):
 
     def get_queryset(self, request: HttpRequest) -> QuerySet[ScrapingCheckin]:
         return super().get_queryset(request).select_related("scraping_url")
+
+
+@admin.register(ScrapingCheckinRollup)
+class ScrapingCheckinRollupAdmin(admin.ModelAdmin):
+    list_display = ("scraping_url", "period", "bucket_start", "checkins_count", "new_offers_count", "max_gap")
+    list_filter = ("period", "scraping_url")
+    date_hierarchy = "bucket_start"
+
+    def get_queryset(self, request: HttpRequest) -> QuerySet[ScrapingCheckinRollup]:
+        return super().get_queryset(request).select_related("scraping_url")
@@ -3,6 +3,7 @@ from __future__ import annotations
 from shargain.commons.application.actor import Actor
 from shargain.offers.application.dto import ScrapingUrlDTO, WaypointData
 from shargain.offers.application.exceptions import QuotaExceeded, TargetDoesNotExist
+from shargain.offers.application.query_cache import invalidate_user_queries
 from shargain.offers.models import ScrapingUrl, ScrappingTarget
 from shargain.quotas.services.quota import QuotaService
 
@@ -42,4 +43,5 @@ def add_scraping_url(
         show_location_map_in_notifications=show_location_map_in_notifications,
         waypoints=waypoints,
     )
+    invalidate_user_queries(actor.user_id)
     return ScrapingUrlDTO.from_orm(scraping_url)
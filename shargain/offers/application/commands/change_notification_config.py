@@ -11,6 +11,7 @@ from shargain.offers.application.exceptions import (
     NotificationConfigDoesNotExist,
     TargetDoesNotExist,
 )
+from shargain.offers.application.query_cache import invalidate_user_queries
 from shargain.offers.models import ScrappingTarget
 
 
@@ -49,5 +50,6 @@ def change_notification_config(
     # Update the target's notification configuration
     target.notification_config_id = notification_config_id
     target.save(update_fields=["notification_config_id"])
+    invalidate_user_queries(actor.user_id)
 
     return TargetDTO.from_orm(target)
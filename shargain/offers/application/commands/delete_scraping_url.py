@@ -1,4 +1,5 @@
 from shargain.commons.application.actor import Actor
+from shargain.offers.application.query_cache import invalidate_user_queries
 from shargain.offers.models import ScrapingUrl
 
 
@@ -14,3 +15,4 @@ def delete_scraping_url(actor: Actor, url_id: int) -> None:
     except ScrapingUrl.DoesNotExist:
         return
     url.delete()
+    invalidate_user_queries(actor.user_id)
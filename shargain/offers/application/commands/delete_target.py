@@ -1,4 +1,5 @@
 from shargain.commons.application.actor import Actor
+from shargain.offers.application.query_cache import invalidate_user_queries
 from shargain.offers.models import ScrappingTarget
 
 
@@ -14,3 +15,4 @@ def delete_target(actor: Actor, target_id: int) -> None:
     except ScrappingTarget.DoesNotExist:
         return
     target.delete()
+    invalidate_user_queries(actor.user_id)
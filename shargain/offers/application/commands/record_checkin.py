@@ -1,11 +1,13 @@
 from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
+from django.db.models import Q
 
 from shargain.offers.models import ScrapingCheckin, ScrapingUrl
 
 
 def record_checkin(scraping_url_id: int, offers_count: int, new_offers_count: int) -> ScrapingCheckin:
     """
-    Records a check-in for a scraping URL.
+    Records a check-in for a scraping URL, stores it as the URL's latest one and schedules its next scrape.
 
     Args:
         scraping_url_id: The ID of the ScrapingUrl object.
@@ -18,13 +20,27 @@ def record_checkin(scraping_url_id: int, offers_count: int, new_offers_count: in
     Raises:
         ObjectDoesNotExist: If the ScrapingUrl with the given ID does not exist.
     """
+    from shargain.offers.services.scrape_scheduler import ScrapeScheduler
+
     try:
-        scraping_url = ScrapingUrl.objects.get(id=scraping_url_id)
+        scraping_url = ScrapingUrl.objects.select_related("scraping_target__owner__scraping_url_quota").get(
+            id=scraping_url_id
+        )
     except ScrapingUrl.DoesNotExist:
         raise ObjectDoesNotExist(f"ScrapingUrl with id {scraping_url_id} does not exist") from None
 
-    checkin = ScrapingCheckin.objects.create(
-        scraping_url=scraping_url, offers_count=offers_count, new_offers_count=new_offers_count
-    )
+    with transaction.atomic():
+        checkin = ScrapingCheckin.objects.create(
+            scraping_url=scraping_url, offers_count=offers_count, new_offers_count=new_offers_count
+        )
+        # Concurrent checkins of the same URL may commit out of order, so only a later checkin overwrites the latest
+        ScrapingUrl.objects.filter(
+            Q(last_checked_at=None) | Q(last_checked_at__lt=checkin.timestamp), id=scraping_url_id
+        ).update(
+            last_checked_at=checkin.timestamp,
+            last_offers_count=offers_count,
+            last_new_offers_count=new_offers_count,
+        )
+    ScrapeScheduler.from_settings().reschedule(scraping_url, now=checkin.timestamp)
 
     return checkin
@@ -1,6 +1,7 @@
 from shargain.commons.application.actor import Actor
 from shargain.offers.application.dto import ScrapingUrlDTO
 from shargain.offers.application.exceptions import ScrapingUrlDoesNotExist
+from shargain.offers.application.query_cache import invalidate_user_queries
 from shargain.offers.models import ScrapingUrl
 
 
@@ -15,4 +16,5 @@ def set_scraping_url_active_status(actor: Actor, url_id: int, target_id: int, is
 
     url.is_active = is_active
     url.save(update_fields=["is_active"])
+    invalidate_user_queries(actor.user_id)
     return ScrapingUrlDTO.from_orm(url)
@@ -1,6 +1,7 @@
 from shargain.commons.application.actor import Actor
 from shargain.offers.application.dto import TargetDTO
 from shargain.offers.application.exceptions import TargetDoesNotExist
+from shargain.offers.application.query_cache import invalidate_user_queries
 from shargain.offers.models import ScrappingTarget
 
 
@@ -12,5 +13,6 @@ def toggle_target_active(actor: Actor, target_id: int, is_active: bool) -> Targe
 
     target.is_active = is_active
     target.save(update_fields=["is_active"])
+    invalidate_user_queries(actor.user_id)
 
     return TargetDTO.from_orm(target)
@@ -7,6 +7,7 @@ This command enables or disables notifications for an existing scraping target.
 from shargain.commons.application.actor import Actor
 from shargain.offers.application.dto import TargetDTO
 from shargain.offers.application.exceptions import TargetDoesNotExist
+from shargain.offers.application.query_cache import invalidate_user_queries
 from shargain.offers.models import ScrappingTarget
 
 
@@ -43,5 +44,6 @@ def toggle_target_notifications(
     if target.enable_notifications != new_state:
         target.enable_notifications = new_state
         target.save(update_fields=["enable_notifications"])
+        invalidate_user_queries(actor.user_id)
 
     return TargetDTO.from_orm(target)
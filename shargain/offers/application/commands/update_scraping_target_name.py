@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from shargain.commons.application.actor import Actor
 from shargain.offers.application.exceptions import TargetDoesNotExist
+from shargain.offers.application.query_cache import invalidate_user_queries
 from shargain.offers.models import ScrappingTarget
 
 
@@ -16,3 +17,4 @@ def update_scraping_target_name(actor: Actor, target_id: int, name: str) -> None
 
     target.name = name
     target.save()
+    invalidate_user_queries(actor.user_id)
@@ -1,6 +1,7 @@
 from shargain.commons.application.actor import Actor
 from shargain.offers.application.dto import ScrapingUrlDTO, WaypointData
 from shargain.offers.application.exceptions import ScrapingUrlDoesNotExist
+from shargain.offers.application.query_cache import invalidate_user_queries
 from shargain.offers.models import ScrapingUrl
 
 
@@ -33,4 +34,5 @@ def update_scraping_url(
 
     if update_fields:
         url.save(update_fields=update_fields)
+        invalidate_user_queries(actor.user_id)
     return ScrapingUrlDTO.from_orm(url)
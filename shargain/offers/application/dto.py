@@ -8,7 +8,7 @@ and the presentation layer (e.g., API views).
 import dataclasses
 from typing import Self, TypedDict
 
-from shargain.offers.models import ScrapingUrl, ScrappingTarget
+from shargain.offers.models import Offer, ScrapingUrl, ScrappingTarget
 
 
 class WaypointData(TypedDict):
@@ -26,19 +26,23 @@ class ScrapingUrlDTO:
     name: str
     is_active: bool
     last_checked_at: str | None = None
+    last_offers_count: int | None = None
+    last_new_offers_count: int | None = None
     filters: dict | None = None
     show_location_map_in_notifications: bool = False
     waypoints: list[WaypointData] | None = None
 
     @classmethod
-    def from_orm(cls, url: ScrapingUrl, last_checked_at: str | None = None) -> Self:
+    def from_orm(cls, url: ScrapingUrl) -> Self:
         """Create a DTO from a ScrapingUrl model instance."""
         return cls(
             id=url.id,
             url=url.url,
             name=url.name,
             is_active=url.is_active,
-            last_checked_at=last_checked_at,
+            last_checked_at=url.last_checked_at.isoformat() if url.last_checked_at else None,
+            last_offers_count=url.last_offers_count,
+            last_new_offers_count=url.last_new_offers_count,
             filters=url.filters,
             show_location_map_in_notifications=url.show_location_map_in_notifications,
             waypoints=url.waypoints,
@@ -57,15 +61,9 @@ class TargetDTO:
     urls: list[ScrapingUrlDTO]
 
     @classmethod
-    def from_orm(cls, target: ScrappingTarget, url_ids_to_timestamps: dict[int, str] | None = None) -> Self:
+    def from_orm(cls, target: ScrappingTarget) -> Self:
         """Create a DTO from a ScrappingTarget model instance."""
-        if url_ids_to_timestamps is None:
-            url_ids_to_timestamps = {}
-
-        urls = [
-            ScrapingUrlDTO.from_orm(url, last_checked_at=url_ids_to_timestamps.get(url.id))
-            for url in target.scrapingurl_set.all()
-        ]
+        urls = [ScrapingUrlDTO.from_orm(url) for url in target.scrapingurl_set.all()]
         return cls(
             id=target.id,
             name=target.name,
@@ -74,3 +72,33 @@ class TargetDTO:
             notification_config_id=target.notification_config_id,
             urls=urls,
         )
+
+
+@dataclasses.dataclass(frozen=True)
+class OfferDTO:
+    """Data Transfer Object for Offer."""
+
+    id: int
+    url: str
+    title: str
+    price: int | None
+    main_image_url: str
+    list_url: str
+    created_at: str
+    published_at: str | None = None
+    closed_at: str | None = None
+
+    @classmethod
+    def from_orm(cls, offer: Offer) -> Self:
+        """Create a DTO from an Offer model instance."""
+        return cls(
+            id=offer.id,
+            url=offer.url,
+            title=offer.title,
+            price=offer.price,
+            main_image_url=offer.main_image_url,
+            list_url=offer.list_url,
+            created_at=offer.created_at.isoformat(),
+            published_at=offer.published_at.isoformat() if offer.published_at else None,
+            closed_at=offer.closed_at.isoformat() if offer.closed_at else None,
+        )
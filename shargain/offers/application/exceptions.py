@@ -40,3 +40,10 @@ class QuotaExceeded(ApplicationException):
 
     code: str = "quota_exceeded"
     message: str = "Quota limit reached."
+
+
+class InvalidCursor(ApplicationException):
+    """Raised when a pagination cursor cannot be decoded."""
+
+    code: str = "invalid_cursor"
+    message: str = "Invalid pagination cursor."
@@ -0,0 +1,51 @@
+import dataclasses
+from datetime import timedelta
+from typing import Self
+
+from django.utils import timezone
+
+from shargain.commons.application.actor import Actor
+from shargain.offers.application.exceptions import ScrapingUrlDoesNotExist
+from shargain.offers.models import RollupPeriod, ScrapingCheckinRollup, ScrapingUrl
+
+
+@dataclasses.dataclass(frozen=True)
+class CheckinStatsDTO:
+    bucket_start: str
+    checkins_count: int
+    offers_count: int
+    new_offers_count: int
+    max_gap_seconds: float | None
+
+    @classmethod
+    def from_orm(cls, rollup: ScrapingCheckinRollup) -> Self:
+        return cls(
+            bucket_start=rollup.bucket_start.isoformat(),
+            checkins_count=rollup.checkins_count,
+            offers_count=rollup.offers_count,
+            new_offers_count=rollup.new_offers_count,
+            max_gap_seconds=rollup.max_gap.total_seconds() if rollup.max_gap is not None else None,
+        )
+
+
+def get_checkin_stats(
+    actor: Actor, target_id: int, url_id: int, period: RollupPeriod = RollupPeriod.HOUR, days: int = 7
+) -> list[CheckinStatsDTO]:
+    """Return checkin rollups of the scraping URL from the last days, oldest first.
+
+    Args:
+        actor: The actor performing the query
+        target_id: ID of the target of the URL
+        url_id: ID of the URL
+        period: Period of the rollups
+        days: Number of days to return rollups from
+    """
+    if not ScrapingUrl.objects.filter(
+        id=url_id, scraping_target_id=target_id, scraping_target__owner=actor.user_id
+    ).exists():
+        raise ScrapingUrlDoesNotExist()
+
+    rollups = ScrapingCheckinRollup.objects.filter(
+        scraping_url_id=url_id, period=period, bucket_start__gte=timezone.now() - timedelta(days=days)
+    ).order_by("bucket_start")
+    return [CheckinStatsDTO.from_orm(rollup) for rollup in rollups]
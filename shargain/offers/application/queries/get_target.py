@@ -1,66 +1,31 @@
 from __future__ import annotations
 
-from django.db.models import Max, Prefetch
+from django.db.models import Prefetch, QuerySet
 
 from shargain.commons.application.actor import Actor
 from shargain.offers.application.dto import TargetDTO
 from shargain.offers.application.exceptions import TargetDoesNotExist
-from shargain.offers.models import ScrapingCheckin, ScrapingUrl, ScrappingTarget
+from shargain.offers.models import ScrapingUrl, ScrappingTarget
 
 
-def get_target(actor: Actor, target_id: int) -> TargetDTO:
-    try:
-        # Prefetch scraping URLs with their latest checkin timestamp
-        latest_checkins = (
-            ScrapingCheckin.objects.filter(
-                scraping_url_id__in=ScrapingUrl.objects.filter(scraping_target_id=target_id).values_list(
-                    "id", flat=True
-                )
-            )
-            .values("scraping_url_id")
-            .annotate(latest_timestamp=Max("timestamp"))
-            .order_by()
-        )
+def _get_targets_with_urls(actor: Actor) -> QuerySet[ScrappingTarget]:
+    # Latest checkins are denormalized on the scraping URLs (see record_checkin), so they come with the prefetch
+    return ScrappingTarget.objects.filter(owner=actor.user_id).prefetch_related(
+        Prefetch("scrapingurl_set", queryset=ScrapingUrl.objects.all().order_by("id"))
+    )
 
-        url_ids_to_timestamps = {
-            item["scraping_url_id"]: item["latest_timestamp"].isoformat() for item in latest_checkins
-        }
 
-        target = ScrappingTarget.objects.prefetch_related(
-            Prefetch("scrapingurl_set", queryset=ScrapingUrl.objects.all().order_by("id"))
-        ).get(id=target_id, owner=actor.user_id)
+def get_target(actor: Actor, target_id: int) -> TargetDTO:
+    try:
+        target = _get_targets_with_urls(actor).get(id=target_id)
     except ScrappingTarget.DoesNotExist as e:
         raise TargetDoesNotExist() from e
 
-    return TargetDTO.from_orm(target, url_ids_to_timestamps)
+    return TargetDTO.from_orm(target)
 
 
 def get_target_by_user(actor: Actor) -> TargetDTO:
-    target_qs = ScrappingTarget.objects.filter(owner=actor.user_id).order_by("-id")
-
-    if not (target := target_qs.first()):
-        raise TargetDoesNotExist()
-
-    # TODO: make it a method on queryset or sth
-    latest_checkins = (
-        ScrapingCheckin.objects.filter(scraping_url_id__in=target.scrapingurl_set.values_list("id", flat=True))
-        .values("scraping_url_id")
-        .annotate(latest_timestamp=Max("timestamp"))
-        .order_by()
-    )
-
-    url_ids_to_timestamps = {item["scraping_url_id"]: item["latest_timestamp"].isoformat() for item in latest_checkins}
-
-    target = (
-        ScrappingTarget.objects.prefetch_related(
-            Prefetch("scrapingurl_set", queryset=ScrapingUrl.objects.all().order_by("id"))
-        )
-        .filter(owner=actor.user_id)
-        .order_by("-id")
-        .first()
-    )
-
-    if not target:
+    if not (target := _get_targets_with_urls(actor).order_by("-id").first()):
         raise TargetDoesNotExist()
 
-    return TargetDTO.from_orm(target, url_ids_to_timestamps)
+    return TargetDTO.from_orm(target)
@@ -0,0 +1,76 @@
+import base64
+import binascii
+import dataclasses
+from datetime import datetime
+from typing import Literal
+
+from django.db.models import Q
+
+from shargain.commons.application.actor import Actor
+from shargain.offers.application.dto import OfferDTO
+from shargain.offers.application.exceptions import InvalidCursor, TargetDoesNotExist
+from shargain.offers.models import Offer, ScrappingTarget
+
+OfferStatus = Literal["open", "closed"]
+
+
+@dataclasses.dataclass(frozen=True)
+class OfferPageDTO:
+    offers: list[OfferDTO]
+    next_cursor: str | None
+
+
+def encode_cursor(offer: Offer) -> str:
+    return base64.urlsafe_b64encode(f"{offer.created_at.isoformat()}|{offer.id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        created_at, offer_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(offer_id)
+    except (binascii.Error, UnicodeError, ValueError) as e:
+        raise InvalidCursor() from e
+
+
+def list_target_offers(
+    actor: Actor,
+    target_id: int,
+    cursor: str | None = None,
+    limit: int = 50,
+    list_url: str | None = None,
+    status: OfferStatus | None = None,
+) -> OfferPageDTO:
+    """Return a page of offers of the target, newest first.
+
+    Pages are read with keyset pagination on (created_at, id), so a page deep in the feed costs the same as the first
+    one and offers found in the meantime don't shift the following pages. The feed is served by the ``offer_feed_*``
+    indexes of Offer without sorting.
+
+    Args:
+        actor: The actor performing the query
+        target_id: ID of the target
+        cursor: ``next_cursor`` of the previous page, None for the first page
+        limit: Maximum number of offers on the page
+        list_url: Return only offers found on this list URL
+        status: Return only open or closed offers
+    """
+    if not ScrappingTarget.objects.filter(id=target_id, owner=actor.user_id).exists():
+        raise TargetDoesNotExist()
+
+    offers = Offer.objects.filter(target_id=target_id)
+    if list_url is not None:
+        offers = offers.filter(list_url=list_url)
+    if status == "open":
+        offers = offers.opened()
+    elif status == "closed":
+        offers = offers.closed()
+    if cursor is not None:
+        created_at, offer_id = decode_cursor(cursor)
+        # The redundant bound on created_at alone is an index condition, the rest of the row comparison is a filter
+        offers = offers.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=offer_id), created_at__lte=created_at
+        )
+
+    page = list(offers.order_by("-created_at", "-id")[: limit + 1])
+    next_cursor = encode_cursor(page[limit - 1]) if len(page) > limit else None
+    return OfferPageDTO(offers=[OfferDTO.from_orm(offer) for offer in page[:limit]], next_cursor=next_cursor)
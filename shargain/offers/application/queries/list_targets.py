@@ -9,6 +9,7 @@ from dataclasses import dataclass
 from django.db.models import Count, QuerySet
 
 from shargain.commons.application.actor import Actor
+from shargain.offers.application.query_cache import cached_user_query
 from shargain.offers.models import ScrappingTarget
 
 
@@ -27,6 +28,7 @@ def _get_user_targets(actor: Actor) -> QuerySet[ScrappingTarget]:
     return ScrappingTarget.objects.filter(owner_id=actor.user_id)
 
 
+@cached_user_query("list_targets")
 def list_targets(
     actor: Actor,
     page: int = 1,
@@ -0,0 +1,80 @@
+"""
+Per-user cache of the offers application queries.
+
+Results of queries decorated with ``cached_user_query`` are cached in a namespace of the actor's data. Commands
+making user-visible changes of the user's targets or scraping URLs invalidate it with ``invalidate_user_queries``.
+The namespace lives in the shared cache, so the user reads their own writes in every process. Writes made outside
+of the commands (e.g. in the admin) become visible after ``CACHE_TTL`` at most. Checkins, which are recorded on every
+scrape, don't invalidate the namespace, so queries showing them (e.g. ``get_target``) are not cached. Hits and misses
+are exported per query.
+"""
+
+import functools
+import inspect
+from collections.abc import Callable
+from typing import ParamSpec, TypeVar
+
+from django.core.cache import cache
+from prometheus_client import Counter
+
+from shargain.commons.application.actor import Actor
+from shargain.commons.cache import CacheNamespace
+from shargain.offers.models import ScrappingTarget
+
+QUERY_CACHE_REQUESTS = Counter(
+    "shargain_query_cache_requests",
+    "Reads of cached application queries, by query and result (hit or miss)",
+    ["query", "result"],
+)
+
+CACHE_TTL = 5 * 60
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+_MISSING = object()
+
+
+def _get_cache_namespace(user_id: int) -> CacheNamespace:
+    return CacheNamespace(f"offers:queries:{user_id}")
+
+
+def invalidate_user_queries(user_id: int | None) -> None:
+    if user_id is None:
+        return
+    _get_cache_namespace(user_id).invalidate()
+
+
+def invalidate_target_owner_queries(target_id: int) -> None:
+    invalidate_user_queries(ScrappingTarget.objects.filter(id=target_id).values_list("owner_id", flat=True).first())
+
+
+def cached_user_query(name: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """
+    Caches results of a query taking the ``actor`` argument. Exceptions (e.g. of missing objects) are not cached.
+    Other arguments have to have stable representations, which is the case for ids and pagination.
+    """
+
+    def decorator(query: Callable[P, R]) -> Callable[P, R]:
+        signature = inspect.signature(query)
+
+        @functools.wraps(query)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            bound_arguments = signature.bind(*args, **kwargs)
+            bound_arguments.apply_defaults()
+            arguments = dict(bound_arguments.arguments)
+            actor: Actor = arguments.pop("actor")
+            key = _get_cache_namespace(actor.user_id).make_key(
+                name, *(f"{argument}={value!r}" for argument, value in sorted(arguments.items()))
+            )
+            if (result := cache.get(key, _MISSING)) is not _MISSING:
+                QUERY_CACHE_REQUESTS.labels(query=name, result="hit").inc()
+                return result  # type: ignore[return-value]
+            QUERY_CACHE_REQUESTS.labels(query=name, result="miss").inc()
+            result = query(*args, **kwargs)
+            cache.set(key, result, timeout=CACHE_TTL)
+            return result
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,34 @@
+import hashlib
+
+from django.core.cache import cache
+
+from shargain.commons.cache import CacheNamespace
+
+
+class ScrappingTargetListCache:
+    """
+    Caches serialized pages of the scrapping targets list, keyed by the full request URI (filters and page).
+
+    The pages form one cache namespace which is invalidated whenever a scrapping target or a scraping URL changes
+    (see ``shargain.offers.signals``). The namespace lives in the shared cache, so a stale list is never served after
+    a write made by any process of the deployment.
+    """
+
+    CACHE_TTL = 5 * 60
+    cache_namespace = CacheNamespace("offers:scrapping-targets")
+
+    @classmethod
+    def _get_cache_key(cls, uri: str) -> str:
+        return cls.cache_namespace.make_key(hashlib.sha256(uri.encode()).hexdigest())
+
+    @classmethod
+    def invalidate(cls) -> None:
+        cls.cache_namespace.invalidate()
+
+    @classmethod
+    def get(cls, uri: str):
+        return cache.get(cls._get_cache_key(uri))
+
+    @classmethod
+    def set(cls, uri: str, data) -> None:
+        cache.set(cls._get_cache_key(uri), data, timeout=cls.CACHE_TTL)
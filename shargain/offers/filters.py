@@ -1,12 +1,23 @@
+from django.db.models import Exists, OuterRef
 from django_filters import rest_framework as filters
 
+from shargain.offers.models import ScrapingUrl
+
 
 class ScrappingTargetFilterSet(filters.FilterSet):
-    domain = filters.CharFilter(lookup_expr="icontains", field_name="scrapingurl__url")
+    domain = filters.CharFilter(method="filter_domain")
     include_inactive_urls = filters.BooleanFilter(method="filter_include_inactive_urls")
 
+    # Both filters use subqueries instead of joins, so the targets don't have to be deduplicated with DISTINCT
+
+    @staticmethod
+    def filter_domain(queryset, name, value):
+        return queryset.filter(Exists(ScrapingUrl.objects.filter(scraping_target=OuterRef("pk"), url__icontains=value)))
+
     @staticmethod
     def filter_include_inactive_urls(queryset, name, value):
         if not value:
-            queryset = queryset.prefetch_related("scrapingurl_set").filter(scrapingurl__is_active=True)
+            queryset = queryset.filter(
+                Exists(ScrapingUrl.objects.filter(scraping_target=OuterRef("pk"), is_active=True))
+            )
         return queryset
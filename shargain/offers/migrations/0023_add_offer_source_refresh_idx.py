@@ -0,0 +1,23 @@
+# Generated by Django 4.1.4 on 2026-10-19 15:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("offers", "0022_add_offer_url_hash_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="offer",
+            index=models.Index(
+                models.ExpressionWrapper(
+                    models.Q(("source_html", ""), _negated=True), output_field=models.BooleanField()
+                ),
+                models.F("last_check_at"),
+                condition=models.Q(("closed_at", None)),
+                name="offer_source_refresh_idx",
+            ),
+        ),
+    ]
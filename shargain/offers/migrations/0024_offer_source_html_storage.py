@@ -0,0 +1,25 @@
+# Generated by Django 4.1.4 on 2026-10-19 15:30
+
+from django.db import migrations, models
+
+import shargain.offers.models
+import shargain.offers.storages
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("offers", "0023_add_offer_source_refresh_idx"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="offer",
+            name="source_html",
+            field=models.FileField(
+                blank=True,
+                storage=shargain.offers.storages.get_offer_source_storage,
+                upload_to=shargain.offers.models.get_offer_source_html_path,
+                verbose_name="Source HTML",
+            ),
+        ),
+    ]
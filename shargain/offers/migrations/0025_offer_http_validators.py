@@ -0,0 +1,32 @@
+# Generated by Django 4.1.4 on 2026-10-19 15:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("offers", "0024_offer_source_html_storage"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="offer",
+            name="http_etag",
+            field=models.CharField(
+                blank=True,
+                help_text="ETag of the offer's page from the last check",
+                max_length=255,
+                verbose_name="HTTP ETag",
+            ),
+        ),
+        migrations.AddField(
+            model_name="offer",
+            name="http_last_modified",
+            field=models.CharField(
+                blank=True,
+                help_text="Last-Modified header of the offer's page from the last check",
+                max_length=64,
+                verbose_name="HTTP Last-Modified",
+            ),
+        ),
+    ]
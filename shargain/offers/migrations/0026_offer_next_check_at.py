@@ -0,0 +1,49 @@
+# Generated by Django 4.1.4 on 2026-10-19 15:34
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def schedule_by_last_check(apps, schema_editor):
+    Offer = apps.get_model("offers", "Offer")
+    Offer.objects.filter(closed_at=None).update(next_check_at=models.F("last_check_at"))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("offers", "0025_offer_http_validators"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="offer",
+            name="offer_source_refresh_idx",
+        ),
+        migrations.AddField(
+            model_name="offer",
+            name="next_check_at",
+            field=models.DateTimeField(
+                default=django.utils.timezone.localtime,
+                help_text="Time when the offer should be checked again",
+                verbose_name="Next check at",
+            ),
+        ),
+        migrations.RunPython(schedule_by_last_check, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="offer",
+            index=models.Index(
+                models.ExpressionWrapper(
+                    models.Q(("source_html", ""), _negated=True), output_field=models.BooleanField()
+                ),
+                models.F("next_check_at"),
+                condition=models.Q(("closed_at", None)),
+                name="offer_source_refresh_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="offer",
+            index=models.Index(
+                condition=models.Q(("closed_at", None)), fields=["next_check_at"], name="offer_next_check_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 4.1.4 on 2026-10-19 15:36
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("offers", "0026_offer_next_check_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="offer",
+            name="closure_reason",
+            field=models.CharField(
+                blank=True,
+                choices=[("check", "Offer's page check"), ("disappeared", "Disappeared from its list URL")],
+                max_length=16,
+                verbose_name="Closure reason",
+            ),
+        ),
+        migrations.AddField(
+            model_name="offer",
+            name="last_seen_at",
+            field=models.DateTimeField(
+                default=django.utils.timezone.localtime,
+                help_text="Time when the offer was last seen on its list URL",
+                verbose_name="Last seen at",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="offer",
+            index=models.Index(
+                condition=models.Q(("closed_at", None)),
+                fields=["target", "list_url", "last_seen_at"],
+                name="offer_last_seen_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.1.4 on 2026-10-19 15:46
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("offers", "0027_offer_last_seen_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="scrapingurl",
+            name="next_scrape_at",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now,
+                help_text="Time when the URL should be scraped again",
+                verbose_name="Next scrape at",
+            ),
+        ),
+        migrations.AddField(
+            model_name="scrapingurl",
+            name="scrape_interval",
+            field=models.DurationField(
+                blank=True,
+                help_text="Interval between scrapes computed from the rate of new offers",
+                null=True,
+                verbose_name="Scrape interval",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="scrapingcheckin",
+            index=models.Index(fields=["scraping_url", "timestamp"], name="scraping_checkin_url_time_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="scrapingurl",
+            index=models.Index(
+                condition=models.Q(("is_active", True)), fields=["next_scrape_at"], name="scraping_url_next_scrape_idx"
+            ),
+        ),
+    ]
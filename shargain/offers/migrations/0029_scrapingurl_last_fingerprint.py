@@ -0,0 +1,22 @@
+# Generated by Django 4.1.4 on 2026-10-19 15:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("offers", "0028_scrapingurl_next_scrape_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="scrapingurl",
+            name="last_fingerprint",
+            field=models.CharField(
+                blank=True,
+                help_text="Fingerprint of the ordered offer URLs of the last processed batch from this URL",
+                max_length=64,
+                verbose_name="Last fingerprint",
+            ),
+        ),
+    ]
@@ -0,0 +1,81 @@
+# Generated by Django 4.1.4 on 2026-10-19 16:02
+
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def normalize_scrape_url(url):
+    # Copy of shargain.offers.models.normalize_scrape_url as of this migration
+    parsed = urlparse(url.strip())
+    scheme = parsed.scheme.lower()
+    netloc = parsed.netloc.lower()
+    if (scheme, netloc.rsplit(":", 1)[-1]) in (("http", "80"), ("https", "443")):
+        netloc = netloc.rsplit(":", 1)[0]
+    query = urlencode(sorted((key, value) for key, value in parse_qsl(parsed.query) if value))
+    return urlunparse((scheme, netloc, parsed.path or "/", parsed.params, query, ""))
+
+
+def subscribe_to_sources(apps, schema_editor):
+    ScrapeSource = apps.get_model("offers", "ScrapeSource")
+    ScrapingUrl = apps.get_model("offers", "ScrapingUrl")
+    sources = {}
+    for scraping_url in ScrapingUrl.objects.only("id", "url").iterator():
+        normalized_url = normalize_scrape_url(scraping_url.url)
+        if normalized_url not in sources:
+            sources[normalized_url], _ = ScrapeSource.objects.get_or_create(url=normalized_url)
+        ScrapingUrl.objects.filter(id=scraping_url.id).update(source=sources[normalized_url])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("offers", "0029_scrapingurl_last_fingerprint"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ScrapeSource",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "url",
+                    models.URLField(
+                        help_text="Normalized list URL (see normalize_scrape_url)",
+                        max_length=1024,
+                        unique=True,
+                        verbose_name="URL",
+                    ),
+                ),
+                ("last_scraped_at", models.DateTimeField(blank=True, null=True, verbose_name="Last scraped at")),
+            ],
+            options={
+                "verbose_name": "Scrape source",
+                "verbose_name_plural": "Scrape sources",
+            },
+        ),
+        migrations.AddField(
+            model_name="scrapingurl",
+            name="source",
+            field=models.ForeignKey(
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="subscribers",
+                to="offers.scrapesource",
+            ),
+        ),
+        migrations.RunPython(subscribe_to_sources, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="scrapingurl",
+            name="source",
+            field=models.ForeignKey(
+                editable=False,
+                help_text="Source shared by all scraping URLs of the same list, which is scraped once for all of them",
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="subscribers",
+                to="offers.scrapesource",
+                verbose_name="Scrape source",
+            ),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.1.4 on 2026-10-19 15:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("offers", "0030_scrapesource"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ScrapingUrlChange",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("scraping_url_id", models.BigIntegerField(verbose_name="Scraping URL id")),
+                ("created_at", models.DateTimeField(auto_now_add=True, verbose_name="Created at")),
+            ],
+            options={
+                "verbose_name": "Scraping URL change",
+                "verbose_name_plural": "Scraping URL changes",
+            },
+        ),
+    ]
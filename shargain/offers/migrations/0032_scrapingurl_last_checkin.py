@@ -0,0 +1,52 @@
+# Generated by Django 4.1.4 on 2026-10-19 15:58
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_last_checkin(apps, schema_editor):
+    ScrapingCheckin = apps.get_model("offers", "ScrapingCheckin")
+    ScrapingUrl = apps.get_model("offers", "ScrapingUrl")
+    latest_checkin = ScrapingCheckin.objects.filter(scraping_url=OuterRef("pk")).order_by("-timestamp", "-id")
+    ScrapingUrl.objects.update(
+        last_checked_at=Subquery(latest_checkin.values("timestamp")[:1]),
+        last_offers_count=Subquery(latest_checkin.values("offers_count")[:1]),
+        last_new_offers_count=Subquery(latest_checkin.values("new_offers_count")[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("offers", "0031_scrapingurlchange"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="scrapingurl",
+            name="last_checked_at",
+            field=models.DateTimeField(
+                blank=True, help_text="Time of the latest checkin of the URL", null=True, verbose_name="Last checked at"
+            ),
+        ),
+        migrations.AddField(
+            model_name="scrapingurl",
+            name="last_new_offers_count",
+            field=models.PositiveIntegerField(
+                blank=True,
+                help_text="Number of new offers in the latest checkin",
+                null=True,
+                verbose_name="Last new offers count",
+            ),
+        ),
+        migrations.AddField(
+            model_name="scrapingurl",
+            name="last_offers_count",
+            field=models.PositiveIntegerField(
+                blank=True,
+                help_text="Number of offers in the latest checkin",
+                null=True,
+                verbose_name="Last offers count",
+            ),
+        ),
+        migrations.RunPython(backfill_last_checkin, migrations.RunPython.noop),
+    ]
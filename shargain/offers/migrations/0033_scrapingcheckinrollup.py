@@ -0,0 +1,67 @@
+# Generated by Django 4.1.4 on 2026-10-19 16:01
+
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("offers", "0032_scrapingurl_last_checkin"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ScrapingCheckinRollup",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "period",
+                    models.CharField(choices=[("hour", "Hour"), ("day", "Day")], max_length=4, verbose_name="Period"),
+                ),
+                ("bucket_start", models.DateTimeField(verbose_name="Bucket start")),
+                ("checkins_count", models.PositiveIntegerField(verbose_name="Checkins count")),
+                ("offers_count", models.PositiveIntegerField(verbose_name="Offers count")),
+                ("new_offers_count", models.PositiveIntegerField(verbose_name="New offers count")),
+                (
+                    "observed_new_offers_count",
+                    models.PositiveIntegerField(
+                        help_text="New offers of checkins which have a previous checkin",
+                        verbose_name="Observed new offers count",
+                    ),
+                ),
+                (
+                    "observed_time",
+                    models.DurationField(help_text="Sum of gaps before the checkins", verbose_name="Observed time"),
+                ),
+                ("max_gap", models.DurationField(blank=True, null=True, verbose_name="Max gap")),
+                ("first_checkin_at", models.DateTimeField(verbose_name="First checkin at")),
+                ("last_checkin_at", models.DateTimeField(verbose_name="Last checkin at")),
+            ],
+            options={
+                "verbose_name": "Scraping checkin rollup",
+                "verbose_name_plural": "Scraping checkin rollups",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="scrapingcheckin",
+            index=django.contrib.postgres.indexes.BrinIndex(fields=["timestamp"], name="scraping_checkin_time_brin"),
+        ),
+        migrations.AddField(
+            model_name="scrapingcheckinrollup",
+            name="scraping_url",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE, related_name="checkin_rollups", to="offers.scrapingurl"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="scrapingcheckinrollup",
+            index=models.Index(fields=["period", "bucket_start"], name="scraping_rollup_period_idx"),
+        ),
+        migrations.AddConstraint(
+            model_name="scrapingcheckinrollup",
+            constraint=models.UniqueConstraint(
+                fields=("scraping_url", "period", "bucket_start"), name="scraping_checkin_rollup_bucket"
+            ),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.1.4 on 2026-10-19 16:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("offers", "0033_scrapingcheckinrollup"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="offer",
+            index=models.Index(fields=["target", "-created_at", "-id"], name="offer_feed_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="offer",
+            index=models.Index(fields=["target", "list_url", "-created_at", "-id"], name="offer_feed_list_url_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="offer",
+            index=models.Index(
+                condition=models.Q(("closed_at", None)),
+                fields=["target", "-created_at", "-id"],
+                name="offer_feed_open_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 4.1.4 on 2026-10-19 16:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("offers", "0034_offer_feed_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="offer",
+            index=models.Index(
+                condition=models.Q(("source_html", ""), _negated=True),
+                fields=["source_html"],
+                name="offer_source_html_idx",
+            ),
+        ),
+    ]
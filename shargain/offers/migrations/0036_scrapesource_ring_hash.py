@@ -0,0 +1,41 @@
+# Generated by Django 4.1.4 on 2026-10-19 18:40
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def get_ring_hash(key):
+    # Copy of shargain.offers.models.get_ring_hash as of this migration
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big", signed=True)
+
+
+def set_ring_hashes(apps, schema_editor):
+    ScrapeSource = apps.get_model("offers", "ScrapeSource")
+    for source in ScrapeSource.objects.only("id", "url").iterator():
+        ScrapeSource.objects.filter(id=source.id).update(ring_hash=get_ring_hash(source.url))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("offers", "0035_offer_source_html_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="scrapesource",
+            name="ring_hash",
+            field=models.BigIntegerField(null=True),
+        ),
+        migrations.RunPython(set_ring_hashes, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="scrapesource",
+            name="ring_hash",
+            field=models.BigIntegerField(
+                db_index=True,
+                editable=False,
+                help_text="Position of the URL on the scraper nodes' ring",
+                verbose_name="Ring hash",
+            ),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.1.4 on 2026-10-19 20:15
+
+from django.db import migrations, models
+from django.db.models import F, Max
+
+
+def set_versions(apps, schema_editor):
+    # Ids of changes were versions so far, so cursors synced by scrapers stay valid
+    ScrapingUrlChange = apps.get_model("offers", "ScrapingUrlChange")
+    ScrapingUrlVersion = apps.get_model("offers", "ScrapingUrlVersion")
+    ScrapingUrlChange.objects.update(version=F("id"))
+    ScrapingUrlVersion.objects.create(id=1, value=ScrapingUrlChange.objects.aggregate(Max("id"))["id__max"] or 0)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("offers", "0036_scrapesource_ring_hash"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ScrapingUrlVersion",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("value", models.BigIntegerField(default=0, verbose_name="Value")),
+            ],
+            options={
+                "verbose_name": "Scraping URL version",
+                "verbose_name_plural": "Scraping URL versions",
+            },
+        ),
+        migrations.AddField(
+            model_name="scrapingurlchange",
+            name="version",
+            field=models.BigIntegerField(null=True),
+        ),
+        migrations.RunPython(set_versions, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="scrapingurlchange",
+            name="version",
+            field=models.BigIntegerField(db_index=True, verbose_name="Version"),
+        ),
+    ]
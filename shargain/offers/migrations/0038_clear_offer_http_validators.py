@@ -0,0 +1,18 @@
+from django.db import migrations
+
+
+def clear_validators(apps, schema_editor):
+    # The offer checker stored validators of pages it didn't save, which could make the source HTML refresh keep
+    # a stale page; they are collected again together with the next downloaded source HTML
+    Offer = apps.get_model("offers", "Offer")
+    Offer.objects.exclude(http_etag="", http_last_modified="").update(http_etag="", http_last_modified="")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("offers", "0037_scrapingurlversion"),
+    ]
+
+    operations = [
+        migrations.RunPython(clear_validators, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,11 @@
+import hashlib
+from collections.abc import Iterable
 from typing import Any, TypedDict
-from urllib.parse import urlparse
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
 
-from django.contrib.postgres.indexes import HashIndex
-from django.db import models
-from django.db.models import Manager, QuerySet
+from django.contrib.postgres.indexes import BrinIndex, HashIndex
+from django.db import models, transaction
+from django.db.models import BooleanField, ExpressionWrapper, F, Manager, Q, QuerySet
 from django.utils import timezone
 from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _
@@ -11,6 +13,7 @@ from django_better_admin_arrayfield.models.fields import ArrayField
 
 from shargain.accounts.models import CustomUser
 from shargain.commons.models import TimeStampedModel
+from shargain.offers.storages import get_offer_source_storage
 
 
 class ScrappingTarget(models.Model):  # type: ignore[django-manager-missing]
@@ -43,6 +46,60 @@ class ScrappingTarget(models.Model):  # type: ignore[django-manager-missing]
         return f"{self.name} ({self.id})"
 
 
+def normalize_scrape_url(url: str) -> str:
+    """
+    Normalizes a list URL, so that URLs of the same list share one scrape source: the scheme and host are lowercased,
+    default ports, fragment and empty query parameters are dropped and query parameters are sorted.
+    """
+    parsed = urlparse(url.strip())
+    scheme = parsed.scheme.lower()
+    netloc = parsed.netloc.lower()
+    if (scheme, netloc.rsplit(":", 1)[-1]) in (("http", "80"), ("https", "443")):
+        netloc = netloc.rsplit(":", 1)[0]
+    query = urlencode(sorted((key, value) for key, value in parse_qsl(parsed.query) if value))
+    return urlunparse((scheme, netloc, parsed.path or "/", parsed.params, query, ""))
+
+
+def get_ring_hash(key: str) -> int:
+    """Position of the key on the hash ring of scraper nodes (a signed 64-bit integer, so that it fits a bigint)."""
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big", signed=True)
+
+
+class ScrapeSource(models.Model):
+    url = models.URLField(
+        _("URL"), max_length=1024, unique=True, help_text=_("Normalized list URL (see normalize_scrape_url)")
+    )
+    ring_hash = models.BigIntegerField(
+        _("Ring hash"), editable=False, db_index=True, help_text=_("Position of the URL on the scraper nodes' ring")
+    )
+    last_scraped_at = models.DateTimeField(_("Last scraped at"), blank=True, null=True)
+
+    class Meta:
+        verbose_name = _("Scrape source")
+        verbose_name_plural = _("Scrape sources")
+
+    def __str__(self):
+        return self.url
+
+    def save(self, *args, **kwargs):
+        self.ring_hash = get_ring_hash(self.url)
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def for_url(cls, url: str) -> "ScrapeSource":
+        source, _ = cls.objects.get_or_create(url=normalize_scrape_url(url))
+        return source
+
+
+class ScrapingUrlQuerySet(QuerySet["ScrapingUrl"]):
+    def active(self):
+        return self.filter(is_active=True, scraping_target__is_active=True)
+
+    def due_for_scrape(self, now=None):
+        """Active URLs whose next scrape is due, the most overdue first (see scraping_url_next_scrape_idx)"""
+        return self.active().filter(next_scrape_at__lte=now or timezone.now()).order_by("next_scrape_at")
+
+
 class ScrapingUrl(models.Model):
     name = models.CharField(_("Name"), max_length=255, help_text=_("Human readable name for the URL"))
     url = models.URLField(
@@ -82,14 +139,129 @@ class ScrapingUrl(models.Model):
         on_delete=models.CASCADE,
         help_text=_("Group of scraping URLs"),
     )
+    next_scrape_at = models.DateTimeField(
+        _("Next scrape at"),
+        help_text=_("Time when the URL should be scraped again"),
+        default=timezone.now,
+    )
+    scrape_interval = models.DurationField(
+        _("Scrape interval"),
+        help_text=_("Interval between scrapes computed from the rate of new offers"),
+        blank=True,
+        null=True,
+    )
+    last_checked_at = models.DateTimeField(
+        _("Last checked at"), blank=True, null=True, help_text=_("Time of the latest checkin of the URL")
+    )
+    last_offers_count = models.PositiveIntegerField(
+        _("Last offers count"), blank=True, null=True, help_text=_("Number of offers in the latest checkin")
+    )
+    last_new_offers_count = models.PositiveIntegerField(
+        _("Last new offers count"), blank=True, null=True, help_text=_("Number of new offers in the latest checkin")
+    )
+    last_fingerprint = models.CharField(
+        _("Last fingerprint"),
+        max_length=64,
+        blank=True,
+        help_text=_("Fingerprint of the ordered offer URLs of the last processed batch from this URL"),
+    )
+    source = models.ForeignKey(
+        ScrapeSource,
+        verbose_name=_("Scrape source"),
+        on_delete=models.PROTECT,
+        related_name="subscribers",
+        editable=False,
+        help_text=_("Source shared by all scraping URLs of the same list, which is scraped once for all of them"),
+    )
+
+    objects = ScrapingUrlQuerySet.as_manager()
 
     class Meta:
         verbose_name = _("Scraping URL")
         verbose_name_plural = _("Scraping URLs")
+        indexes = [
+            models.Index(fields=["next_scrape_at"], name="scraping_url_next_scrape_idx", condition=Q(is_active=True)),
+        ]
 
     def __str__(self):
         return f"{self.id}: {self.name}"
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "url" in update_fields:
+            self.source = ScrapeSource.for_url(self.url)
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "source"}
+        super().save(*args, **kwargs)
+
+
+class ScrapingUrlVersion(models.Model):
+    """
+    Version of the set of scraping URLs synced by scrapers, stored in a single row. Recording a change locks the row
+    and bumps the version in the transaction of the change, so versions are given in commit order: once a version is
+    visible, all changes with lower versions are committed too.
+    """
+
+    SINGLETON_ID = 1
+
+    value = models.BigIntegerField(_("Value"), default=0)
+
+    class Meta:
+        verbose_name = _("Scraping URL version")
+        verbose_name_plural = _("Scraping URL versions")
+
+    def __str__(self):
+        return f"Version {self.value}"
+
+
+class ScrapingUrlChange(models.Model):
+    """
+    Change log of scraping URLs for scrapers syncing them incrementally. Every write which adds, removes or changes
+    a URL visible to scrapers records a change (see ``shargain.offers.signals``) under the next ``ScrapingUrlVersion``.
+    """
+
+    scraping_url_id = models.BigIntegerField(_("Scraping URL id"))
+    version = models.BigIntegerField(_("Version"), db_index=True)
+    created_at = models.DateTimeField(_("Created at"), auto_now_add=True)
+
+    class Meta:
+        verbose_name = _("Scraping URL change")
+        verbose_name_plural = _("Scraping URL changes")
+
+    def __str__(self):
+        return f"Change {self.version} of scraping URL {self.scraping_url_id}"
+
+    @staticmethod
+    def record(scraping_url_ids: Iterable[int]):
+        scraping_url_ids = set(scraping_url_ids)
+        if not scraping_url_ids:
+            return
+        with transaction.atomic():
+            version, _created = ScrapingUrlVersion.objects.select_for_update().get_or_create(
+                id=ScrapingUrlVersion.SINGLETON_ID
+            )
+            version.value += 1
+            version.save(update_fields=["value"])
+            ScrapingUrlChange.objects.bulk_create(
+                [
+                    ScrapingUrlChange(scraping_url_id=scraping_url_id, version=version.value)
+                    for scraping_url_id in scraping_url_ids
+                ]
+            )
+
+    @classmethod
+    def record_target(cls, target_id: int):
+        cls.record(ScrapingUrl.objects.filter(scraping_target_id=target_id).values_list("id", flat=True))
+
+    @staticmethod
+    def get_version() -> int:
+        return (
+            ScrapingUrlVersion.objects.filter(id=ScrapingUrlVersion.SINGLETON_ID)
+            .values_list("value", flat=True)
+            .first()
+            or 0
+        )
+
 
 class ScrapingCheckin(models.Model):
     scraping_url = models.ForeignKey("offers.ScrapingUrl", on_delete=models.CASCADE, related_name="checkins")
@@ -100,11 +272,58 @@ class ScrapingCheckin(models.Model):
     class Meta:
         verbose_name = _("Scraping checkin")
         verbose_name_plural = _("Scraping checkins")
+        indexes = [
+            models.Index(fields=["scraping_url", "timestamp"], name="scraping_checkin_url_time_idx"),
+            # Checkins are appended in time order, so a BRIN index serves pruning of old rows at a fraction of the size
+            BrinIndex(fields=["timestamp"], name="scraping_checkin_time_brin"),
+        ]
 
     def __str__(self):
         return f"Checkin for {self.scraping_url} at {self.timestamp}"
 
 
+class RollupPeriod(models.TextChoices):
+    HOUR = "hour", _("Hour")
+    DAY = "day", _("Day")
+
+
+class ScrapingCheckinRollup(models.Model):
+    """
+    Checkins of a scraping URL aggregated into an hourly or daily bucket (see
+    ``shargain.offers.services.checkin_rollup``). Every checkin observes the time since the previous checkin of
+    its URL (its gap) and the new offers which showed up in it; the first checkin of a URL observes nothing.
+    """
+
+    scraping_url = models.ForeignKey(ScrapingUrl, on_delete=models.CASCADE, related_name="checkin_rollups")
+    period = models.CharField(_("Period"), max_length=4, choices=RollupPeriod.choices)
+    bucket_start = models.DateTimeField(_("Bucket start"))
+    checkins_count = models.PositiveIntegerField(_("Checkins count"))
+    offers_count = models.PositiveIntegerField(_("Offers count"))
+    new_offers_count = models.PositiveIntegerField(_("New offers count"))
+    observed_new_offers_count = models.PositiveIntegerField(
+        _("Observed new offers count"), help_text=_("New offers of checkins which have a previous checkin")
+    )
+    observed_time = models.DurationField(_("Observed time"), help_text=_("Sum of gaps before the checkins"))
+    max_gap = models.DurationField(_("Max gap"), blank=True, null=True)
+    first_checkin_at = models.DateTimeField(_("First checkin at"))
+    last_checkin_at = models.DateTimeField(_("Last checkin at"))
+
+    class Meta:
+        verbose_name = _("Scraping checkin rollup")
+        verbose_name_plural = _("Scraping checkin rollups")
+        constraints = [
+            models.UniqueConstraint(
+                fields=("scraping_url", "period", "bucket_start"), name="scraping_checkin_rollup_bucket"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["period", "bucket_start"], name="scraping_rollup_period_idx"),
+        ]
+
+    def __str__(self):
+        return f"Checkins of {self.scraping_url_id} per {self.period} from {self.bucket_start}"
+
+
 class OfferQueryset(QuerySet):
     def opened(self):
         return self.filter(closed_at=None)
@@ -121,6 +340,23 @@ class OfferQueryset(QuerySet):
     def with_source_html(self):
         return self.exclude(source_html="")
 
+    def order_by_source_html_refresh(self):
+        """Offers without source HTML first, then the most overdue ones (see offer_source_refresh_idx)"""
+        return self.order_by(source_html_exists_expression(), "next_check_at")
+
+    def due_for_check(self, now=None):
+        """Open offers whose next check is due, the most overdue first (see offer_next_check_idx)"""
+        return self.opened().filter(next_check_at__lte=now or timezone.now()).order_by("next_check_at")
+
+
+def source_html_exists_expression():
+    return ExpressionWrapper(~Q(source_html=""), output_field=BooleanField())
+
+
+class OfferClosureReason(models.TextChoices):
+    CHECK = "check", _("Offer's page check")
+    DISAPPEARED = "disappeared", _("Disappeared from its list URL")
+
 
 def get_offer_source_html_path(instance: "Offer", filename: str):
     _date = instance.published_at or timezone.localtime()
@@ -140,7 +376,12 @@ class Offer(TimeStampedModel):
     title = models.CharField(verbose_name=_("Title"), max_length=200)
     price = models.IntegerField(verbose_name=_("Price"), blank=True, null=True)
     main_image_url = models.URLField(_("Main image's URL"), blank=True, max_length=1024)
-    source_html = models.FileField(verbose_name=_("Source HTML"), upload_to=get_offer_source_html_path, blank=True)
+    source_html = models.FileField(
+        verbose_name=_("Source HTML"),
+        upload_to=get_offer_source_html_path,
+        storage=get_offer_source_storage,
+        blank=True,
+    )
     list_url = models.URLField(
         _("List URL"),
         max_length=1024,
@@ -163,11 +404,33 @@ class Offer(TimeStampedModel):
 
     published_at = models.DateTimeField(verbose_name=_("Published at"), blank=True, null=True)
     closed_at = models.DateTimeField(verbose_name=_("Closed at"), blank=True, null=True)
+    closure_reason = models.CharField(
+        verbose_name=_("Closure reason"), max_length=16, choices=OfferClosureReason.choices, blank=True
+    )
+    last_seen_at = models.DateTimeField(
+        verbose_name=_("Last seen at"),
+        help_text=_("Time when the offer was last seen on its list URL"),
+        default=timezone.localtime,
+    )
     last_check_at = models.DateTimeField(
         verbose_name=_("Last check at"),
         help_text=_("Time of last offer check"),
         default=timezone.localtime,
     )
+    next_check_at = models.DateTimeField(
+        verbose_name=_("Next check at"),
+        help_text=_("Time when the offer should be checked again"),
+        default=timezone.localtime,
+    )
+    http_etag = models.CharField(
+        _("HTTP ETag"), max_length=255, blank=True, help_text=_("ETag of the offer's page from the last check")
+    )
+    http_last_modified = models.CharField(
+        _("HTTP Last-Modified"),
+        max_length=64,
+        blank=True,
+        help_text=_("Last-Modified header of the offer's page from the last check"),
+    )
 
     objects = Manager.from_queryset(OfferQueryset)()
 
@@ -176,6 +439,23 @@ class Offer(TimeStampedModel):
         verbose_name_plural = _("Offers")
         indexes = [
             HashIndex(fields=["url"], name="offer_url_hash_idx"),
+            models.Index(
+                source_html_exists_expression(),
+                F("next_check_at"),
+                name="offer_source_refresh_idx",
+                condition=Q(closed_at=None),
+            ),
+            models.Index(fields=["next_check_at"], name="offer_next_check_idx", condition=Q(closed_at=None)),
+            models.Index(fields=["source_html"], name="offer_source_html_idx", condition=~Q(source_html="")),
+            models.Index(
+                fields=["target", "list_url", "last_seen_at"], name="offer_last_seen_idx", condition=Q(closed_at=None)
+            ),
+            # Keyset pagination of the offer feed of a target, newest first
+            models.Index(fields=["target", "-created_at", "-id"], name="offer_feed_idx"),
+            models.Index(fields=["target", "list_url", "-created_at", "-id"], name="offer_feed_list_url_idx"),
+            models.Index(
+                fields=["target", "-created_at", "-id"], name="offer_feed_open_idx", condition=Q(closed_at=None)
+            ),
         ]
 
     @property
@@ -27,6 +27,7 @@ class OfferBasicSerializer(serializers.ModelSerializer):
 class OfferBatchCreateSerializer(serializers.Serializer):
     target = serializers.PrimaryKeyRelatedField(queryset=ScrappingTarget.objects.all())
     offers = OfferBasicSerializer(many=True)
+    fingerprint = serializers.CharField(max_length=64, required=False, allow_blank=True)
 
     class Meta:
         model = Offer
@@ -37,6 +38,17 @@ class OfferBatchCreateSerializer(serializers.Serializer):
         return value
 
 
+class OfferBatchFingerprintSerializer(serializers.Serializer):
+    """
+    Reads only what's needed to recognize an unchanged batch, so that offers are not validated
+    (see ``OfferBatchCreateService``).
+    """
+
+    target = serializers.PrimaryKeyRelatedField(queryset=ScrappingTarget.objects.all())
+    offers = serializers.ListField(child=serializers.DictField(), allow_empty=False)
+    fingerprint = serializers.CharField(max_length=64)
+
+
 class OfferSerializer(serializers.ModelSerializer):
     target = serializers.SlugRelatedField(slug_field="name", queryset=ScrappingTarget.objects.all())
 
@@ -56,6 +68,16 @@ class ScrapingUrlSerializer(serializers.ModelSerializer):
         fields = ("id", "name", "url")
 
 
+class SyncScrapingUrlSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ScrapingUrl
+        fields = ("id", "name", "url", "scraping_target")
+
+
+class ScrapingUrlSyncQuerySerializer(serializers.Serializer):
+    cursor = serializers.IntegerField(min_value=0, required=False)
+
+
 class ScrappingTargetSerializer(serializers.ModelSerializer):
     urls = serializers.SerializerMethodField(method_name="get_scraping_urls")
 
@@ -71,6 +93,10 @@ class ScrappingTargetSerializer(serializers.ModelSerializer):
         )
 
     def get_scraping_urls(self, obj: ScrappingTarget):
+        # The list view prefetches the URLs already filtered (see ScrappingTargetViewSet.get_queryset)
+        if hasattr(obj, "listed_scraping_urls"):
+            return [scraping_url.url for scraping_url in obj.listed_scraping_urls]
+
         request = self.context.get("request")
         show_all = request and request.query_params.get("include_inactive_urls") == "true"
 
@@ -1,5 +1,5 @@
 """Services package for offer-related business logic."""
 
-from shargain.offers.services.batch_create import OfferBatchCreateService
+from shargain.offers.services.batch_create import OfferBatchCreateService, OfferFanOutService
 
-__all__ = ["OfferBatchCreateService"]
+__all__ = ["OfferBatchCreateService", "OfferFanOutService"]
@@ -1,13 +1,25 @@
+import copy
+import hashlib
 import logging
 from collections import Counter
+from typing import cast
 
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, DateTimeField, F, Q, Value, When
+from django.db.models.functions import Greatest
+from django.utils import timezone
 from opentelemetry import trace
 
 from shargain.notifications.services.notifications import NewOfferNotificationService
 from shargain.offers.application.commands.record_checkin import record_checkin
 from shargain.offers.application.dto import WaypointData
-from shargain.offers.models import Offer, ScrapingUrl, ScrappingTarget
-from shargain.offers.serializers import OfferBatchCreateSerializer
+from shargain.offers.models import Offer, OfferClosureReason, ScrapingUrl, ScrappingTarget
+from shargain.offers.serializers import (
+    OfferBasicSerializer,
+    OfferBatchCreateSerializer,
+    OfferBatchFingerprintSerializer,
+)
 from shargain.offers.services.geo_utils import haversine
 from shargain.offers.signals import offers_batch_created
 from shargain.quotas.services.quota import QuotaService
@@ -16,39 +28,115 @@ logger = logging.getLogger(__name__)
 
 
 class OfferBatchCreateService:
+    """
+    Creates new offers from a batch scraped from the target's list URLs and notifies about them.
+
+    A batch may carry a fingerprint of its ordered offer URLs (see ``get_fingerprint``). If the batch comes from
+    a single list URL whose last processed batch had the same fingerprint, the list didn't change, so offers are
+    neither validated nor processed: only a checkin is recorded and known offers are marked as seen. Fingerprints
+    which don't match the URLs of the batch are ignored, so a buggy client can't suppress ingestion of a changed list.
+    """
+
     serializer_class = OfferBatchCreateSerializer
+    fingerprint_serializer_class = OfferBatchFingerprintSerializer
     notification_service_class = NewOfferNotificationService
 
     def __init__(self, serializer_kwargs: dict, notify: bool = True):
         self._serializer_kwargs = serializer_kwargs
 
+    @staticmethod
+    def get_fingerprint(urls: list[str]) -> str:
+        return hashlib.sha256("\n".join(urls).encode()).hexdigest()
+
+    @classmethod
+    def is_fingerprint_of(cls, fingerprint: str, offers_data: list[dict]) -> bool:
+        urls = [offer.get("url") for offer in offers_data]
+        if not all(isinstance(url, str) for url in urls):
+            return False
+        return cls.get_fingerprint(cast(list[str], urls)) == fingerprint
+
     def run(self):
         tracer = trace.get_tracer(__name__)
         with tracer.start_as_current_span("batch_create.run") as span:
+            if self._run_unchanged():
+                span.set_attribute("batch.unchanged", True)
+                return []
             serializer = self.serializer_class(**self._serializer_kwargs)
             serializer.is_valid(raise_exception=True)
-            target = serializer.validated_data["target"]
-            span.set_attribute("target.id", str(target.id))
-            if target.owner_id and not QuotaService.check_can_create_offers(
-                user_id=target.owner_id, target_id=target.id
+            validated_data = serializer.validated_data
+            if validated_data.get("fingerprint") and not self.is_fingerprint_of(
+                validated_data["fingerprint"], validated_data["offers"]
             ):
-                return []
-            offers: list[tuple[Offer, bool]] = self.create(serializer.validated_data)
-            new_offers = [r[0] for r in filter(lambda x: x[1], offers)]
-            span.set_attribute("offers.total", len(offers))
-            span.set_attribute("offers.new", len(new_offers))
-            self._notify(new_offers, target)
-
-            self._record_checkins(serializer.validated_data["offers"], offers, target)
-            if target.owner_id and new_offers:
-                offers_batch_created.send(
-                    sender=self.__class__,
-                    user_id=target.owner_id,
-                    target_id=target.id,
-                    count=len(new_offers),
-                )
+                logger.warning("Ignoring fingerprint not matching the batch [target=%s]", validated_data["target"].id)
+                validated_data = {**validated_data, "fingerprint": ""}
+            return [offer.url for offer in self._process(validated_data)]
 
-            return [offer.url for offer in new_offers]
+    def _process(self, validated_data: dict) -> list[Offer]:
+        """Creates offers of the validated batch for its target. Returns new offers."""
+        span = trace.get_current_span()
+        target = validated_data["target"]
+        span.set_attribute("target.id", str(target.id))
+        if target.owner_id and not QuotaService.check_can_create_offers(user_id=target.owner_id, target_id=target.id):
+            return []
+        offers: list[tuple[Offer, bool]] = self.create(validated_data)
+        new_offers = [r[0] for r in filter(lambda x: x[1], offers)]
+        span.set_attribute("offers.total", len(offers))
+        span.set_attribute("offers.new", len(new_offers))
+        # Sent once the offers are committed, so that no one is notified about offers of a batch which was rolled back
+        transaction.on_commit(lambda: self._notify_committed(new_offers, target))
+
+        self._record_checkins(validated_data["offers"], offers, target)
+        self._store_fingerprint(validated_data, target)
+        if target.owner_id and new_offers:
+            offers_batch_created.send(
+                sender=self.__class__,
+                user_id=target.owner_id,
+                target_id=target.id,
+                count=len(new_offers),
+            )
+        return new_offers
+
+    def _run_unchanged(self) -> bool:
+        """Handles the batch if its list didn't change since the last one. Returns False if it has to be processed."""
+        data = self._serializer_kwargs.get("data")
+        if not isinstance(data, dict) or not data.get("fingerprint"):
+            return False
+        serializer = self.fingerprint_serializer_class(data=data)
+        if not serializer.is_valid():
+            return False
+        target = serializer.validated_data["target"]
+        offers_data = serializer.validated_data["offers"]
+        fingerprint = serializer.validated_data["fingerprint"]
+        if not self.is_fingerprint_of(fingerprint, offers_data):
+            return False
+        list_urls = {offer.get("list_url") for offer in offers_data}
+        if len(list_urls) != 1 or not (list_url := list_urls.pop()):
+            return False
+        scraping_url = ScrapingUrl.objects.filter(
+            url=list_url, scraping_target=target, last_fingerprint=fingerprint
+        ).first()
+        if scraping_url is None:
+            return False
+        self._skip_unchanged(scraping_url, [offer.get("url") for offer in offers_data])
+        return True
+
+    def _skip_unchanged(self, scraping_url: ScrapingUrl, urls: list[str | None]):
+        """Records that the list didn't change: known offers are marked as seen and a checkin is recorded."""
+        self._mark_seen({url for url in urls if url}, scraping_url.scraping_target)
+        record_checkin(scraping_url_id=scraping_url.id, offers_count=len(urls), new_offers_count=0)
+        logger.info(
+            "Batch didn't change since the last one [target=%s] [list_url=%s]",
+            scraping_url.scraping_target_id,
+            scraping_url.url,
+        )
+
+    @staticmethod
+    def _store_fingerprint(validated_data: dict, target: ScrappingTarget):
+        if not (fingerprint := validated_data.get("fingerprint")):
+            return
+        list_urls = {offer.get("list_url") for offer in validated_data["offers"]}
+        if len(list_urls) == 1 and (list_url := list_urls.pop()):
+            ScrapingUrl.objects.filter(url=list_url, scraping_target=target).update(last_fingerprint=fingerprint)
 
     @staticmethod
     def simplify_url(url):  # currently not used
@@ -70,6 +158,8 @@ class OfferBatchCreateService:
 
         with tracer.start_as_current_span("batch_create.create_offer") as span:
             existing_urls = set(Offer.objects.filter(url__in=urls, target=target).values_list("url", flat=True))
+            if existing_urls:
+                self._mark_seen(existing_urls, target)
 
             new_offers = [
                 Offer(url=url, target=target, **data)
@@ -93,6 +183,23 @@ class OfferBatchCreateService:
 
         return results
 
+    @staticmethod
+    def _mark_seen(urls: set[str], target: ScrappingTarget):
+        """
+        Records that already known offers are still listed on their list URL, with a single UPDATE.
+
+        Being listed proves that the offer is open, so offers previously closed because they disappeared from
+        the list are reopened and the next check of the offer's page is postponed.
+        """
+        now = timezone.now()
+        disappeared = Q(closure_reason=OfferClosureReason.DISAPPEARED)
+        Offer.objects.filter(url__in=urls, target=target).update(
+            last_seen_at=now,
+            closed_at=Case(When(disappeared, then=Value(None)), default=F("closed_at"), output_field=DateTimeField()),
+            closure_reason=Case(When(disappeared, then=Value("")), default=F("closure_reason")),
+            next_check_at=Greatest(F("next_check_at"), Value(now + settings.OFFER_CHECK_MAX_INTERVAL)),
+        )
+
     @staticmethod
     def _record_checkins(offers_data: list, created_offers: list[tuple[Offer, bool]], target: ScrappingTarget):
         """
@@ -115,6 +222,13 @@ class OfferBatchCreateService:
                 new_offers_count=new_offers_count.get(list_url, 0),
             )
 
+    def _notify_committed(self, new_offers, scrapping_target):
+        try:
+            self._notify(new_offers, scrapping_target)
+        except Exception:
+            # The offers are already saved, a failed notification must not fail their ingestion
+            logger.exception("Couldn't notify about new offers [target=%s]", scrapping_target.id)
+
     def _notify(self, new_offers, scrapping_target):
         if not (new_offers and scrapping_target.notification_config and scrapping_target.enable_notifications):
             return
@@ -193,3 +307,53 @@ class OfferBatchCreateService:
             self.notification_service_class(
                 message_contexts, scrapping_target, notification_title=notification_title
             ).run()
+
+
+class OfferFanOutService(OfferBatchCreateService):
+    """
+    Ingests offers scraped once from a ``ScrapeSource`` for all of its subscribed scraping URLs.
+
+    Offers are validated once, then every subscriber gets its own copy of them (with its own list URL), so that
+    its target's quotas, filters, notifications and checkins are applied as if the batch was posted for it.
+    """
+
+    offers_serializer_class = OfferBasicSerializer
+
+    def __init__(self, scraping_urls: list[ScrapingUrl], offers_data: list[dict], fingerprint: str = ""):
+        super().__init__(serializer_kwargs={})
+        self._scraping_urls = scraping_urls
+        self._offers_data = offers_data
+        self._fingerprint = fingerprint
+
+    def run(self) -> dict[int, list[str] | None]:
+        """
+        Returns URLs of new offers per scraping URL id; None if the offers couldn't be saved for the scraping URL,
+        which doesn't stop saving them for other subscribers.
+        """
+        tracer = trace.get_tracer(__name__)
+        with tracer.start_as_current_span("batch_create.fan_out") as span:
+            span.set_attribute("subscribers", len(self._scraping_urls))
+            serializer = self.offers_serializer_class(data=self._offers_data, many=True)
+            serializer.is_valid(raise_exception=True)
+            new_offers_urls: dict[int, list[str] | None] = {}
+            for scraping_url in self._scraping_urls:
+                if self._fingerprint and scraping_url.last_fingerprint == self._fingerprint:
+                    self._skip_unchanged(scraping_url, [offer["url"] for offer in serializer.validated_data])
+                    new_offers_urls[scraping_url.id] = []
+                    continue
+                offers = copy.deepcopy(serializer.validated_data)
+                for offer in offers:
+                    offer["list_url"] = scraping_url.url
+                validated_data = {
+                    "target": scraping_url.scraping_target,
+                    "offers": offers,
+                    "fingerprint": self._fingerprint,
+                }
+                try:
+                    # A savepoint per subscriber, so a failed one doesn't break the transaction of the others
+                    with transaction.atomic():
+                        new_offers_urls[scraping_url.id] = [offer.url for offer in self._process(validated_data)]
+                except Exception:
+                    logger.exception("Couldn't save offers for subscriber [scraping_url=%s]", scraping_url.id)
+                    new_offers_urls[scraping_url.id] = None
+            return new_offers_urls
@@ -0,0 +1,119 @@
+"""
+Adaptive scheduling of open offers' checks.
+
+Every open offer has ``next_check_at``; checks are served from the (indexed) queue of offers which are due.
+After a check the offer is rescheduled according to how likely it is to close soon. The likelihood is the
+historical closure rate (closures per day of being open) of offers from the same domain and of the same age,
+computed from recently created offers and cached. The offer is checked again once the probability that it has
+closed since the last check reaches ``target_probability``, within ``[min_interval, max_interval]``.
+"""
+
+import bisect
+import dataclasses
+import math
+from datetime import datetime, timedelta
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Aggregate, CharField, Count, DurationField, ExpressionWrapper, F, Func, Q, Sum, Value
+from django.db.models.functions import Coalesce, Least
+from django.utils import timezone
+
+from shargain.offers.models import Offer
+
+AGE_BUCKETS = (
+    timedelta(0),
+    timedelta(days=1),
+    timedelta(days=3),
+    timedelta(days=7),
+    timedelta(days=14),
+    timedelta(days=30),
+)
+"""Lower bounds of offer age buckets, the last bucket is unbounded"""
+
+CLOSURE_RATES_CACHE_KEY = "offers:closure-rates"
+
+
+def get_age_bucket(age: timedelta) -> int:
+    return max(bisect.bisect_right(AGE_BUCKETS, age) - 1, 0)
+
+
+def compute_closure_rates(window: timedelta, min_exposure_days: float) -> dict[tuple[str, int], float]:
+    """
+    Computes closure rates (closures per day of being open) of offers created within the window,
+    per domain and age bucket. Buckets with less than min_exposure_days of total exposure are skipped.
+    """
+    now = timezone.now()
+    lifetime = ExpressionWrapper(Coalesce(F("closed_at"), Value(now)) - F("created_at"), output_field=DurationField())
+    aggregates: dict[str, Aggregate] = {}
+    for index, start in enumerate(AGE_BUCKETS):
+        end = AGE_BUCKETS[index + 1] if index + 1 < len(AGE_BUCKETS) else None
+        reached_bucket = Q(lifetime__gte=start)
+        closed_in_bucket = reached_bucket & Q(closed_at__isnull=False) & (Q(lifetime__lt=end) if end else Q())
+        time_in_bucket = Least(F("lifetime"), Value(end)) if end else F("lifetime")
+        aggregates[f"closed_{index}"] = Count("id", filter=closed_in_bucket)
+        aggregates[f"exposure_{index}"] = Sum(
+            ExpressionWrapper(time_in_bucket - Value(start), output_field=DurationField()), filter=reached_bucket
+        )
+    rows = (
+        Offer.objects.filter(created_at__gte=now - window)
+        .annotate(
+            lifetime=lifetime,
+            url_domain=Func(F("url"), Value(r"^https?://([^/]+)"), function="substring", output_field=CharField()),
+        )
+        .order_by()
+        .values("url_domain")
+        .annotate(**aggregates)
+    )
+    rates = {}
+    for row in rows:
+        for index in range(len(AGE_BUCKETS)):
+            exposure_days = (row[f"exposure_{index}"] or timedelta(0)).total_seconds() / 86400
+            if exposure_days >= min_exposure_days:
+                rates[(row["url_domain"], index)] = row[f"closed_{index}"] / exposure_days
+    return rates
+
+
+@dataclasses.dataclass
+class CheckScheduler:
+    min_interval: timedelta
+    max_interval: timedelta
+    target_probability: float
+    default_closure_rate: float
+    """Closures per day assumed for domains and ages without enough history"""
+    closure_rates: dict[tuple[str, int], float] = dataclasses.field(default_factory=dict)
+
+    @classmethod
+    def from_settings(cls) -> "CheckScheduler":
+        closure_rates: dict[tuple[str, int], float] | None = cache.get_or_set(
+            CLOSURE_RATES_CACHE_KEY,
+            lambda: compute_closure_rates(
+                window=settings.OFFER_CHECK_HISTORY_WINDOW,
+                min_exposure_days=settings.OFFER_CHECK_MIN_EXPOSURE_DAYS,
+            ),
+            timeout=settings.OFFER_CHECK_CLOSURE_RATES_TTL,
+        )
+        return cls(
+            min_interval=settings.OFFER_CHECK_MIN_INTERVAL,
+            max_interval=settings.OFFER_CHECK_MAX_INTERVAL,
+            target_probability=settings.OFFER_CHECK_TARGET_PROBABILITY,
+            default_closure_rate=settings.OFFER_CHECK_DEFAULT_CLOSURE_RATE,
+            closure_rates=closure_rates or {},
+        )
+
+    def get_closure_rate(self, offer: Offer, now: datetime) -> float:
+        key = (urlparse(offer.url).netloc, get_age_bucket(now - offer.created_at))
+        return self.closure_rates.get(key, self.default_closure_rate)
+
+    def get_check_interval(self, offer: Offer, now: datetime) -> timedelta:
+        closure_rate = self.get_closure_rate(offer, now)
+        if closure_rate <= 0:
+            return self.max_interval
+        # closures are modelled as a Poisson process, so P(closed within t) = 1 - exp(-rate * t)
+        interval = timedelta(days=-math.log1p(-self.target_probability) / closure_rate)
+        return min(max(interval, self.min_interval), self.max_interval)
+
+    def get_next_check_at(self, offer: Offer, now: datetime | None = None) -> datetime:
+        now = now or timezone.now()
+        return now + self.get_check_interval(offer, now)
@@ -0,0 +1,228 @@
+"""
+Hourly and daily rollups of scraping checkins with retention of raw checkins.
+
+A ``ScrapingCheckin`` is recorded for every scrape of every list URL, so raw rows are kept only for
+``CHECKIN_RETENTION`` and readers of longer histories (dashboards, the scrape scheduler) read
+``ScrapingCheckinRollup`` instead. Every run recomputes hourly buckets of complete hours from raw checkins, starting
+``CHECKIN_ROLLUP_LOOKBACK`` before the end of the last rolled up hour, so that checkins committed late are counted too.
+A run rolls up at most ``CHECKIN_ROLLUP_MAX_HOURS``, so a long backlog is caught up over several runs. Hours are
+rolled up day by day, each followed by the daily buckets of the days it wrote to, so an interrupted run keeps
+the buckets of the days it has finished. Raw checkins older than the retention window (but
+never ones which may still be rolled up again) are deleted in chunks, so that no single DELETE holds locks for long.
+"""
+
+import dataclasses
+from collections import defaultdict
+from datetime import UTC, datetime, timedelta
+
+from django.conf import settings
+from django.db.models import Max, Min, OuterRef, Subquery, Sum
+from django.db.models.functions import TruncDay
+from django.utils import timezone
+
+from shargain.offers.models import RollupPeriod, ScrapingCheckin, ScrapingCheckinRollup, ScrapingUrl
+
+HOUR = timedelta(hours=1)
+DAY = timedelta(days=1)
+
+BUCKET_FIELDS = [
+    "checkins_count",
+    "offers_count",
+    "new_offers_count",
+    "observed_new_offers_count",
+    "observed_time",
+    "max_gap",
+    "first_checkin_at",
+    "last_checkin_at",
+]
+
+
+def truncate_hour(moment: datetime) -> datetime:
+    return moment.astimezone(UTC).replace(minute=0, second=0, microsecond=0)
+
+
+@dataclasses.dataclass
+class _Bucket:
+    checkins_count: int = 0
+    offers_count: int = 0
+    new_offers_count: int = 0
+    observed_new_offers_count: int = 0
+    observed_time: timedelta = timedelta()
+    max_gap: timedelta | None = None
+    first_checkin_at: datetime | None = None
+    last_checkin_at: datetime | None = None
+
+    def add(self, timestamp: datetime, offers_count: int, new_offers_count: int, previous_at: datetime | None):
+        self.checkins_count += 1
+        self.offers_count += offers_count
+        self.new_offers_count += new_offers_count
+        if previous_at is not None:
+            gap = timestamp - previous_at
+            self.observed_new_offers_count += new_offers_count
+            self.observed_time += gap
+            self.max_gap = gap if self.max_gap is None else max(self.max_gap, gap)
+        self.first_checkin_at = self.first_checkin_at or timestamp
+        self.last_checkin_at = timestamp
+
+
+class CheckinRollupService:
+    BATCH_SIZE = 1000
+
+    def __init__(self, lookback: timedelta, max_hours: int, retention: timedelta, prune_chunk_size: int):
+        """
+        :param lookback: rolled up hours recomputed on every run
+        :param max_hours: maximal number of hours rolled up in one run
+        :param retention: age after which raw checkins are deleted
+        :param prune_chunk_size: number of raw checkins deleted in one statement
+        """
+        self._lookback = lookback
+        self._max_hours = max_hours
+        self._retention = retention
+        self._prune_chunk_size = prune_chunk_size
+
+    @classmethod
+    def from_settings(cls) -> "CheckinRollupService":
+        return cls(
+            lookback=settings.CHECKIN_ROLLUP_LOOKBACK,
+            max_hours=settings.CHECKIN_ROLLUP_MAX_HOURS,
+            retention=settings.CHECKIN_RETENTION,
+            prune_chunk_size=settings.CHECKIN_PRUNE_CHUNK_SIZE,
+        )
+
+    @staticmethod
+    def get_rolled_up_until() -> datetime | None:
+        last_bucket = ScrapingCheckinRollup.objects.filter(period=RollupPeriod.HOUR).aggregate(last=Max("bucket_start"))
+        return last_bucket["last"] + HOUR if last_bucket["last"] else None
+
+    def rollup(self, now: datetime | None = None) -> int:
+        """
+        Rolls up complete hours (and their days) which are new or within the lookback.
+
+        :return: number of written buckets
+        """
+        now_hour = truncate_hour(now or timezone.now())
+        ranges = []
+        new_checkins = ScrapingCheckin.objects.all()
+        if (rolled_up_until := self.get_rolled_up_until()) is not None:
+            ranges.append((rolled_up_until - self._lookback, min(rolled_up_until, now_hour)))
+            new_checkins = new_checkins.filter(timestamp__gte=rolled_up_until)
+        # Hours without checkins are skipped, so that a capped run always reaches new checkins
+        if (next_checkin_at := new_checkins.aggregate(first=Min("timestamp"))["first"]) is not None:
+            start = truncate_hour(next_checkin_at)
+            ranges.append((start, min(start + self._max_hours * HOUR, now_hour)))
+
+        buckets = 0
+        for start, end in ranges:
+            # Long ranges (e.g. the history rolled up on the first run) are rolled up day by day to bound memory usage
+            chunk_start = start
+            while chunk_start < end:
+                chunk_end = min(chunk_start + DAY, end)
+                hours = self._rollup_hours(chunk_start, chunk_end)
+                buckets += len(hours)
+                if hours:
+                    buckets += self._rollup_days(min(hours), max(hours))
+                chunk_start = chunk_end
+        return buckets
+
+    def _rollup_hours(self, start: datetime, end: datetime) -> set[datetime]:
+        """
+        :return: starts of the written hourly buckets
+        """
+        checkins = ScrapingCheckin.objects.filter(timestamp__gte=start, timestamp__lt=end)
+        previous_checkins = ScrapingCheckin.objects.filter(scraping_url=OuterRef("pk"), timestamp__lt=start)
+        previous_at = dict(
+            ScrapingUrl.objects.filter(id__in=checkins.values("scraping_url_id"))
+            .annotate(previous_at=Subquery(previous_checkins.order_by("-timestamp").values("timestamp")[:1]))
+            .values_list("id", "previous_at")
+        )
+
+        buckets: dict[tuple[int, datetime], _Bucket] = defaultdict(_Bucket)
+        rows = (
+            checkins.order_by("scraping_url_id", "timestamp")
+            .values_list("scraping_url_id", "timestamp", "offers_count", "new_offers_count")
+            .iterator(chunk_size=self.BATCH_SIZE)
+        )
+        for scraping_url_id, timestamp, offers_count, new_offers_count in rows:
+            bucket = buckets[(scraping_url_id, truncate_hour(timestamp))]
+            bucket.add(timestamp, offers_count, new_offers_count, previous_at.get(scraping_url_id))
+            previous_at[scraping_url_id] = timestamp
+
+        self._save(
+            [
+                ScrapingCheckinRollup(
+                    scraping_url_id=scraping_url_id,
+                    period=RollupPeriod.HOUR,
+                    bucket_start=bucket_start,
+                    **dataclasses.asdict(bucket),
+                )
+                for (scraping_url_id, bucket_start), bucket in buckets.items()
+            ]
+        )
+        return {bucket_start for _, bucket_start in buckets}
+
+    def _rollup_days(self, first_hour: datetime, last_hour: datetime) -> int:
+        """Recomputes daily buckets of the days from the one of first_hour to the one of last_hour."""
+        # Days are in the project's time zone, so daily dashboards match the calendar of the users
+        day_start = timezone.localtime(first_hour).replace(hour=0, minute=0, second=0, microsecond=0)
+        day_end = timezone.localtime(last_hour).replace(hour=0, minute=0, second=0, microsecond=0) + DAY
+        days = (
+            ScrapingCheckinRollup.objects.filter(
+                period=RollupPeriod.HOUR, bucket_start__gte=day_start, bucket_start__lt=day_end
+            )
+            .annotate(day=TruncDay("bucket_start"))
+            .values("scraping_url_id", "day")
+            .annotate(
+                total_checkins=Sum("checkins_count"),
+                total_offers=Sum("offers_count"),
+                total_new_offers=Sum("new_offers_count"),
+                total_observed_new_offers=Sum("observed_new_offers_count"),
+                total_observed_time=Sum("observed_time"),
+                longest_gap=Max("max_gap"),
+                first=Min("first_checkin_at"),
+                last=Max("last_checkin_at"),
+            )
+            .order_by()
+        )
+        rollups = [
+            ScrapingCheckinRollup(
+                scraping_url_id=day["scraping_url_id"],
+                period=RollupPeriod.DAY,
+                bucket_start=day["day"],
+                checkins_count=day["total_checkins"],
+                offers_count=day["total_offers"],
+                new_offers_count=day["total_new_offers"],
+                observed_new_offers_count=day["total_observed_new_offers"],
+                observed_time=day["total_observed_time"],
+                max_gap=day["longest_gap"],
+                first_checkin_at=day["first"],
+                last_checkin_at=day["last"],
+            )
+            for day in days
+        ]
+        self._save(rollups)
+        return len(rollups)
+
+    def _save(self, rollups: list[ScrapingCheckinRollup]):
+        ScrapingCheckinRollup.objects.bulk_create(
+            rollups,
+            batch_size=self.BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=["scraping_url", "period", "bucket_start"],
+            update_fields=BUCKET_FIELDS,
+        )
+
+    def prune(self, now: datetime | None = None) -> int:
+        """
+        Deletes raw checkins older than the retention window which won't be rolled up again.
+
+        :return: number of deleted checkins
+        """
+        if (rolled_up_until := self.get_rolled_up_until()) is None:
+            return 0
+        cutoff = min((now or timezone.now()) - self._retention, rolled_up_until - self._lookback)
+        deleted = 0
+        while ids := list(
+            ScrapingCheckin.objects.filter(timestamp__lt=cutoff).values_list("id", flat=True)[: self._prune_chunk_size]
+        ):
+            deleted += ScrapingCheckin.objects.filter(id__in=ids).delete()[0]
+        return deleted
@@ -0,0 +1,84 @@
+"""
+Parsing stage of offer checks.
+
+Pages are downloaded by the I/O-bound stage (see ``offer_checker``) and sent in batches, together with ids of
+the offers they belong to, to the ``close_offers_with_closed_pages`` task. The task is routed to the parsing queue,
+so parsing is scaled with the workers consuming that queue, independently of the number of concurrent downloads.
+"""
+
+import dataclasses
+import logging
+from collections.abc import Callable
+from itertools import batched
+from typing import Any
+
+from django.conf import settings
+from django.utils import timezone
+
+from shargain.offers.models import Offer, OfferClosureReason
+from shargain.parsers.closure import FetchedPage, detect_closed_batch
+
+logger = logging.getLogger(__name__)
+
+OfferPage = tuple[list[int], FetchedPage]
+"""Downloaded page and ids of the offers it belongs to"""
+
+
+def serialize_offer_pages(offer_pages: list[OfferPage]) -> list[dict[str, Any]]:
+    return [{"offer_ids": offer_ids, "page": dataclasses.asdict(page)} for offer_ids, page in offer_pages]
+
+
+def deserialize_offer_pages(data: list[dict[str, Any]]) -> list[OfferPage]:
+    return [(item["offer_ids"], FetchedPage(**item["page"])) for item in data]
+
+
+def close_offers_with_closed_pages(offer_pages: list[OfferPage]) -> int:
+    """
+    Closes open offers whose pages say so. Pages which couldn't be parsed are skipped.
+
+    :return: number of closed offers
+    """
+    results = detect_closed_batch([page for _, page in offer_pages])
+    closed_ids = [
+        offer_id
+        for (offer_ids, _), is_closed in zip(offer_pages, results, strict=True)
+        if is_closed
+        for offer_id in offer_ids
+    ]
+    return Offer.objects.filter(id__in=closed_ids, closed_at=None).update(
+        closed_at=timezone.now(), closure_reason=OfferClosureReason.CHECK
+    )
+
+
+def _send_to_parsing_queue(data: list[dict[str, Any]]) -> None:
+    from shargain.offers.tasks import close_offers_with_closed_pages as close_offers_with_closed_pages_task
+
+    close_offers_with_closed_pages_task.delay(data)
+
+
+class ClosureParser:
+    """Sends downloaded pages to the parsing queue in batches."""
+
+    def __init__(self, batch_size: int, submit: Callable[[list[dict[str, Any]]], Any] | None = None):
+        """
+        :param batch_size: number of pages parsed by one task
+        :param submit: function sending a batch of serialized pages for parsing; by default the parsing task is queued
+        """
+        self._batch_size = batch_size
+        self._submit = submit or _send_to_parsing_queue
+
+    @classmethod
+    def from_settings(cls) -> "ClosureParser":
+        return cls(batch_size=settings.OFFER_PARSER_BATCH_SIZE)
+
+    def parse(self, offer_pages: list[OfferPage]) -> int:
+        """
+        Sends pages for parsing.
+
+        :return: number of sent batches
+        """
+        batches = 0
+        for batch in batched(offer_pages, self._batch_size, strict=False):
+            self._submit(serialize_offer_pages(list(batch)))
+            batches += 1
+        return batches
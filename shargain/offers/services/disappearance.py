@@ -0,0 +1,56 @@
+"""
+Closing of offers which disappeared from their list URL.
+
+Every batch of scraped offers refreshes ``last_seen_at`` of the already known offers (see ``OfferBatchCreateService``)
+and records a ``ScrapingCheckin`` for each list URL. An open offer which wasn't seen in the last ``missing_checkins``
+checkins of its list URL is most likely closed, so it's closed without fetching its page. Scrapers see only the first
+page of a list, so offers pushed off it by newer ones disappear too. Hence only offers created no earlier than
+the oldest offer seen in the latest checkin are closed; older ones are left to the checks of their pages.
+"""
+
+import logging
+
+from django.db.models import Min, OuterRef, Subquery
+from django.utils import timezone
+
+from shargain.offers.models import Offer, OfferClosureReason, ScrapingCheckin, ScrapingUrl
+
+logger = logging.getLogger(__name__)
+
+
+def close_disappeared_offers(missing_checkins: int) -> int:
+    """
+    Closes open offers missing from at least missing_checkins latest checkins of their list URL.
+
+    :return: number of closed offers
+    """
+    # Offers seen in a checkin are marked as seen just before the checkin is recorded, so offers missing from
+    # the latest N checkins are the ones last seen before the (N + 1)-th latest checkin.
+    checkins = ScrapingCheckin.objects.filter(scraping_url=OuterRef("pk")).order_by("-timestamp").values("timestamp")
+    scraping_urls = (
+        ScrapingUrl.objects.filter(is_active=True, scraping_target__is_active=True)
+        .annotate(
+            missing_since=Subquery(checkins[missing_checkins : missing_checkins + 1]),
+            # offers seen in the latest checkin were marked as seen after the previous one
+            latest_seen_since=Subquery(checkins[1:2]),
+        )
+        .exclude(missing_since=None)
+        .values_list("scraping_target_id", "url", "missing_since", "latest_seen_since")
+    )
+    now = timezone.now()
+    closed = 0
+    for target_id, url, missing_since_at, latest_seen_since in scraping_urls:
+        list_offers = Offer.objects.filter(target_id=target_id, list_url=url)
+        oldest_seen = list_offers.filter(last_seen_at__gte=latest_seen_since).aggregate(created_at=Min("created_at"))
+        if oldest_seen["created_at"] is None:
+            # Nothing was seen in the latest checkin (e.g. the list was empty), so nothing can be told apart
+            continue
+        closed_for_url = (
+            list_offers.opened()
+            .filter(last_seen_at__lt=missing_since_at, created_at__gte=oldest_seen["created_at"])
+            .update(closed_at=now, closure_reason=OfferClosureReason.DISAPPEARED)
+        )
+        if closed_for_url:
+            logger.info("Closed disappeared offers [target_id=%s] [url=%s] [count=%s]", target_id, url, closed_for_url)
+        closed += closed_for_url
+    return closed
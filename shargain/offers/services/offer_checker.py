@@ -0,0 +1,314 @@
+"""
+Concurrent checker of open offers.
+
+Open offers which are due for a check (see ``check_scheduler``) are streamed from the database in chunks,
+the most overdue first. Every chunk is checked in two stages. In the fetch stage, pages are downloaded concurrently
+on an asyncio event loop, where HTTP requests are executed in a thread pool. The number of requests in flight is
+limited globally and per domain, and each domain may additionally require a delay between consecutive requests.
+Requests for the same URL (e.g. one offer tracked by many targets) are coalesced into a single fetch. In the parse
+stage, downloaded pages are sent to the parsing queue, whose workers close the offers of closed pages
+(see ``closure_detection``).
+Requests are conditional if the offer's page validators are known (see ``revalidation``), and ``304 Not Modified``
+counts as a still open offer. Validators describe the stored source HTML, so they are only sent, never updated,
+by the checker, which doesn't store the pages it downloads. Every domain has a closure detector
+(see ``shargain.parsers.closure``) which declares how much of the page it needs: only the status code, the final URL
+after redirects, the first bytes (fetched with a ranged request), or the whole page. Offers from domains without
+a detector are not fetched.
+Check times are written back with ``bulk_update`` before the chunk's pages are sent for parsing. Offers which couldn't
+be checked are retried after the scheduler's minimal interval. A run stops taking new chunks once its time budget is
+used up; offers which weren't checked stay due, so the next run picks them up.
+"""
+
+import asyncio
+import dataclasses
+import logging
+import time
+from collections.abc import Callable, Iterator, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from urllib.parse import urlparse
+
+import requests
+from django.conf import settings
+from django.utils import timezone
+from requests.adapters import HTTPAdapter
+
+from shargain.offers.models import Offer
+from shargain.offers.services.check_scheduler import CheckScheduler
+from shargain.offers.services.closure_detection import ClosureParser, OfferPage
+from shargain.offers.services.revalidation import Validators, is_not_modified
+from shargain.parsers.closure import ClosureDetector, FetchedPage, FetchStrategy, get_closure_detector
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass(frozen=True)
+class DomainPolicy:
+    max_concurrency: int
+    delay: float = 0.0
+    """Minimal time (in seconds) between starting two consecutive requests to the domain"""
+
+    @classmethod
+    def from_dict(cls, policy: Mapping[str, float]) -> "DomainPolicy":
+        """Creates a policy from its settings, e.g. ``{"max_concurrency": 2, "delay": 0.5}``."""
+        return cls(max_concurrency=int(policy["max_concurrency"]), delay=policy.get("delay", 0.0))
+
+
+@dataclasses.dataclass
+class CheckerStats:
+    checked: int = 0
+    parsed: int = 0
+    """Pages sent for parsing"""
+    errors: int = 0
+    coalesced: int = 0
+    not_modified: int = 0
+    unsupported: int = 0
+    duration: float = 0.0
+
+
+@dataclasses.dataclass(frozen=True)
+class FetchResult:
+    page: FetchedPage | None
+    """Downloaded page; None if the page wasn't modified since the last check"""
+
+
+@dataclasses.dataclass(frozen=True)
+class PageCheck:
+    page: FetchedPage | None = None
+    """Downloaded page, which has to be parsed to find out whether the offer is closed"""
+    not_modified: bool = False
+
+
+class DomainLimiter:
+    def __init__(self, policy: DomainPolicy):
+        self._semaphore = asyncio.Semaphore(policy.max_concurrency)
+        self._lock = asyncio.Lock()
+        self._delay = policy.delay
+        self._next_request_at = 0.0
+
+    async def __aenter__(self):
+        await self._semaphore.acquire()
+        if not self._delay:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next_request_at - now
+            self._next_request_at = max(now, self._next_request_at) + self._delay
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    async def __aexit__(self, *exc_info):
+        self._semaphore.release()
+
+
+class ClosedOffersChecker:
+    def __init__(
+        self,
+        concurrency: int,
+        default_domain_policy: DomainPolicy,
+        domain_policies: dict[str, DomainPolicy] | None = None,
+        chunk_size: int = 500,
+        timeout: float = 10,
+        fetch: Callable[[str, dict[str, str], ClosureDetector], requests.Response] | None = None,
+        scheduler: CheckScheduler | None = None,
+        parser: ClosureParser | None = None,
+        time_budget: float | None = None,
+    ):
+        """
+        :param concurrency: maximal number of requests in flight
+        :param default_domain_policy: limits for domains not listed in domain_policies
+        :param domain_policies: per-domain (netloc) limits
+        :param chunk_size: number of offers loaded from the database and written back at once
+        :param fetch: function downloading as much of the page as the detector needs (url, request headers, detector);
+            by default GET through a pooled session
+        :param scheduler: schedules next checks of offers; by default configured from settings
+        :param parser: sends downloaded pages for parsing; by default configured from settings
+        :param time_budget: time (in seconds) after which a run doesn't start new chunks; None means no limit
+        """
+        self._concurrency = concurrency
+        self._default_domain_policy = default_domain_policy
+        self._domain_policies = domain_policies or {}
+        self._chunk_size = chunk_size
+        self._timeout = timeout
+        self._fetch = fetch or self._get
+        self._session: requests.Session | None = None
+        self._scheduler = scheduler or CheckScheduler.from_settings()
+        self._parser = parser or ClosureParser.from_settings()
+        self._time_budget = time_budget
+        self._limiters: dict[str, DomainLimiter] = {}
+        self._global_semaphore: asyncio.Semaphore | None = None
+        self._results: dict[str, PageCheck | None] = {}
+        self.stats = CheckerStats()
+
+    @classmethod
+    def from_settings(cls) -> "ClosedOffersChecker":
+        return cls(
+            concurrency=settings.OFFER_CHECKER_CONCURRENCY,
+            default_domain_policy=DomainPolicy(
+                max_concurrency=settings.OFFER_CHECKER_DOMAIN_CONCURRENCY,
+                delay=settings.OFFER_CHECKER_DOMAIN_DELAY,
+            ),
+            domain_policies={
+                domain: DomainPolicy.from_dict(policy)
+                for domain, policy in settings.OFFER_CHECKER_DOMAIN_POLICIES.items()
+            },
+            chunk_size=settings.OFFER_CHECKER_CHUNK_SIZE,
+            time_budget=settings.OFFER_CHECKER_TIME_BUDGET,
+        )
+
+    def _get_session(self) -> requests.Session:
+        if self._session is None:
+            self._session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=10, pool_maxsize=self._concurrency)
+            self._session.mount("http://", adapter)
+            self._session.mount("https://", adapter)
+        return self._session
+
+    def _get(self, url: str, headers: dict[str, str], detector: ClosureDetector) -> requests.Response:
+        if detector.strategy == FetchStrategy.FULL:
+            return self._get_session().get(url, headers=headers, timeout=self._timeout)
+        if detector.strategy == FetchStrategy.PARTIAL:
+            headers = {**headers, "Range": f"bytes=0-{detector.partial_size - 1}"}
+        response = self._get_session().get(
+            url,
+            headers=headers,
+            timeout=self._timeout,
+            stream=True,
+            allow_redirects=detector.strategy != FetchStrategy.STATUS,
+        )
+        with response:
+            content = b""
+            if detector.strategy == FetchStrategy.PARTIAL:
+                # servers are free to ignore the range, so the body is read only up to the limit anyway
+                for chunk in response.iter_content(chunk_size=16 * 1024):
+                    content += chunk
+                    if len(content) >= detector.partial_size:
+                        break
+            response._content = content[: detector.partial_size]
+        return response
+
+    def _get_limiter(self, url: str) -> DomainLimiter:
+        domain = urlparse(url).netloc
+        if domain not in self._limiters:
+            self._limiters[domain] = DomainLimiter(self._domain_policies.get(domain, self._default_domain_policy))
+        return self._limiters[domain]
+
+    def _fetch_url_sync(self, url: str, headers: dict[str, str], detector: ClosureDetector) -> FetchResult | None:
+        try:
+            response = self._fetch(url, headers, detector)
+        except requests.RequestException:
+            logger.warning("Couldn't fetch offer [url=%s]", url, exc_info=True)
+            return None
+        if is_not_modified(headers, response):
+            return FetchResult(page=None)
+        return FetchResult(FetchedPage.from_response(url, response))
+
+    async def _fetch_url(
+        self, url: str, headers: dict[str, str], detector: ClosureDetector, executor: ThreadPoolExecutor
+    ) -> FetchResult | None:
+        async with self._get_limiter(url), self._global_semaphore:  # type: ignore[union-attr]
+            return await asyncio.get_running_loop().run_in_executor(
+                executor, self._fetch_url_sync, url, headers, detector
+            )
+
+    async def _fetch_urls(
+        self, headers_by_url: dict[str, dict[str, str]], executor: ThreadPoolExecutor
+    ) -> dict[str, FetchResult | None]:
+        if self._global_semaphore is None:
+            self._global_semaphore = asyncio.Semaphore(self._concurrency)
+        results = await asyncio.gather(
+            *(
+                self._fetch_url(url, headers, get_closure_detector(url), executor)  # type: ignore[arg-type]
+                for url, headers in headers_by_url.items()
+            )
+        )
+        return dict(zip(headers_by_url, results, strict=True))
+
+    def _check_chunk(
+        self, offers: list[Offer], executor: ThreadPoolExecutor, runner: asyncio.Runner
+    ) -> list[PageCheck | None]:
+        """
+        Downloads pages of offers. The result is None for offers whose page couldn't be downloaded.
+        """
+        headers_by_url = {}
+        for offer in offers:
+            if offer.url in self._results or offer.url in headers_by_url:
+                self.stats.coalesced += 1
+            elif get_closure_detector(offer.url) is None:
+                logger.warning("Offer has not supported domain [url=%s]", offer.url)
+                self.stats.unsupported += 1
+                self._results[offer.url] = PageCheck()
+            else:
+                headers_by_url[offer.url] = Validators.from_offer(offer).as_request_headers()
+
+        fetch_results = runner.run(self._fetch_urls(headers_by_url, executor))
+        for url, fetch_result in fetch_results.items():
+            if fetch_result is None:
+                self._results[url] = None
+            elif fetch_result.page is None:
+                self._results[url] = PageCheck(not_modified=True)
+            else:
+                self._results[url] = PageCheck(page=fetch_result.page)
+        return [self._results[offer.url] for offer in offers]
+
+    def _iter_chunks(self) -> Iterator[list[Offer]]:
+        offers = (
+            Offer.objects.due_for_check()
+            .only(
+                "id",
+                "url",
+                "created_at",
+                "closed_at",
+                "closure_reason",
+                "next_check_at",
+                "http_etag",
+                "http_last_modified",
+            )
+            .iterator(chunk_size=self._chunk_size)
+        )
+        while chunk := list(islice(offers, self._chunk_size)):
+            yield chunk
+
+    def _save_chunk(self, offers: list[Offer], results: list[PageCheck | None]):
+        now = timezone.now()
+        checked_offers, failed_offers = [], []
+        offer_pages: dict[str, OfferPage] = {}
+        for offer, result in zip(offers, results, strict=True):
+            if result is None:
+                self.stats.errors += 1
+                offer.next_check_at = now + self._scheduler.min_interval
+                failed_offers.append(offer)
+                continue
+            offer.last_check_at = now
+            offer.next_check_at = self._scheduler.get_next_check_at(offer, now)
+            if result.not_modified:
+                self.stats.not_modified += 1
+            if result.page is not None:
+                offer_pages.setdefault(offer.url, ([], result.page))[0].append(offer.id)
+            checked_offers.append(offer)
+        Offer.objects.bulk_update(checked_offers, ["last_check_at", "next_check_at"], batch_size=self._chunk_size)
+        Offer.objects.bulk_update(failed_offers, ["next_check_at"], batch_size=self._chunk_size)
+        self._parser.parse(list(offer_pages.values()))
+        self.stats.checked += len(offers)
+        self.stats.parsed += len(offer_pages)
+
+    def run(self) -> CheckerStats:
+        started_at = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self._concurrency) as executor, asyncio.Runner() as runner:
+            for chunk in self._iter_chunks():
+                results = self._check_chunk(chunk, executor, runner)
+                self._save_chunk(chunk, results)
+                # results are kept only to coalesce requests within a chunk, so that memory doesn't grow with the run
+                self._results.clear()
+                logger.info(
+                    "Offers checked [checked=%s] [parsed=%s] [not_modified=%s] [errors=%s]",
+                    self.stats.checked,
+                    self.stats.parsed,
+                    self.stats.not_modified,
+                    self.stats.errors,
+                )
+                if self._time_budget is not None and time.monotonic() - started_at >= self._time_budget:
+                    logger.info("Time budget of offer checks used up, the remaining offers are left for the next run")
+                    break
+        self.stats.duration = time.monotonic() - started_at
+        return self.stats
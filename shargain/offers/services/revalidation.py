@@ -0,0 +1,104 @@
+"""
+Conditional HTTP revalidation of offer pages.
+
+Validators (ETag and Last-Modified) returned with an offer's page are stored on the offer and sent back as
+``If-None-Match``/``If-Modified-Since`` with the next request. ``304 Not Modified`` means the page didn't change
+since the last check, so the offer is still alive and nothing has to be downloaded or stored.
+"""
+
+import dataclasses
+from collections.abc import Iterator
+from http import HTTPStatus
+from typing import cast
+
+from django.db.models import CharField
+from prometheus_client import REGISTRY, Counter
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import Collector
+
+from shargain.offers.models import Offer
+
+CONDITIONAL_REQUESTS = Counter(
+    "shargain_offer_conditional_requests",
+    "Offer page requests sent with validators, by result (not_modified or modified)",
+    ["result"],
+)
+
+
+class ConditionalHitRatioCollector(Collector):
+    """
+    Exports the fraction of conditional requests answered with ``304 Not Modified``. The ratio is derived from
+    the request counter at collection time, so it's also correct when the counter is merged from many processes
+    (see ``shargain.commons.metrics``).
+    """
+
+    def __init__(self, source: Collector = CONDITIONAL_REQUESTS):
+        """:param source: collector of the CONDITIONAL_REQUESTS samples"""
+        self._source = source
+
+    def collect(self) -> Iterator[GaugeMetricFamily]:
+        requests_by_result = {
+            sample.labels["result"]: sample.value
+            for metric in self._source.collect()
+            if metric.name == "shargain_offer_conditional_requests"
+            for sample in metric.samples
+            if sample.name.endswith("_total")
+        }
+        total = sum(requests_by_result.values())
+        yield GaugeMetricFamily(
+            "shargain_offer_conditional_hit_ratio",
+            "Fraction of conditional offer page requests answered with 304 Not Modified",
+            value=requests_by_result.get("not_modified", 0) / total if total else 0.0,
+        )
+
+
+REGISTRY.register(ConditionalHitRatioCollector())
+
+
+def _fit_field(value: str | None, field_name: str) -> str:
+    """Validators which don't fit into the offer's field are dropped, as a truncated one would never match."""
+    max_length = cast(CharField, Offer._meta.get_field(field_name)).max_length
+    if not value or (max_length is not None and len(value) > max_length):
+        return ""
+    return value
+
+
+@dataclasses.dataclass(frozen=True)
+class Validators:
+    etag: str = ""
+    last_modified: str = ""
+
+    @classmethod
+    def from_offer(cls, offer: Offer) -> "Validators":
+        return cls(etag=offer.http_etag, last_modified=offer.http_last_modified)
+
+    @classmethod
+    def from_response(cls, response) -> "Validators":
+        headers = getattr(response, "headers", None) or {}
+        return cls(
+            etag=_fit_field(headers.get("ETag"), "http_etag"),
+            last_modified=_fit_field(headers.get("Last-Modified"), "http_last_modified"),
+        )
+
+    def as_request_headers(self) -> dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def apply(self, offer: Offer) -> bool:
+        """Stores validators on the offer. Returns True if they changed."""
+        if (offer.http_etag, offer.http_last_modified) == (self.etag, self.last_modified):
+            return False
+        offer.http_etag, offer.http_last_modified = self.etag, self.last_modified
+        return True
+
+
+def is_not_modified(request_headers: dict[str, str], response) -> bool:
+    """Checks whether the response confirms that the page didn't change and records the result in metrics."""
+    not_modified = response.status_code == HTTPStatus.NOT_MODIFIED
+    if request_headers:
+        CONDITIONAL_REQUESTS.labels(result="not_modified" if not_modified else "modified").inc()
+    return not_modified
@@ -0,0 +1,86 @@
+"""
+Adaptive scheduling of scraping URLs.
+
+Every scraping URL has ``next_scrape_at``; scrapers are served from the (indexed) queue of URLs which are due.
+After every checkin the URL is rescheduled according to how fast new offers show up on it: the rate of new offers
+is estimated from the URL's checkins (and their rollups) within ``history_window`` and the URL is scraped again once
+``target_new_offers`` new offers are expected, within ``[min_interval, max_interval]``. The owner's plan may raise
+the minimal interval (see ``ScrapingUrlQuota.min_scrape_interval``).
+"""
+
+import dataclasses
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db.models import Max, Sum
+from django.utils import timezone
+
+from shargain.offers.models import RollupPeriod, ScrapingCheckin, ScrapingCheckinRollup, ScrapingUrl
+from shargain.quotas.services.quota import QuotaService
+
+
+@dataclasses.dataclass
+class ScrapeScheduler:
+    min_interval: timedelta
+    max_interval: timedelta
+    target_new_offers: float
+    """Number of new offers expected between two consecutive scrapes"""
+    history_window: timedelta
+
+    @classmethod
+    def from_settings(cls) -> "ScrapeScheduler":
+        return cls(
+            min_interval=settings.SCRAPE_MIN_INTERVAL,
+            max_interval=settings.SCRAPE_MAX_INTERVAL,
+            target_new_offers=settings.SCRAPE_TARGET_NEW_OFFERS,
+            history_window=settings.SCRAPE_HISTORY_WINDOW,
+        )
+
+    def get_new_offers_rate(self, scraping_url_id: int, now: datetime) -> float | None:
+        """
+        Estimates new offers per hour within the history window: new offers of checkins divided by the time in which
+        they showed up (gaps since the previous checkins). Complete hours are read from hourly rollups and only
+        checkins after the URL's latest rollup from raw rows. Within raw rows, the first checkin only marks
+        the beginning of the observed period. Returns None if nothing was observed.
+        """
+        rollups = ScrapingCheckinRollup.objects.filter(
+            scraping_url_id=scraping_url_id, period=RollupPeriod.HOUR, bucket_start__gte=now - self.history_window
+        )
+        stats = rollups.aggregate(
+            new_offers=Sum("observed_new_offers_count"), observed_time=Sum("observed_time"), last=Max("bucket_start")
+        )
+        new_offers = stats["new_offers"] or 0
+        observed_time = stats["observed_time"] or timedelta()
+        raw_since, previous_at = now - self.history_window, None
+        if stats["last"] is not None:
+            raw_since = stats["last"] + timedelta(hours=1)
+            previous_at = rollups.filter(bucket_start=stats["last"]).values_list("last_checkin_at", flat=True)[0]
+
+        checkins = ScrapingCheckin.objects.filter(scraping_url_id=scraping_url_id, timestamp__gte=raw_since)
+        for timestamp, new_offers_count in checkins.order_by("timestamp").values_list("timestamp", "new_offers_count"):
+            if previous_at is not None:
+                new_offers += new_offers_count
+                observed_time += timestamp - previous_at
+            previous_at = timestamp
+
+        if observed_time <= timedelta():
+            return None
+        return new_offers / (observed_time.total_seconds() / 3600)
+
+    def get_scrape_interval(self, rate: float | None, plan_min_interval: timedelta | None = None) -> timedelta:
+        min_interval = max(self.min_interval, plan_min_interval or self.min_interval)
+        if rate is None:
+            return min_interval
+        if rate <= 0:
+            return max(self.max_interval, min_interval)
+        interval = timedelta(hours=self.target_new_offers / rate)
+        return min(max(interval, min_interval), max(self.max_interval, min_interval))
+
+    def reschedule(self, scraping_url: ScrapingUrl, now: datetime | None = None):
+        now = now or timezone.now()
+        scraping_url.scrape_interval = self.get_scrape_interval(
+            self.get_new_offers_rate(scraping_url.id, now),
+            QuotaService.get_min_scrape_interval(scraping_url.scraping_target.owner),
+        )
+        scraping_url.next_scrape_at = now + scraping_url.scrape_interval
+        scraping_url.save(update_fields=["scrape_interval", "next_scrape_at"])
@@ -0,0 +1,163 @@
+"""
+Batch refreshing of offers' source HTML.
+
+A batch of offers is claimed with ``SELECT ... FOR UPDATE SKIP LOCKED`` in a short transaction which also moves
+their ``next_check_at`` by ``CLAIM_LEASE``. The moved timestamp acts as a lease: after the claim transaction commits,
+other workers skip the claimed offers (they are not due anymore), so no lock is held while pages are downloaded.
+Pages are fetched concurrently and every offer is saved (committed) as soon as its page arrives, together with
+its next check time from the ``CheckScheduler``. If the page couldn't be fetched, the offer is retried once
+the lease expires.
+"""
+
+import logging
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from io import BytesIO
+from itertools import batched
+
+import requests
+from django.db import transaction
+from django.utils import timezone
+from requests.adapters import HTTPAdapter
+
+from shargain.offers.models import Offer
+from shargain.offers.services.check_scheduler import CheckScheduler
+from shargain.offers.services.revalidation import Validators, is_not_modified
+from shargain.offers.storages import OfferSourceStorage, get_offer_source_storage
+
+logger = logging.getLogger(__name__)
+
+REFRESH_WINDOW = timedelta(days=31)
+CLAIM_LEASE = timedelta(minutes=10)
+
+
+def claim_offers_for_source_html(batch_size: int) -> list[Offer]:
+    """
+    Claims up to batch_size due open offers whose source HTML should be refreshed first: offers without source HTML,
+    then the most overdue ones. Every claimed offer is leased, including offers without source HTML, so concurrent
+    claims return disjoint batches and pages which couldn't be downloaded are retried only after the lease.
+    """
+    now = timezone.localtime()
+    with transaction.atomic():
+        offers = list(
+            Offer.objects.select_for_update(skip_locked=True)
+            .opened()
+            .filter(created_at__gte=now - REFRESH_WINDOW, next_check_at__lte=now)
+            .order_by_source_html_refresh()
+            .only(
+                "id",
+                "url",
+                "title",
+                "created_at",
+                "published_at",
+                "source_html",
+                "last_check_at",
+                "next_check_at",
+                "http_etag",
+                "http_last_modified",
+            )[:batch_size]
+        )
+        if offers:
+            Offer.objects.filter(id__in=[offer.id for offer in offers]).update(next_check_at=now + CLAIM_LEASE)
+    return offers
+
+
+class SourceHtmlFetcher:
+    def __init__(
+        self,
+        concurrency: int,
+        timeout: float = 10,
+        fetch: Callable[[str, dict[str, str]], requests.Response] | None = None,
+        scheduler: CheckScheduler | None = None,
+    ):
+        """
+        :param concurrency: maximal number of pages downloaded at once
+        :param scheduler: schedules next checks of fetched offers; by default configured from settings
+        :param fetch: function downloading the page (url, request headers); by default GET through a pooled session
+        """
+        self._concurrency = concurrency
+        self._timeout = timeout
+        self._fetch = fetch or self._get
+        self._session: requests.Session | None = None
+        self._scheduler = scheduler or CheckScheduler.from_settings()
+
+    def _get_session(self) -> requests.Session:
+        if self._session is None:
+            self._session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=10, pool_maxsize=self._concurrency)
+            self._session.mount("http://", adapter)
+            self._session.mount("https://", adapter)
+        return self._session
+
+    def _get(self, url: str, headers: dict[str, str]) -> requests.Response:
+        return self._get_session().get(url, headers=headers, timeout=self._timeout)
+
+    def fetch(self, offers: list[Offer]) -> list[Offer]:
+        """
+        Downloads and saves source HTML of given offers. Offers with stored source HTML are revalidated with
+        a conditional request, and if their page didn't change only last check time is updated.
+
+        :return: offers whose source HTML was downloaded and saved successfully
+        """
+        updated = []
+        with ThreadPoolExecutor(max_workers=max(min(self._concurrency, len(offers)), 1)) as executor:
+            futures = {}
+            for offer in offers:
+                headers = Validators.from_offer(offer).as_request_headers() if offer.source_html else {}
+                futures[executor.submit(self._fetch, offer.url, headers)] = (offer, headers)
+            for future in as_completed(futures):
+                offer, headers = futures[future]
+                try:
+                    response = future.result()
+                except requests.RequestException:
+                    logger.warning("Couldn't fetch offer source html [id=%s] [url=%s]", offer.id, offer.url)
+                    continue
+                if is_not_modified(headers, response):
+                    offer.last_check_at = timezone.localtime()
+                    offer.next_check_at = self._scheduler.get_next_check_at(offer, offer.last_check_at)
+                    offer.save(update_fields=["last_check_at", "next_check_at"])
+                    logger.info("Offer [id=%s] not modified", offer.id)
+                    continue
+                if response.status_code == 403:
+                    logger.error("Url [url=%s] returned 403 status code", offer.url)
+                self.save(offer, response.content, Validators.from_response(response))
+                updated.append(offer)
+        return updated
+
+    def save(self, offer: Offer, content: bytes, validators: Validators | None = None):
+        """Saves the page unless it's identical to the already stored one, in which case only check times are updated"""
+        offer.last_check_at = timezone.localtime()
+        offer.next_check_at = self._scheduler.get_next_check_at(offer, offer.last_check_at)
+        update_fields = ["last_check_at", "next_check_at"]
+        if validators is not None and validators.apply(offer):
+            update_fields += ["http_etag", "http_last_modified"]
+        if offer.source_html.name != OfferSourceStorage.get_content_name(content):
+            offer.source_html.save("", BytesIO(content), save=False)
+            update_fields.append("source_html")
+        offer.save(update_fields=update_fields)
+        logger.info("Offer [id=%s] updated succesfully [source_changed=%s]", offer.id, "source_html" in update_fields)
+
+
+def collect_source_html_garbage(
+    grace_period: timedelta,
+    now: datetime | None = None,
+    storage: OfferSourceStorage | None = None,
+    batch_size: int = 1000,
+) -> int:
+    """
+    Deletes stored source HTML files which no offer points to, e.g. pages replaced by a newer version of the offer.
+    Files modified within the grace period are kept, as an offer saving them may not be committed yet.
+
+    :return: number of deleted files
+    """
+    storage = storage or get_offer_source_storage()
+    cutoff = (now or timezone.now()) - grace_period
+    deleted = 0
+    for names in batched(storage.iter_content_names(), batch_size, strict=False):
+        referenced = set(Offer.objects.filter(source_html__in=names).values_list("source_html", flat=True))
+        for name in names:
+            if name not in referenced and storage.get_modified_time(name) < cutoff:
+                storage.delete_content(name)
+                deleted += 1
+    return deleted
@@ -0,0 +1,44 @@
+"""
+Incremental sync of scraping URLs for scrapers.
+
+Writes which add, remove or change scraping URLs record a ``ScrapingUrlChange`` under the next version of the URL
+set (``ScrapingUrlVersion``). Versions are given in commit order, so no change is committed behind a synced cursor.
+Scrapers send the version they synced last as a cursor and receive only URLs changed since then: URLs which are
+still active (with an active target) are sent in full, the others as removed ids.
+Without a cursor (or with one from the future, e.g. after a database restore) the whole active set is sent.
+"""
+
+import dataclasses
+
+from shargain.offers.models import ScrapingUrl, ScrapingUrlChange
+
+
+@dataclasses.dataclass(frozen=True)
+class ScrapingUrlDelta:
+    version: int
+    full: bool
+    changed: list[ScrapingUrl]
+    removed: list[int]
+
+
+class ScrapingUrlSyncService:
+    @staticmethod
+    def get_delta(cursor: int | None, version: int | None = None) -> ScrapingUrlDelta:
+        """
+        :param cursor: version synced by the client last
+        :param version: current version, if already known
+        """
+        if version is None:
+            version = ScrapingUrlChange.get_version()
+        active = ScrapingUrl.objects.active().order_by("id")
+        if cursor is None or cursor > version:
+            return ScrapingUrlDelta(version=version, full=True, changed=list(active), removed=[])
+
+        changed_ids = set(
+            ScrapingUrlChange.objects.filter(version__gt=cursor, version__lte=version).values_list(
+                "scraping_url_id", flat=True
+            )
+        )
+        changed = list(active.filter(id__in=changed_ids))
+        removed = sorted(changed_ids - {scraping_url.id for scraping_url in changed})
+        return ScrapingUrlDelta(version=version, full=False, changed=changed, removed=removed)
@@ -1,3 +1,46 @@
 import django.dispatch
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from shargain.offers.caches import ScrappingTargetListCache
+from shargain.offers.models import ScrapingUrl, ScrapingUrlChange, ScrappingTarget
 
 offers_batch_created = django.dispatch.Signal()
+
+# Fields of scraping URLs serialized in the scrapping targets list; saves of other fields (e.g. scheduling after
+# every scrape) don't invalidate it
+LISTED_SCRAPING_URL_FIELDS = {"url", "is_active", "scraping_target"}
+# Fields of scraping URLs and scrapping targets which change what scrapers sync (see ``ScrapingUrlSyncService``)
+SYNCED_SCRAPING_URL_FIELDS = {"name", "url", "is_active", "scraping_target"}
+SYNCED_SCRAPPING_TARGET_FIELDS = {"is_active"}
+
+
+@receiver(post_save, sender=ScrappingTarget)
+@receiver(post_delete, sender=ScrappingTarget)
+@receiver(post_delete, sender=ScrapingUrl)
+def invalidate_scrapping_target_list(sender, **kwargs):
+    ScrappingTargetListCache.invalidate()
+
+
+@receiver(post_save, sender=ScrapingUrl)
+def invalidate_scrapping_target_list_on_url_save(sender, update_fields=None, **kwargs):
+    if update_fields is None or LISTED_SCRAPING_URL_FIELDS & set(update_fields):
+        ScrappingTargetListCache.invalidate()
+
+
+@receiver(post_save, sender=ScrapingUrl)
+def record_scraping_url_change_on_save(sender, instance, created, update_fields=None, **kwargs):
+    if created or update_fields is None or SYNCED_SCRAPING_URL_FIELDS & set(update_fields):
+        ScrapingUrlChange.record([instance.id])
+
+
+@receiver(post_delete, sender=ScrapingUrl)
+def record_scraping_url_change_on_delete(sender, instance, **kwargs):
+    # Sent also for URLs deleted in cascade with their target or its owner
+    ScrapingUrlChange.record([instance.id])
+
+
+@receiver(post_save, sender=ScrappingTarget)
+def record_scrapping_target_change(sender, instance, created, update_fields=None, **kwargs):
+    if not created and (update_fields is None or SYNCED_SCRAPPING_TARGET_FIELDS & set(update_fields)):
+        ScrapingUrlChange.record_target(instance.id)
@@ -0,0 +1,69 @@
+import gzip
+import hashlib
+import os
+from collections.abc import Iterator
+from typing import IO, cast
+
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+
+
+class OfferSourceStorage(FileSystemStorage):
+    """
+    Storage of offers' source HTML.
+
+    Pages are gzip-compressed and stored under a name derived from the SHA-256 of their (uncompressed) content,
+    so identical pages are stored only once and may be shared by many offers. Files are decompressed on the fly
+    when opened. Files saved before the storage was introduced (without the ``.gz`` suffix) are read as they are.
+
+    Shared files are never deleted through offers; files which no offer points to anymore are deleted by
+    ``collect_source_html_garbage``. Saving a page which is already stored touches its file, so that the garbage
+    collection doesn't delete it before the offer saving it is committed.
+    """
+
+    DIRECTORY = "offer_sources/sha256"
+    SUFFIX = ".html.gz"
+    COMPRESS_LEVEL = 6
+
+    @classmethod
+    def get_content_name(cls, content: bytes) -> str:
+        digest = hashlib.sha256(content).hexdigest()
+        return f"{cls.DIRECTORY}/{digest[:2]}/{digest}{cls.SUFFIX}"
+
+    def save(self, name, content, max_length=None):
+        """Stores the content (ignoring the proposed name) unless identical content is already stored."""
+        content.seek(0)
+        data = content.read()
+        if isinstance(data, str):
+            data = data.encode()
+        name = self.get_content_name(data)
+        if self.exists(name):
+            os.utime(self.path(name))
+            return name
+        return super().save(name, ContentFile(gzip.compress(data, self.COMPRESS_LEVEL)), max_length=max_length)
+
+    def open(self, name, mode="rb"):
+        if not name.endswith(self.SUFFIX):
+            return super().open(name, mode)
+        return File(cast(IO[bytes], gzip.open(self.path(name), "rb")), name=name)
+
+    def delete(self, name):
+        """Content-addressed files may be shared by many offers, so they are never deleted through offers."""
+
+    def iter_content_names(self) -> Iterator[str]:
+        """Names of all content-addressed files."""
+        if not self.exists(self.DIRECTORY):
+            return
+        prefixes, _ = self.listdir(self.DIRECTORY)
+        for prefix in sorted(prefixes):
+            _, files = self.listdir(f"{self.DIRECTORY}/{prefix}")
+            yield from (f"{self.DIRECTORY}/{prefix}/{file}" for file in sorted(files) if file.endswith(self.SUFFIX))
+
+    def delete_content(self, name: str) -> None:
+        """Deletes a content-addressed file, which must not be referenced by any offer."""
+        super().delete(name)
+
+
+def get_offer_source_storage():
+    return OfferSourceStorage()
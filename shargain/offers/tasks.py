@@ -1,110 +1,116 @@
 import logging
-from datetime import timedelta
-from io import BytesIO
 
-import requests
-from bs4 import BeautifulSoup
 from celery import shared_task
-from django.db import transaction
-from django.db.models import BooleanField, ExpressionWrapper, Q
+from django.conf import settings
 from django.utils import timezone
 
-from shargain.offers.models import Offer
-from shargain.parsers.olx import OlxOffer
+from shargain.offers.models import Offer, OfferClosureReason
+from shargain.offers.services import closure_detection, disappearance
+from shargain.offers.services.checkin_rollup import CheckinRollupService
+from shargain.offers.services.offer_checker import ClosedOffersChecker
+from shargain.offers.services.source_html import (
+    SourceHtmlFetcher,
+    claim_offers_for_source_html,
+    collect_source_html_garbage,
+)
+from shargain.parsers.closure import is_source_of_closed_offer
 
 logger = logging.getLogger(__name__)
 
 
-def is_olx_offer_closed(response):
-    if response.url.endswith("#from404"):
-        return True
-    soup = BeautifulSoup(response.content, "html.parser")
-    offer_removed_box = soup.select("#offer_removed_by_user")
-    if offer_removed_box:
-        return True
-    return False
+@shared_task(soft_time_limit=8 * 60, time_limit=9 * 60)
+def check_for_closed_offers():
+    """
+    Checks due offers for up to OFFER_CHECKER_TIME_BUDGET; offers left unchecked are picked up by the next run.
+    The time limits leave room for the chunk in progress when the budget runs out.
+    """
+    stats = ClosedOffersChecker.from_settings().run()
+    logger.info(
+        "Finished checking offers [checked=%s] [parsed=%s] [not_modified=%s] [unsupported=%s] [errors=%s] "
+        "[coalesced=%s] [duration=%.1fs]",
+        stats.checked,
+        stats.parsed,
+        stats.not_modified,
+        stats.unsupported,
+        stats.errors,
+        stats.coalesced,
+        stats.duration,
+    )
 
 
-def is_otomoto_offer_closed(response):
-    if response.status_code == 404:
-        return True
-    return False
+@shared_task
+def close_offers_with_closed_pages(offer_pages):
+    """
+    Parses pages downloaded by check_for_closed_offers and closes offers whose page says so. The task is CPU-bound,
+    so it's routed to the parsing queue.
+    """
+    closed = closure_detection.close_offers_with_closed_pages(closure_detection.deserialize_offer_pages(offer_pages))
+    logger.info("Parsed offer pages [pages=%s] [closed=%s]", len(offer_pages), closed)
 
 
-def is_offer_closed(url):
-    try:
-        response = requests.get(url, timeout=10)
-    except ConnectionResetError:
-        logger.exception("Connection error for {}", url)
-        return url, None, False
-    if "olx.pl" in url:
-        return url, response, is_olx_offer_closed(response)
-    if "otomoto.pl" in url:
-        return url, response, is_otomoto_offer_closed(response)
-    return url, response, False
+@shared_task
+def close_disappeared_offers():
+    closed = disappearance.close_disappeared_offers(missing_checkins=settings.OFFER_DISAPPEARANCE_CHECKINS)
+    logger.info("Closed offers which disappeared from their list URLs [count=%s]", closed)
 
 
 @shared_task
-def check_for_closed_offers():
-    offers_to_check = Offer.objects.filter(closed_at=None)
-    print("START CHECKING OFFERS")
-    for offer in offers_to_check:
-        url, response, closed = is_offer_closed(offer.url)
-        print(url)
-        offer.source_html.save("", BytesIO(response.content))
-        if closed:
-            print(f"{offer.url} is CLOSED")
-            offer.closed_at = timezone.now()
-        offer.save()
+def rollup_checkins():
+    service = CheckinRollupService.from_settings()
+    buckets = service.rollup()
+    pruned = service.prune()
+    logger.info("Rolled up scraping checkins [buckets=%s] [pruned=%s]", buckets, pruned)
 
 
 @shared_task
-@transaction.atomic()
-def get_offer_source_html(pk=None):
+def get_offer_source_html(pk=None, batch_size=None):
+    """
+    Refreshes source HTML of the offer with given pk or, if pk is not given, of a batch of offers claimed with
+    SKIP LOCKED, so that concurrently running tasks refresh different offers.
+    """
     if pk:
-        offer = Offer.objects.select_for_update().get(id=pk)
-    if not pk:
-        offer = (
-            Offer.objects.select_for_update(skip_locked=True)
-            .filter(created_at__gte=timezone.localtime() - timedelta(days=31))
-            .opened()
-            .annotate(source_html_exists=ExpressionWrapper(~Q(source_html=""), output_field=BooleanField()))
-            .order_by("source_html_exists", "last_check_at")[0]
-        )
-    logger.info("Checking offer [id=%s]", offer.id)
-    response = requests.get(offer.url, timeout=10)
-    if response.status_code == 403:
-        logger.error("Url [url=%s] returned 403 status code", offer.url)
-    offer.source_html.save("", BytesIO(response.content), save=False)
-    offer.last_check_at = timezone.localtime()
-    offer.save(update_fields=["last_check_at", "source_html"])
-    logger.info("Offer [id=%s] updated succesfully", offer.id)
-    check_if_is_closed.delay(offer.id)
+        offers = [Offer.objects.get(id=pk)]
+    else:
+        offers = claim_offers_for_source_html(batch_size or settings.OFFER_SOURCE_HTML_BATCH_SIZE)
+    logger.info("Checking offers [ids=%s]", [offer.id for offer in offers])
+    updated_offers = SourceHtmlFetcher(concurrency=settings.OFFER_SOURCE_HTML_CONCURRENCY).fetch(offers)
+    if updated_offers:
+        check_if_are_closed.delay([offer.id for offer in updated_offers])
+
+
+@shared_task
+def collect_offer_source_html_garbage():
+    deleted = collect_source_html_garbage(grace_period=settings.OFFER_SOURCE_HTML_GC_GRACE_PERIOD)
+    logger.info("Deleted unreferenced offer source html files [count=%s]", deleted)
 
 
 @shared_task
 def check_if_is_closed(pk):
-    is_closed = False
-    offer = Offer.objects.get(pk=pk)
-    logger.info("Checking if offer is closed [id=%s]", pk)
-    if not offer.source_html.storage.exists(offer.source_html.name):
-        logger.warning("Source html for offer does not exists [id=%s]", pk)
-        return
-    content = offer.source_html.read()
-    if "olx.pl" in offer.url:
-        parser = OlxOffer.from_content(content)
-        if not parser.is_active:
-            is_closed = True
-    elif "otomoto.pl" in offer.url:
-        soup = BeautifulSoup(content, "html.parser")
-        title = soup.select_one("title")
-        if "Nie znaleziono strony" in title.text:
-            is_closed = True
-    else:
-        logger.warning("Offer has not supported domain [url=%s]", offer.url)
-    if is_closed:
-        offer.closed_at = timezone.localtime()
-        offer.save(update_fields=["closed_at"])
-        logger.info("Offer is closed [id=%s] [domain=%s]", pk, offer.domain)
-        return True
-    return False
+    return check_if_are_closed([pk]).get(pk, False)
+
+
+@shared_task
+def check_if_are_closed(pks):
+    """
+    Checks stored source HTML of given offers and closes the ones whose page says so. The task is CPU-bound,
+    so it's routed to the parsing queue, which can be consumed by workers scaled separately from the I/O-bound ones.
+    """
+    now = timezone.localtime()
+    results = {}
+    closed_offers = []
+    for offer in Offer.objects.filter(pk__in=pks).only("id", "url", "source_html"):
+        if not offer.source_html or not offer.source_html.storage.exists(offer.source_html.name):
+            logger.warning("Source html for offer does not exists [id=%s]", offer.id)
+            continue
+        with offer.source_html.open("rb") as source_html:
+            is_closed = is_source_of_closed_offer(offer.url, source_html.read())
+        if is_closed is None:
+            logger.warning("Offer has not supported domain [url=%s]", offer.url)
+        results[offer.id] = bool(is_closed)
+        if is_closed:
+            offer.closed_at = now
+            offer.closure_reason = OfferClosureReason.CHECK
+            closed_offers.append(offer)
+            logger.info("Offer is closed [id=%s] [domain=%s]", offer.id, offer.domain)
+    Offer.objects.bulk_update(closed_offers, ["closed_at", "closure_reason"])
+    return results
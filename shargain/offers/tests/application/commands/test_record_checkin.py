@@ -1,4 +1,5 @@
 import pytest
+from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
 
 from shargain.offers.application.commands.record_checkin import record_checkin
@@ -19,6 +20,24 @@ class TestRecordCheckin:
         assert checkin.offers_count == offers_count
         assert checkin.new_offers_count == new_offers_count
 
+    def test_record_checkin_stores_latest_checkin_on_url(self):
+        scraping_url = ScrapingUrlFactory.create()
+
+        checkin = record_checkin(scraping_url.id, 5, 3)
+
+        scraping_url.refresh_from_db()
+        assert scraping_url.last_checked_at == checkin.timestamp
+        assert (scraping_url.last_offers_count, scraping_url.last_new_offers_count) == (5, 3)
+
+    def test_record_checkin_schedules_next_scrape(self):
+        scraping_url = ScrapingUrlFactory.create(scraping_target__owner=None)
+
+        checkin = record_checkin(scraping_url.id, 5, 5)
+
+        scraping_url.refresh_from_db()
+        assert scraping_url.scrape_interval == settings.SCRAPE_MIN_INTERVAL
+        assert scraping_url.next_scrape_at == checkin.timestamp + settings.SCRAPE_MIN_INTERVAL
+
     def test_record_checkin_with_nonexistent_scraping_url(self):
         nonexistent_id = 99999
         offers_count = 5
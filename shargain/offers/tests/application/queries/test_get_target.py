@@ -1,9 +1,10 @@
 import pytest
 
 from shargain.commons.application.actor import Actor
+from shargain.offers.application.commands.record_checkin import record_checkin
 from shargain.offers.application.dto import TargetDTO
 from shargain.offers.application.exceptions import TargetDoesNotExist
-from shargain.offers.application.queries.get_target import get_target
+from shargain.offers.application.queries.get_target import get_target, get_target_by_user
 from shargain.offers.tests.factories import ScrapingUrlFactory
 
 
@@ -28,6 +29,28 @@ class TestGetTargetQuery:
         assert result.urls[0].id == url_a.id
         assert result.urls[1].id == url_b.id
 
+    def test_get_target_reads_latest_checkins_in_two_queries(self, scraping_target, django_assert_num_queries):
+        scraping_url = ScrapingUrlFactory(scraping_target=scraping_target)
+        ScrapingUrlFactory(scraping_target=scraping_target)
+        record_checkin(scraping_url.id, 5, 2)
+        checkin = record_checkin(scraping_url.id, 4, 1)
+        actor = Actor(user_id=scraping_target.owner_id)
+
+        with django_assert_num_queries(2):
+            result = get_target(actor, target_id=scraping_target.id)
+
+        assert (result.urls[0].last_checked_at, result.urls[0].last_offers_count) == (checkin.timestamp.isoformat(), 4)
+        assert result.urls[0].last_new_offers_count == 1
+        assert result.urls[1].last_checked_at is None
+
+    def test_get_target_by_user_returns_latest_target(self, scraping_target, django_assert_num_queries):
+        latest_target = ScrapingUrlFactory(scraping_target__owner=scraping_target.owner).scraping_target
+
+        with django_assert_num_queries(2):
+            result = get_target_by_user(Actor(user_id=scraping_target.owner_id))
+
+        assert result.id == latest_target.id
+
     def test_get_target_if_target_doesnt_exist_raises_error(self):
         actor = Actor(user_id=1)
 
@@ -0,0 +1,49 @@
+import pytest
+from django.utils import timezone
+
+from shargain.commons.application.actor import Actor
+from shargain.offers.application.exceptions import InvalidCursor, TargetDoesNotExist
+from shargain.offers.application.queries.list_target_offers import list_target_offers
+from shargain.offers.models import Offer
+from shargain.offers.tests.factories import OfferFactory
+
+
+@pytest.mark.django_db
+class TestListTargetOffers:
+    def test_pages_through_offers_newest_first(self, scraping_target):
+        actor = Actor(user_id=scraping_target.owner_id)
+        offers = OfferFactory.create_batch(5, target=scraping_target)
+        # two offers created at the same moment are ordered by id
+        Offer.objects.filter(id__in=[offers[1].id, offers[2].id]).update(created_at=offers[1].created_at)
+        OfferFactory()
+
+        first_page = list_target_offers(actor, scraping_target.id, limit=2)
+        OfferFactory(target=scraping_target)
+        second_page = list_target_offers(actor, scraping_target.id, cursor=first_page.next_cursor, limit=2)
+        last_page = list_target_offers(actor, scraping_target.id, cursor=second_page.next_cursor, limit=2)
+
+        assert [offer.id for offer in first_page.offers] == [offers[4].id, offers[3].id]
+        assert [offer.id for offer in second_page.offers] == [offers[2].id, offers[1].id]
+        assert [offer.id for offer in last_page.offers] == [offers[0].id]
+        assert last_page.next_cursor is None
+
+    def test_filters_by_list_url_and_status(self, scraping_target):
+        actor = Actor(user_id=scraping_target.owner_id)
+        opened = OfferFactory(target=scraping_target, list_url="https://www.olx.pl/a/")
+        closed = OfferFactory(target=scraping_target, list_url="https://www.olx.pl/a/", closed_at=timezone.now())
+        OfferFactory(target=scraping_target, list_url="https://www.olx.pl/b/")
+
+        def list_ids(**kwargs):
+            return [offer.id for offer in list_target_offers(actor, scraping_target.id, **kwargs).offers]
+
+        assert list_ids(list_url="https://www.olx.pl/a/") == [closed.id, opened.id]
+        assert list_ids(list_url="https://www.olx.pl/a/", status="open") == [opened.id]
+        assert list_ids(status="closed") == [closed.id]
+
+    def test_other_users_target(self, scraping_target):
+        with pytest.raises(TargetDoesNotExist):
+            list_target_offers(Actor(user_id=scraping_target.owner_id + 1), scraping_target.id)
+
+    def test_invalid_cursor(self, scraping_target):
+        with pytest.raises(InvalidCursor):
+            list_target_offers(Actor(user_id=scraping_target.owner_id), scraping_target.id, cursor="abc")
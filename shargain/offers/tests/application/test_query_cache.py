@@ -0,0 +1,53 @@
+import pytest
+from prometheus_client import REGISTRY
+
+from shargain.commons.application.actor import Actor
+from shargain.offers.application.commands.add_scraping_url import add_scraping_url
+from shargain.offers.application.commands.record_checkin import record_checkin
+from shargain.offers.application.commands.update_scraping_target_name import update_scraping_target_name
+from shargain.offers.application.queries.get_target import get_target
+from shargain.offers.application.queries.list_targets import list_targets
+from shargain.offers.tests.factories import ScrapingUrlFactory, ScrappingTargetFactory
+
+
+def _get_requests(query, result):
+    return REGISTRY.get_sample_value("shargain_query_cache_requests_total", {"query": query, "result": result}) or 0
+
+
+@pytest.mark.django_db
+class TestUserQueryCache:
+    def test_repeated_query_is_served_from_cache(self, scraping_target, django_assert_num_queries):
+        actor = Actor(user_id=scraping_target.owner_id)
+        hits = _get_requests("list_targets", "hit")
+        first = list_targets(actor)
+
+        with django_assert_num_queries(0):
+            second = list_targets(actor=actor)
+
+        assert second == first
+        assert _get_requests("list_targets", "hit") == hits + 1
+
+    def test_command_invalidates_users_queries(self, scraping_target):
+        actor = Actor(user_id=scraping_target.owner_id)
+        assert list_targets(actor)[0].url_count == 0
+
+        add_scraping_url(actor, "https://www.olx.pl/rowery/", target_id=scraping_target.id)
+        update_scraping_target_name(actor, scraping_target.id, "Bikes")
+
+        assert list_targets(actor)[0].url_count == 1
+        assert list_targets(actor)[0].name == "Bikes"
+
+    def test_target_shows_latest_checkin(self, scraping_target):
+        scraping_url = ScrapingUrlFactory(scraping_target=scraping_target)
+        actor = Actor(user_id=scraping_target.owner_id)
+        get_target(actor, scraping_target.id)
+
+        checkin = record_checkin(scraping_url.id, 10, 2)
+
+        assert get_target(actor, scraping_target.id).urls[0].last_checked_at == checkin.timestamp.isoformat()
+
+    def test_cache_is_per_user(self, scraping_target):
+        other_target = ScrappingTargetFactory()
+
+        assert list_targets(Actor(user_id=scraping_target.owner_id))[0].id_ == scraping_target.id
+        assert list_targets(Actor(user_id=other_target.owner_id))[0].id_ == other_target.id
@@ -1,6 +1,7 @@
 from collections.abc import Generator
 
 import pytest
+from django.core.cache import cache
 from opentelemetry import trace
 from opentelemetry.sdk.trace import TracerProvider
 from opentelemetry.sdk.trace.export import SimpleSpanProcessor, SpanExporter
@@ -39,6 +40,11 @@ def otel_test_provider() -> Generator[TracerProvider]:
     trace.set_tracer_provider(original)
 
 
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cache.clear()
+
+
 @pytest.fixture
 def user(db) -> CustomUser:
     return UserFactory.create()
@@ -1,13 +1,17 @@
 """Tests for OfferBatchCreateService."""
 
+from datetime import timedelta
 from unittest.mock import patch
 
 import pytest
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
 
 from shargain.notifications.tests.factories import NotificationConfigFactory
-from shargain.offers.models import Offer
-from shargain.offers.services.batch_create import OfferBatchCreateService
-from shargain.offers.tests.factories import ScrapingUrlFactory, ScrappingTargetFactory
+from shargain.offers.models import Offer, OfferClosureReason, ScrapingCheckin
+from shargain.offers.services.batch_create import OfferBatchCreateService, OfferFanOutService
+from shargain.offers.tests.factories import OfferFactory, ScrapingUrlFactory, ScrappingTargetFactory
 from shargain.quotas.tests.factories import OfferQuotaFactory
 
 
@@ -57,7 +61,8 @@ class TestOfferBatchCreateService:
             # Create service and inject mock
             service = OfferBatchCreateService(serializer_kwargs={"data": offer_data})
             service.notification_service_class = mock_notification_service_class
-            service.run()
+            with TestCase.captureOnCommitCallbacks(execute=True):
+                service.run()
 
             # Verify the notification service was instantiated with filtered offers
             mock_notification_service_class.assert_called_once()
@@ -103,7 +108,8 @@ class TestOfferBatchCreateService:
             # Create service and inject mock
             service = OfferBatchCreateService(serializer_kwargs={"data": offer_data})
             service.notification_service_class = mock_notification_service_class
-            service.run()
+            with TestCase.captureOnCommitCallbacks(execute=True):
+                service.run()
 
             # Verify the notification service was instantiated with all offers (no filtering)
             mock_notification_service_class.assert_called_once()
@@ -225,7 +231,8 @@ class TestOfferBatchCreateService:
 
             service = OfferBatchCreateService(serializer_kwargs={"data": offer_data})
             service.notification_service_class = mock_notification_service_class
-            service.run()
+            with TestCase.captureOnCommitCallbacks(execute=True):
+                service.run()
 
             mock_notification_service_class.assert_called_once()
             contexts = mock_notification_service_class.call_args[0][0]
@@ -236,3 +243,195 @@ class TestOfferBatchCreateService:
             # Verify distances are sensible (offer 52.22,21.01 to metro 52.23,21.00 ~ 1.2 km)
             metro_dist = ctx.distances[0][1]
             assert metro_dist == pytest.approx(1.2, abs=0.5)
+
+    def test_offer_batch_create_marks_known_offers_as_seen(self):
+        """Test that already known offers are marked as seen and reopened if they were closed as disappeared."""
+        scraping_url = ScrapingUrlFactory(scraping_target=ScrappingTargetFactory(enable_notifications=False))
+        long_ago = timezone.now() - timedelta(days=5)
+        disappeared = OfferFactory(
+            target=scraping_url.scraping_target,
+            list_url=scraping_url.url,
+            last_seen_at=long_ago,
+            closed_at=long_ago,
+            closure_reason=OfferClosureReason.DISAPPEARED,
+        )
+        closed_by_check = OfferFactory(
+            target=scraping_url.scraping_target,
+            list_url=scraping_url.url,
+            last_seen_at=long_ago,
+            closed_at=long_ago,
+            closure_reason=OfferClosureReason.CHECK,
+        )
+        offer_data = {
+            "target": scraping_url.scraping_target.id,
+            "offers": [
+                {"url": offer.url, "title": offer.title, "list_url": scraping_url.url}
+                for offer in (disappeared, closed_by_check)
+            ],
+        }
+
+        OfferBatchCreateService(serializer_kwargs={"data": offer_data}).run()
+
+        disappeared.refresh_from_db()
+        closed_by_check.refresh_from_db()
+        assert disappeared.last_seen_at > long_ago
+        assert disappeared.closed_at is None
+        assert disappeared.closure_reason == ""
+        assert disappeared.next_check_at > timezone.now() + timedelta(days=1)
+        assert closed_by_check.last_seen_at > long_ago
+        assert closed_by_check.closed_at == long_ago
+
+    def test_offer_batch_create_stores_fingerprint_of_batch(self):
+        """Test that the fingerprint of a processed batch is stored on its scraping URL."""
+        scraping_url = ScrapingUrlFactory(scraping_target=ScrappingTargetFactory(enable_notifications=False))
+        offer_data = {
+            "target": scraping_url.scraping_target.id,
+            "offers": [{"url": "https://example.com/offer-1", "title": "Offer 1", "list_url": scraping_url.url}],
+            "fingerprint": OfferBatchCreateService.get_fingerprint(["https://example.com/offer-1"]),
+        }
+
+        OfferBatchCreateService(serializer_kwargs={"data": offer_data}).run()
+
+        scraping_url.refresh_from_db()
+        assert scraping_url.last_fingerprint == offer_data["fingerprint"]
+
+    def test_offer_batch_create_skips_processing_of_unchanged_batch(self):
+        """Test that a batch with the last fingerprint only records a checkin and marks offers as seen."""
+        fingerprint = OfferBatchCreateService.get_fingerprint(["https://example.com/known"])
+        scraping_url = ScrapingUrlFactory(
+            scraping_target=ScrappingTargetFactory(enable_notifications=False), last_fingerprint=fingerprint
+        )
+        long_ago = timezone.now() - timedelta(days=5)
+        known = OfferFactory(
+            target=scraping_url.scraping_target,
+            url="https://example.com/known",
+            list_url=scraping_url.url,
+            last_seen_at=long_ago,
+        )
+        offer_data = {
+            "target": scraping_url.scraping_target.id,
+            "offers": [{"url": known.url, "title": known.title, "list_url": scraping_url.url}],
+            "fingerprint": fingerprint,
+        }
+
+        with patch.object(OfferBatchCreateService, "create") as create:
+            assert OfferBatchCreateService(serializer_kwargs={"data": offer_data}).run() == []
+
+        create.assert_not_called()
+        known.refresh_from_db()
+        assert known.last_seen_at > long_ago
+        assert ScrapingCheckin.objects.filter(scraping_url=scraping_url, offers_count=1, new_offers_count=0).exists()
+
+    def test_offer_batch_create_processes_batch_with_fingerprint_not_matching_its_urls(self):
+        """Test that a stale fingerprint sent by the client doesn't suppress ingestion of a changed list."""
+        fingerprint = OfferBatchCreateService.get_fingerprint(["https://example.com/known"])
+        scraping_url = ScrapingUrlFactory(
+            scraping_target=ScrappingTargetFactory(enable_notifications=False), last_fingerprint=fingerprint
+        )
+        offer_data = {
+            "target": scraping_url.scraping_target.id,
+            "offers": [{"url": "https://example.com/new", "title": "New", "list_url": scraping_url.url}],
+            "fingerprint": fingerprint,
+        }
+
+        assert OfferBatchCreateService(serializer_kwargs={"data": offer_data}).run() == ["https://example.com/new"]
+
+        scraping_url.refresh_from_db()
+        assert scraping_url.last_fingerprint == fingerprint
+
+
+@pytest.mark.django_db
+class TestOfferFanOutService:
+    def test_fan_out_saves_offers_for_every_subscriber(self):
+        first = ScrapingUrlFactory(
+            url="https://www.olx.pl/rowery/?a=1&b=2",
+            scraping_target=ScrappingTargetFactory(owner=None, enable_notifications=False),
+        )
+        second = ScrapingUrlFactory(
+            url="https://www.olx.pl/rowery/?b=2&a=1",
+            scraping_target=ScrappingTargetFactory(owner=None, enable_notifications=False),
+        )
+        OfferFactory(target=first.scraping_target, url="https://www.olx.pl/d/oferta/known.html")
+        offers_data = [
+            {"url": "https://www.olx.pl/d/oferta/known.html", "title": "Known", "list_url": first.source.url},
+            {"url": "https://www.olx.pl/d/oferta/new.html", "title": "New", "list_url": first.source.url},
+        ]
+
+        new_offers_urls = OfferFanOutService([first, second], offers_data, fingerprint="f" * 64).run()
+
+        assert new_offers_urls == {
+            first.id: ["https://www.olx.pl/d/oferta/new.html"],
+            second.id: ["https://www.olx.pl/d/oferta/known.html", "https://www.olx.pl/d/oferta/new.html"],
+        }
+        assert set(Offer.objects.filter(target=second.scraping_target).values_list("list_url", flat=True)) == {
+            second.url
+        }
+        first.refresh_from_db()
+        assert first.last_fingerprint == "f" * 64
+        assert ScrapingCheckin.objects.filter(scraping_url=second, offers_count=2, new_offers_count=2).exists()
+
+    def test_fan_out_skips_subscribers_which_saw_the_same_list(self):
+        unchanged = ScrapingUrlFactory(
+            url="https://www.olx.pl/rowery/",
+            last_fingerprint="f" * 64,
+            scraping_target=ScrappingTargetFactory(owner=None, enable_notifications=False),
+        )
+        offers_data = [{"url": "https://www.olx.pl/d/oferta/a.html", "title": "A", "list_url": unchanged.url}]
+
+        new_offers_urls = OfferFanOutService([unchanged], offers_data, fingerprint="f" * 64).run()
+
+        assert new_offers_urls == {unchanged.id: []}
+        assert not Offer.objects.exists()
+        assert ScrapingCheckin.objects.filter(scraping_url=unchanged, new_offers_count=0).exists()
+
+    def test_fan_out_failed_subscriber_does_not_break_the_others(self):
+        failing = ScrapingUrlFactory(
+            url="https://www.olx.pl/rowery/",
+            scraping_target=ScrappingTargetFactory(owner=None, enable_notifications=False),
+        )
+        other = ScrapingUrlFactory(
+            url="https://www.olx.pl/rowery/",
+            scraping_target=ScrappingTargetFactory(owner=None, enable_notifications=False),
+        )
+        offers_data = [{"url": "https://www.olx.pl/d/oferta/a.html", "title": "A", "list_url": failing.url}]
+        create = OfferFanOutService.create
+
+        def create_failing_in_database(service, validated_data):
+            if validated_data["target"] == failing.scraping_target:
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT 1 / 0")
+            return create(service, validated_data)
+
+        with patch.object(OfferFanOutService, "create", create_failing_in_database):
+            new_offers_urls = OfferFanOutService([failing, other], offers_data).run()
+
+        assert new_offers_urls == {failing.id: None, other.id: ["https://www.olx.pl/d/oferta/a.html"]}
+        assert list(Offer.objects.values_list("target_id", flat=True)) == [other.scraping_target_id]
+
+    def test_fan_out_notifies_only_subscribers_whose_offers_were_saved(self):
+        failing, other = (
+            ScrapingUrlFactory(
+                url="https://www.olx.pl/rowery/",
+                scraping_target=ScrappingTargetFactory(
+                    owner=None, enable_notifications=True, notification_config=NotificationConfigFactory()
+                ),
+            )
+            for _ in range(2)
+        )
+        offers_data = [{"url": "https://www.olx.pl/d/oferta/a.html", "title": "A", "list_url": failing.url}]
+        record_checkins = OfferFanOutService._record_checkins
+
+        def record_checkins_failing(offers_data, created_offers, target):
+            if target == failing.scraping_target:
+                raise ValueError("checkin failed")
+            record_checkins(offers_data, created_offers, target)
+
+        with (
+            patch.object(OfferFanOutService, "_record_checkins", side_effect=record_checkins_failing),
+            patch.object(OfferFanOutService, "notification_service_class") as mock_notification_service_class,
+            TestCase.captureOnCommitCallbacks(execute=True),
+        ):
+            OfferFanOutService([failing, other], offers_data).run()
+
+        mock_notification_service_class.assert_called_once()
+        assert mock_notification_service_class.call_args[0][1] == other.scraping_target
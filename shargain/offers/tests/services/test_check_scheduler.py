@@ -0,0 +1,70 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from shargain.offers.models import Offer
+from shargain.offers.services.check_scheduler import CheckScheduler, compute_closure_rates, get_age_bucket
+from shargain.offers.tests.factories import OfferFactory
+
+
+def _make_scheduler(closure_rates=None):
+    return CheckScheduler(
+        min_interval=timedelta(minutes=30),
+        max_interval=timedelta(days=3),
+        target_probability=0.1,
+        default_closure_rate=0.1,
+        closure_rates=closure_rates or {},
+    )
+
+
+@pytest.mark.parametrize(
+    ("age", "bucket"),
+    [
+        (timedelta(0), 0),
+        (timedelta(hours=23), 0),
+        (timedelta(days=1), 1),
+        (timedelta(days=10), 3),
+        (timedelta(days=90), 5),
+    ],
+)
+def test_get_age_bucket(age, bucket):
+    assert get_age_bucket(age) == bucket
+
+
+class TestCheckScheduler:
+    def test_offers_likely_to_close_are_checked_more_often(self):
+        now = timezone.now()
+        scheduler = _make_scheduler({("www.olx.pl", 0): 2.0, ("www.olx.pl", 3): 0.2})
+        young = Offer(url="https://www.olx.pl/d/oferta/a.html", created_at=now - timedelta(hours=2))
+        old = Offer(url="https://www.olx.pl/d/oferta/b.html", created_at=now - timedelta(days=10))
+
+        assert scheduler.get_check_interval(young, now) < scheduler.get_check_interval(old, now)
+
+    def test_interval_is_clamped(self):
+        now = timezone.now()
+        offer = Offer(url="https://www.olx.pl/d/oferta/a.html", created_at=now)
+
+        assert _make_scheduler({("www.olx.pl", 0): 1000.0}).get_check_interval(offer, now) == timedelta(minutes=30)
+        assert _make_scheduler({("www.olx.pl", 0): 0.0}).get_check_interval(offer, now) == timedelta(days=3)
+
+    def test_unknown_domain_uses_default_closure_rate(self):
+        now = timezone.now()
+        offer = Offer(url="https://example.com/offer", created_at=now)
+
+        assert _make_scheduler().get_closure_rate(offer, now) == 0.1
+
+
+@pytest.mark.django_db
+def test_compute_closure_rates():
+    closed = OfferFactory.create_batch(2, url="https://www.olx.pl/d/oferta/closed.html")
+    OfferFactory.create_batch(2, url="https://www.olx.pl/d/oferta/open.html")
+    created_at = timezone.now() - timedelta(days=2)
+    Offer.objects.update(created_at=created_at)
+    Offer.objects.filter(id__in=[offer.id for offer in closed]).update(closed_at=created_at + timedelta(hours=12))
+
+    rates = compute_closure_rates(window=timedelta(days=30), min_exposure_days=0.1)
+
+    # 2 closures during 2 * 0.5 + 2 * 1 days of exposure in the first bucket
+    assert rates[("www.olx.pl", 0)] == pytest.approx(2 / 3)
+    assert rates[("www.olx.pl", 1)] == pytest.approx(0, abs=1e-6)
@@ -0,0 +1,151 @@
+from datetime import UTC, datetime, timedelta
+from unittest import mock
+
+import pytest
+
+from shargain.commons.application.actor import Actor
+from shargain.offers.application.exceptions import ScrapingUrlDoesNotExist
+from shargain.offers.application.queries.get_checkin_stats import get_checkin_stats
+from shargain.offers.models import RollupPeriod, ScrapingCheckin, ScrapingCheckinRollup
+from shargain.offers.services.checkin_rollup import CheckinRollupService
+from shargain.offers.services.scrape_scheduler import ScrapeScheduler
+from shargain.offers.tests.factories import ScrapingUrlFactory
+
+NOW = datetime(2026, 10, 19, 12, 30, tzinfo=UTC)
+
+
+def _make_service(retention=timedelta(days=30), prune_chunk_size=2, max_hours=60 * 24):
+    return CheckinRollupService(
+        lookback=timedelta(hours=2), max_hours=max_hours, retention=retention, prune_chunk_size=prune_chunk_size
+    )
+
+
+def _create_checkin(scraping_url, timestamp, new_offers_count, offers_count=40):
+    checkin = ScrapingCheckin.objects.create(
+        scraping_url=scraping_url, offers_count=offers_count, new_offers_count=new_offers_count
+    )
+    ScrapingCheckin.objects.filter(id=checkin.id).update(timestamp=timestamp)
+
+
+@pytest.mark.django_db
+class TestCheckinRollupService:
+    def test_rollup_aggregates_complete_hours_and_days(self):
+        scraping_url = ScrapingUrlFactory()
+        for minutes, new_offers_count in [(-130, 5), (-100, 1), (-80, 2), (-50, 0), (-10, 4), (10, 7)]:
+            _create_checkin(scraping_url, NOW.replace(minute=0) + timedelta(minutes=minutes), new_offers_count)
+
+        assert _make_service().rollup(NOW) == 4
+
+        hours = ScrapingCheckinRollup.objects.filter(period=RollupPeriod.HOUR).order_by("bucket_start")
+        assert [(hour.checkins_count, hour.new_offers_count) for hour in hours] == [(1, 5), (2, 3), (2, 4)]
+        # the first checkin observes nothing and the gap of the first checkin of an hour reaches into the previous one
+        assert [hour.observed_new_offers_count for hour in hours] == [0, 3, 4]
+        assert [hour.observed_time for hour in hours] == [timedelta(0), timedelta(minutes=50), timedelta(minutes=70)]
+        assert [hour.max_gap for hour in hours] == [None, timedelta(minutes=30), timedelta(minutes=40)]
+        day = ScrapingCheckinRollup.objects.get(period=RollupPeriod.DAY)
+        assert (day.checkins_count, day.observed_new_offers_count, day.max_gap) == (5, 7, timedelta(minutes=40))
+
+    def test_rollup_recomputes_lookback(self):
+        scraping_url = ScrapingUrlFactory()
+        _create_checkin(scraping_url, NOW - timedelta(hours=1), 1)
+        service = _make_service()
+        service.rollup(NOW)
+
+        _create_checkin(scraping_url, NOW - timedelta(minutes=40), 3)
+        service.rollup(NOW)
+
+        hour = ScrapingCheckinRollup.objects.get(period=RollupPeriod.HOUR)
+        assert (hour.checkins_count, hour.new_offers_count) == (2, 4)
+
+    def test_rollup_is_capped_and_resumed_by_next_runs(self):
+        scraping_url = ScrapingUrlFactory()
+        for days in (40, 20, 1):
+            _create_checkin(scraping_url, NOW - timedelta(days=days), 1)
+        service = _make_service(max_hours=24)
+
+        assert service.rollup(NOW) == 2
+        assert service.get_rolled_up_until() == (NOW - timedelta(days=40)).replace(minute=0) + timedelta(hours=1)
+        # hours without checkins are skipped, the lookback is recomputed
+        assert service.rollup(NOW) == 4
+        assert service.rollup(NOW) == 4
+        assert service.rollup(NOW) == 2
+        assert ScrapingCheckinRollup.objects.filter(period=RollupPeriod.DAY).count() == 3
+
+    def test_interrupted_rollup_keeps_days_of_finished_chunks(self):
+        scraping_url = ScrapingUrlFactory()
+        for days in (3, 1):
+            _create_checkin(scraping_url, NOW - timedelta(days=days), 1)
+        service = _make_service()
+        rollup_hours = service._rollup_hours
+        calls = []
+
+        def interrupted_rollup_hours(start, end):
+            if calls:
+                raise TimeoutError()
+            calls.append(start)
+            return rollup_hours(start, end)
+
+        with mock.patch.object(service, "_rollup_hours", side_effect=interrupted_rollup_hours):
+            with pytest.raises(TimeoutError):
+                service.rollup(NOW)
+
+        day = ScrapingCheckinRollup.objects.get(period=RollupPeriod.DAY)
+        assert day.first_checkin_at == NOW - timedelta(days=3)
+        assert service.prune(NOW) == 0
+
+    def test_prune_deletes_old_rolled_up_checkins_in_chunks(self):
+        scraping_url = ScrapingUrlFactory()
+        for days in (40, 39, 38, 1):
+            _create_checkin(scraping_url, NOW - timedelta(days=days), 1)
+        service = _make_service()
+
+        assert service.prune(NOW) == 0
+        service.rollup(NOW)
+
+        assert service.prune(NOW) == 3
+        assert list(ScrapingCheckin.objects.values_list("timestamp", flat=True)) == [NOW - timedelta(days=1)]
+        assert ScrapingCheckinRollup.objects.filter(period=RollupPeriod.DAY).count() == 4
+
+    def test_scheduler_reads_rollups_of_pruned_checkins(self):
+        scraping_url = ScrapingUrlFactory()
+        for hours, new_offers_count in [(5, 40), (4, 1), (3, 0), (2, 3), (0, 2)]:
+            _create_checkin(scraping_url, NOW - timedelta(hours=hours), new_offers_count)
+        scheduler = ScrapeScheduler(
+            min_interval=timedelta(minutes=2),
+            max_interval=timedelta(hours=6),
+            target_new_offers=1,
+            history_window=timedelta(days=7),
+        )
+        rate = scheduler.get_new_offers_rate(scraping_url.id, NOW)
+        service = _make_service(retention=timedelta(0))
+        service.rollup(NOW)
+        service.prune(NOW)
+
+        assert ScrapingCheckin.objects.count() < 5
+        assert scheduler.get_new_offers_rate(scraping_url.id, NOW) == pytest.approx(rate) == pytest.approx(6 / 5)
+
+
+@pytest.mark.django_db
+class TestGetCheckinStats:
+    def test_get_checkin_stats(self):
+        scraping_url = ScrapingUrlFactory()
+        actor = Actor(user_id=scraping_url.scraping_target.owner_id)
+        ScrapingCheckinRollup.objects.create(
+            scraping_url=scraping_url,
+            period=RollupPeriod.DAY,
+            bucket_start=datetime.now(UTC) - timedelta(days=1),
+            checkins_count=3,
+            offers_count=120,
+            new_offers_count=4,
+            observed_new_offers_count=4,
+            observed_time=timedelta(hours=2),
+            max_gap=timedelta(hours=1),
+            first_checkin_at=datetime.now(UTC) - timedelta(days=1),
+            last_checkin_at=datetime.now(UTC) - timedelta(days=1),
+        )
+
+        stats = get_checkin_stats(actor, scraping_url.scraping_target_id, scraping_url.id, period=RollupPeriod.DAY)
+
+        assert [(item.checkins_count, item.max_gap_seconds) for item in stats] == [(3, 3600)]
+        with pytest.raises(ScrapingUrlDoesNotExist):
+            get_checkin_stats(Actor(user_id=actor.user_id + 1), scraping_url.scraping_target_id, scraping_url.id)
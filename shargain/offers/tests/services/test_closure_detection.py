@@ -0,0 +1,57 @@
+import pytest
+from kombu.utils.json import dumps, loads
+
+from shargain.offers.models import OfferClosureReason
+from shargain.offers.services.closure_detection import (
+    ClosureParser,
+    close_offers_with_closed_pages,
+    deserialize_offer_pages,
+    serialize_offer_pages,
+)
+from shargain.offers.tests.factories import OfferFactory
+from shargain.parsers.closure import FetchedPage
+
+
+def _pages():
+    return [
+        FetchedPage(url=f"https://www.otomoto.pl/oferta/{i}.html", final_url="", status_code=status, content=b"")
+        for i, status in enumerate([200, 404, 200, 404, 404])
+    ]
+
+
+class TestClosureParser:
+    def test_parse_sends_pages_in_batches(self):
+        batches = []
+        offer_pages = [([i], page) for i, page in enumerate(_pages())]
+
+        assert ClosureParser(batch_size=2, submit=batches.append).parse(offer_pages) == 3
+
+        assert [deserialize_offer_pages(loads(dumps(batch))) for batch in batches] == [
+            offer_pages[:2],
+            offer_pages[2:4],
+            offer_pages[4:],
+        ]
+
+    def test_serialized_pages_keep_binary_content(self):
+        page = FetchedPage(url="https://www.olx.pl/d/oferta/a.html", final_url="", status_code=200, content=b"\xff\x00")
+
+        assert deserialize_offer_pages(loads(dumps(serialize_offer_pages([([1], page)])))) == [([1], page)]
+
+
+@pytest.mark.django_db
+class TestCloseOffersWithClosedPages:
+    def test_closes_open_offers_of_closed_pages(self):
+        open_offer, closed_offer, other_closed_offer = OfferFactory.create_batch(3)
+        pages = _pages()
+
+        assert (
+            close_offers_with_closed_pages(
+                [([open_offer.id], pages[0]), ([closed_offer.id, other_closed_offer.id], pages[1])]
+            )
+            == 2
+        )
+
+        open_offer.refresh_from_db()
+        closed_offer.refresh_from_db()
+        assert open_offer.closed_at is None
+        assert closed_offer.closure_reason == OfferClosureReason.CHECK
@@ -0,0 +1,85 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from shargain.offers.models import Offer, OfferClosureReason, ScrapingCheckin
+from shargain.offers.services.disappearance import close_disappeared_offers
+from shargain.offers.tests.factories import OfferFactory, ScrapingUrlFactory
+
+
+def _create_checkins(scraping_url, timestamps):
+    for timestamp in timestamps:
+        checkin = ScrapingCheckin.objects.create(scraping_url=scraping_url, offers_count=10, new_offers_count=0)
+        ScrapingCheckin.objects.filter(id=checkin.id).update(timestamp=timestamp)
+
+
+@pytest.mark.django_db
+class TestCloseDisappearedOffers:
+    def test_closes_offers_missing_from_latest_checkins(self):
+        now = timezone.now()
+        scraping_url = ScrapingUrlFactory()
+        _create_checkins(scraping_url, [now - timedelta(minutes=minutes) for minutes in (40, 30, 20, 10)])
+        OfferFactory(
+            target=scraping_url.scraping_target, list_url=scraping_url.url, last_seen_at=now - timedelta(minutes=11)
+        )
+        missing = OfferFactory(
+            target=scraping_url.scraping_target, list_url=scraping_url.url, last_seen_at=now - timedelta(minutes=41)
+        )
+        seen_in_third_latest = OfferFactory(
+            target=scraping_url.scraping_target, list_url=scraping_url.url, last_seen_at=now - timedelta(minutes=31)
+        )
+        other_list_offer = OfferFactory(target=scraping_url.scraping_target, last_seen_at=now - timedelta(days=1))
+
+        assert close_disappeared_offers(missing_checkins=3) == 1
+
+        missing.refresh_from_db()
+        seen_in_third_latest.refresh_from_db()
+        other_list_offer.refresh_from_db()
+        assert missing.closed_at is not None
+        assert missing.closure_reason == OfferClosureReason.DISAPPEARED
+        assert seen_in_third_latest.closed_at is None
+        assert other_list_offer.closed_at is None
+
+    def test_does_nothing_without_enough_checkins(self):
+        now = timezone.now()
+        scraping_url = ScrapingUrlFactory()
+        _create_checkins(scraping_url, [now - timedelta(minutes=20), now - timedelta(minutes=10)])
+        OfferFactory(
+            target=scraping_url.scraping_target, list_url=scraping_url.url, last_seen_at=now - timedelta(days=1)
+        )
+
+        assert close_disappeared_offers(missing_checkins=3) == 0
+
+    def test_keeps_offers_pushed_off_the_first_page(self):
+        now = timezone.now()
+        scraping_url = ScrapingUrlFactory()
+        _create_checkins(scraping_url, [now - timedelta(minutes=minutes) for minutes in (40, 30, 20, 10)])
+
+        def create_offer(created_ago, last_seen_ago):
+            offer = OfferFactory(
+                target=scraping_url.scraping_target, list_url=scraping_url.url, last_seen_at=now - last_seen_ago
+            )
+            Offer.objects.filter(id=offer.id).update(created_at=now - created_ago)
+            return offer
+
+        pushed_off = create_offer(created_ago=timedelta(days=2), last_seen_ago=timedelta(minutes=41))
+        create_offer(created_ago=timedelta(days=1), last_seen_ago=timedelta(minutes=11))
+        removed = create_offer(created_ago=timedelta(hours=1), last_seen_ago=timedelta(minutes=41))
+
+        assert close_disappeared_offers(missing_checkins=3) == 1
+
+        pushed_off.refresh_from_db()
+        removed.refresh_from_db()
+        assert pushed_off.closed_at is None
+        assert removed.closure_reason == OfferClosureReason.DISAPPEARED
+
+    def test_does_nothing_if_latest_checkin_saw_no_offers(self):
+        now = timezone.now()
+        scraping_url = ScrapingUrlFactory()
+        _create_checkins(scraping_url, [now - timedelta(minutes=minutes) for minutes in (40, 30, 20, 10)])
+        OfferFactory(
+            target=scraping_url.scraping_target, list_url=scraping_url.url, last_seen_at=now - timedelta(minutes=41)
+        )
+
+        assert close_disappeared_offers(missing_checkins=3) == 0
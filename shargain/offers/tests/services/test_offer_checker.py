@@ -0,0 +1,223 @@
+import threading
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest import mock
+
+import factory
+import pytest
+import requests
+from django.utils import timezone
+from kombu.utils.json import dumps, loads
+
+from shargain.offers.models import Offer
+from shargain.offers.services.check_scheduler import CheckScheduler
+from shargain.offers.services.closure_detection import ClosureParser
+from shargain.offers.services.offer_checker import ClosedOffersChecker, DomainPolicy
+from shargain.offers.tasks import check_for_closed_offers, close_offers_with_closed_pages
+from shargain.offers.tests.factories import OfferFactory
+from shargain.parsers.closure import FetchStrategy
+
+CLOSED_OLX_HTML = b"<html><body><div id='offer_removed_by_user'></div></body></html>"
+OPEN_OLX_HTML = b"<html><body><div id='offer'></div></body></html>"
+
+
+class FakeFetch:
+    def __init__(self, closed_urls=(), failing_urls=(), delay=0.0, etag=""):
+        self.closed_urls = set(closed_urls)
+        self.failing_urls = set(failing_urls)
+        self.delay = delay
+        self.etag = etag
+        self.calls: list[str] = []
+        self.headers: list[dict[str, str]] = []
+        self.strategies: list[FetchStrategy] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, url, headers, detector):
+        with self._lock:
+            self.calls.append(url)
+            self.headers.append(headers)
+            self.strategies.append(detector.strategy)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            if url in self.failing_urls:
+                raise requests.ConnectionError()
+            if self.etag and headers.get("If-None-Match") == self.etag:
+                return SimpleNamespace(url=url, status_code=304, content=b"", headers={"ETag": self.etag})
+            content = CLOSED_OLX_HTML if url in self.closed_urls else OPEN_OLX_HTML
+            return SimpleNamespace(url=url, status_code=200, content=content, headers={"ETag": self.etag})
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def _parse_in_worker(offer_pages):
+    close_offers_with_closed_pages(loads(dumps(offer_pages)))
+
+
+def _make_checker(fetch, concurrency=10, domain_policy: DomainPolicy | None = None, chunk_size=500, time_budget=None):
+    return ClosedOffersChecker(
+        concurrency=concurrency,
+        default_domain_policy=domain_policy or DomainPolicy(max_concurrency=10),
+        chunk_size=chunk_size,
+        fetch=fetch,
+        scheduler=CheckScheduler(
+            min_interval=timedelta(minutes=30),
+            max_interval=timedelta(days=3),
+            target_probability=0.1,
+            default_closure_rate=0.1,
+        ),
+        parser=ClosureParser(batch_size=2, submit=_parse_in_worker),
+        time_budget=time_budget,
+    )
+
+
+@pytest.mark.django_db
+class TestClosedOffersChecker:
+    def test_run_closes_offers(self):
+        open_offer = OfferFactory(url="https://www.olx.pl/d/oferta/open.html")
+        closed_offer = OfferFactory(url="https://www.olx.pl/d/oferta/closed.html")
+        fetch = FakeFetch(closed_urls=[closed_offer.url])
+
+        stats = _make_checker(fetch).run()
+
+        open_offer.refresh_from_db()
+        closed_offer.refresh_from_db()
+        assert open_offer.closed_at is None
+        assert closed_offer.closed_at is not None
+        assert stats.checked == 2
+        assert stats.parsed == 2
+
+    def test_run_skips_offers_which_could_not_be_fetched(self):
+        offer = OfferFactory(url="https://www.olx.pl/d/oferta/broken.html")
+        last_check_at = offer.last_check_at
+
+        stats = _make_checker(FakeFetch(failing_urls=[offer.url])).run()
+
+        offer.refresh_from_db()
+        assert offer.closed_at is None
+        assert offer.last_check_at == last_check_at
+        assert offer.next_check_at > timezone.now()
+        assert stats.errors == 1
+
+    def test_run_checks_only_due_offers_and_reschedules_them(self):
+        due_offer = OfferFactory(url="https://www.olx.pl/d/oferta/due.html")
+        OfferFactory(url="https://www.olx.pl/d/oferta/later.html", next_check_at=timezone.now() + timedelta(hours=1))
+        fetch = FakeFetch()
+
+        _make_checker(fetch).run()
+
+        due_offer.refresh_from_db()
+        assert fetch.calls == [due_offer.url]
+        assert due_offer.next_check_at >= due_offer.last_check_at + timedelta(minutes=30)
+
+    def test_run_coalesces_requests_for_the_same_url(self):
+        OfferFactory.create_batch(3, url="https://www.olx.pl/d/oferta/shared.html")
+        fetch = FakeFetch(closed_urls=["https://www.olx.pl/d/oferta/shared.html"])
+
+        stats = _make_checker(fetch, chunk_size=3).run()
+
+        assert fetch.calls == ["https://www.olx.pl/d/oferta/shared.html"]
+        assert stats.coalesced == 2
+        assert not Offer.objects.opened().exists()
+
+    def test_run_forgets_results_of_saved_chunks(self):
+        OfferFactory.create_batch(2, url="https://www.olx.pl/d/oferta/shared.html")
+        fetch = FakeFetch()
+        checker = _make_checker(fetch, chunk_size=1)
+
+        checker.run()
+
+        assert fetch.calls == ["https://www.olx.pl/d/oferta/shared.html"] * 2
+        assert checker._results == {}
+
+    def test_run_stops_after_time_budget_and_leaves_remaining_offers_due(self):
+        OfferFactory.create_batch(3, url=factory.Sequence(lambda n: f"https://www.olx.pl/d/oferta/offer-{n}.html"))
+        fetch = FakeFetch()
+
+        stats = _make_checker(fetch, chunk_size=1, time_budget=0).run()
+
+        assert len(fetch.calls) == 1
+        assert stats.checked == 1
+        assert Offer.objects.due_for_check().count() == 2
+
+        _make_checker(fetch, chunk_size=2, time_budget=0).run()
+
+        assert len(set(fetch.calls)) == 3
+
+    def test_run_respects_domain_concurrency(self):
+        OfferFactory.create_batch(6, url=factory.Sequence(lambda n: f"https://www.olx.pl/d/oferta/offer-{n}.html"))
+        fetch = FakeFetch(delay=0.05)
+
+        _make_checker(fetch, concurrency=10, domain_policy=DomainPolicy(max_concurrency=2)).run()
+
+        assert len(fetch.calls) == 6
+        assert fetch.max_in_flight <= 2
+
+    def test_run_revalidates_offers_with_stored_validators(self):
+        offer = OfferFactory(url="https://www.olx.pl/d/oferta/unchanged.html", http_etag='"v1"')
+        new_offer = OfferFactory(url="https://www.olx.pl/d/oferta/new.html")
+        fetch = FakeFetch(etag='"v1"')
+
+        stats = _make_checker(fetch).run()
+
+        assert dict(zip(fetch.calls, fetch.headers, strict=True)) == {
+            offer.url: {"If-None-Match": '"v1"'},
+            new_offer.url: {},
+        }
+        assert stats.not_modified == 1
+        new_offer.refresh_from_db()
+        offer.refresh_from_db()
+        # validators describe the stored source HTML, which the checker doesn't update
+        assert new_offer.http_etag == ""
+        assert offer.closed_at is None
+        assert offer.last_check_at > offer.created_at
+
+    def test_run_fetches_only_as_much_as_domain_detector_needs(self):
+        olx_offer = OfferFactory(url="https://www.olx.pl/d/oferta/a.html")
+        otomoto_offer = OfferFactory(url="https://www.otomoto.pl/oferta/b.html")
+        otodom_offer = OfferFactory(url="https://www.otodom.pl/pl/oferta/c")
+        fetch = FakeFetch()
+
+        _make_checker(fetch).run()
+
+        assert dict(zip(fetch.calls, fetch.strategies, strict=True)) == {
+            olx_offer.url: FetchStrategy.FULL,
+            otomoto_offer.url: FetchStrategy.REDIRECT,
+            otodom_offer.url: FetchStrategy.REDIRECT,
+        }
+
+    def test_run_does_not_fetch_offers_from_unsupported_domains(self):
+        offer = OfferFactory(url="https://example.com/offer")
+        fetch = FakeFetch()
+
+        stats = _make_checker(fetch).run()
+
+        offer.refresh_from_db()
+        assert fetch.calls == []
+        assert stats.unsupported == 1
+        assert offer.closed_at is None
+        assert offer.next_check_at > timezone.now()
+
+
+@pytest.mark.django_db
+class TestCheckForClosedOffersTask:
+    def test_task_sends_pages_to_parsing_task(self):
+        open_offer = OfferFactory(url="https://www.olx.pl/d/oferta/open.html")
+        closed_offer = OfferFactory(url="https://www.olx.pl/d/oferta/closed.html")
+
+        with (
+            mock.patch.object(ClosedOffersChecker, "_get", FakeFetch(closed_urls=[closed_offer.url])),
+            mock.patch.object(close_offers_with_closed_pages, "delay", side_effect=_parse_in_worker) as m_delay,
+        ):
+            check_for_closed_offers()
+
+        m_delay.assert_called_once()
+        open_offer.refresh_from_db()
+        closed_offer.refresh_from_db()
+        assert open_offer.closed_at is None
+        assert closed_offer.closed_at is not None
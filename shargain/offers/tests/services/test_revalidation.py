@@ -0,0 +1,35 @@
+from types import SimpleNamespace
+
+from shargain.offers.services.revalidation import ConditionalHitRatioCollector, Validators, is_not_modified
+
+
+class TestValidators:
+    def test_as_request_headers(self):
+        validators = Validators(etag='W/"abc"', last_modified="Wed, 21 Oct 2026 07:28:00 GMT")
+
+        assert validators.as_request_headers() == {
+            "If-None-Match": 'W/"abc"',
+            "If-Modified-Since": "Wed, 21 Oct 2026 07:28:00 GMT",
+        }
+
+    def test_no_validators_no_headers(self):
+        assert Validators().as_request_headers() == {}
+
+    def test_from_response(self):
+        response = SimpleNamespace(headers={"ETag": '"abc"', "Last-Modified": "Wed, 21 Oct 2026 07:28:00 GMT"})
+
+        assert Validators.from_response(response) == Validators('"abc"', "Wed, 21 Oct 2026 07:28:00 GMT")
+
+
+class TestIsNotModified:
+    def test_conditional_request_results_are_counted_in_hit_ratio(self):
+        headers = {"If-None-Match": '"abc"'}
+
+        assert is_not_modified(headers, SimpleNamespace(status_code=304))
+        assert not is_not_modified(headers, SimpleNamespace(status_code=200))
+
+        [hit_ratio] = ConditionalHitRatioCollector().collect()
+        assert 0 < hit_ratio.samples[0].value < 1
+
+    def test_unconditional_request_is_not_counted(self):
+        assert not is_not_modified({}, SimpleNamespace(status_code=200))
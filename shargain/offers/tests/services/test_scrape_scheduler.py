@@ -0,0 +1,85 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from shargain.offers.models import ScrapingCheckin, ScrapingUrl
+from shargain.offers.services.scrape_scheduler import ScrapeScheduler
+from shargain.offers.tests.factories import ScrapingUrlFactory, ScrappingTargetFactory
+from shargain.quotas.tests.factories import ScrapingUrlQuotaFactory
+
+
+def _make_scheduler():
+    return ScrapeScheduler(
+        min_interval=timedelta(minutes=2),
+        max_interval=timedelta(hours=6),
+        target_new_offers=1,
+        history_window=timedelta(days=7),
+    )
+
+
+def _create_checkins(scraping_url, now, new_offers_counts, every=timedelta(hours=1)):
+    for index, new_offers_count in enumerate(new_offers_counts):
+        checkin = ScrapingCheckin.objects.create(
+            scraping_url=scraping_url, offers_count=40, new_offers_count=new_offers_count
+        )
+        ScrapingCheckin.objects.filter(id=checkin.id).update(
+            timestamp=now - every * (len(new_offers_counts) - 1 - index)
+        )
+
+
+@pytest.mark.parametrize(
+    ("rate", "plan_min_interval", "interval"),
+    [
+        (None, None, timedelta(minutes=2)),
+        (None, timedelta(minutes=15), timedelta(minutes=15)),
+        (0.0, None, timedelta(hours=6)),
+        (0.5, None, timedelta(hours=2)),
+        (100.0, None, timedelta(minutes=2)),
+        (100.0, timedelta(minutes=15), timedelta(minutes=15)),
+        (0.0, timedelta(days=1), timedelta(days=1)),
+    ],
+)
+def test_get_scrape_interval(rate, plan_min_interval, interval):
+    assert _make_scheduler().get_scrape_interval(rate, plan_min_interval) == interval
+
+
+@pytest.mark.django_db
+class TestScrapeScheduler:
+    def test_get_new_offers_rate_skips_first_checkin(self):
+        now = timezone.now()
+        scraping_url = ScrapingUrlFactory()
+        _create_checkins(scraping_url, now, [40, 1, 0, 3])
+
+        assert _make_scheduler().get_new_offers_rate(scraping_url.id, now) == pytest.approx(4 / 3)
+
+    def test_get_new_offers_rate_without_history(self):
+        now = timezone.now()
+        scraping_url = ScrapingUrlFactory()
+        _create_checkins(scraping_url, now, [40])
+
+        assert _make_scheduler().get_new_offers_rate(scraping_url.id, now) is None
+
+    def test_reschedule_respects_owners_plan(self):
+        now = timezone.now()
+        target = ScrappingTargetFactory()
+        ScrapingUrlQuotaFactory(user=target.owner, min_scrape_interval=timedelta(minutes=30))
+        scraping_url = ScrapingUrlFactory(scraping_target=target)
+        _create_checkins(scraping_url, now, [40, 20, 20], every=timedelta(minutes=10))
+
+        _make_scheduler().reschedule(scraping_url, now)
+
+        scraping_url.refresh_from_db()
+        assert scraping_url.scrape_interval == timedelta(minutes=30)
+        assert scraping_url.next_scrape_at == now + timedelta(minutes=30)
+
+    def test_due_for_scrape(self):
+        now = timezone.now()
+        due = ScrapingUrlFactory(next_scrape_at=now - timedelta(minutes=1))
+        ScrapingUrlFactory(next_scrape_at=now + timedelta(minutes=1))
+        ScrapingUrlFactory(next_scrape_at=now - timedelta(minutes=1), is_active=False)
+        ScrapingUrlFactory(
+            next_scrape_at=now - timedelta(minutes=1), scraping_target=ScrappingTargetFactory(is_active=False)
+        )
+
+        assert list(ScrapingUrl.objects.due_for_scrape(now)) == [due]
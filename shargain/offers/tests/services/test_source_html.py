@@ -0,0 +1,137 @@
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+import requests
+from django.core.files.base import ContentFile
+from django.utils import timezone
+
+from shargain.offers.services.source_html import (
+    SourceHtmlFetcher,
+    claim_offers_for_source_html,
+    collect_source_html_garbage,
+)
+from shargain.offers.storages import OfferSourceStorage
+from shargain.offers.tests.factories import OfferFactory
+
+
+@pytest.mark.django_db
+class TestClaimOffersForSourceHtml:
+    def test_claims_offers_without_source_html_first(self):
+        now = timezone.localtime()
+        with_source = OfferFactory(next_check_at=now - timedelta(days=2), source_html="offer_sources/a.html")
+        without_source = OfferFactory(next_check_at=now - timedelta(minutes=1))
+        overdue = OfferFactory(next_check_at=now - timedelta(days=1))
+
+        offers = claim_offers_for_source_html(batch_size=2)
+
+        assert [offer.id for offer in offers] == [overdue.id, without_source.id]
+        with_source.refresh_from_db()
+        assert with_source.next_check_at == now - timedelta(days=2)
+
+    def test_skips_offers_with_source_html_which_are_not_due(self):
+        OfferFactory(next_check_at=timezone.localtime() + timedelta(hours=1), source_html="offer_sources/a.html")
+
+        assert claim_offers_for_source_html(batch_size=10) == []
+
+    def test_claimed_offers_are_not_claimed_again(self):
+        first = OfferFactory(next_check_at=timezone.localtime() - timedelta(days=2))
+        second = OfferFactory(next_check_at=timezone.localtime() - timedelta(days=1))
+
+        assert [offer.id for offer in claim_offers_for_source_html(batch_size=1)] == [first.id]
+        assert [offer.id for offer in claim_offers_for_source_html(batch_size=1)] == [second.id]
+
+    def test_offers_without_source_html_are_leased(self):
+        OfferFactory.create_batch(3, next_check_at=timezone.localtime() - timedelta(minutes=1))
+
+        first = {offer.id for offer in claim_offers_for_source_html(batch_size=2)}
+        second = {offer.id for offer in claim_offers_for_source_html(batch_size=2)}
+
+        assert len(first) == 2
+        assert len(second) == 1
+        assert not first & second
+        assert claim_offers_for_source_html(batch_size=2) == []
+
+    def test_skips_closed_and_old_offers(self):
+        OfferFactory(closed_at=timezone.localtime())
+        old_offer = OfferFactory()
+        old_offer.created_at = timezone.localtime() - timedelta(days=40)
+        old_offer.save(update_fields=["created_at"])
+
+        assert claim_offers_for_source_html(batch_size=10) == []
+
+
+@pytest.mark.django_db
+class TestSourceHtmlFetcher:
+    def test_fetch_saves_each_downloaded_offer(self, settings, tmp_path):
+        settings.MEDIA_ROOT = tmp_path
+        offer = OfferFactory()
+        failing_offer = OfferFactory()
+
+        def fetch(url, headers):
+            if url == failing_offer.url:
+                raise requests.ConnectionError()
+            return SimpleNamespace(status_code=200, content=b"<html></html>", headers={})
+
+        updated = SourceHtmlFetcher(concurrency=2, fetch=fetch).fetch([offer, failing_offer])
+
+        assert updated == [offer]
+        offer.refresh_from_db()
+        failing_offer.refresh_from_db()
+        assert offer.source_html.read() == b"<html></html>"
+        assert not failing_offer.source_html
+
+    def test_unchanged_page_only_updates_last_check(self, settings, tmp_path):
+        settings.MEDIA_ROOT = tmp_path
+        offer = OfferFactory()
+        fetcher = SourceHtmlFetcher(
+            concurrency=1, fetch=lambda url, headers: SimpleNamespace(status_code=200, content=b"page", headers={})
+        )
+        fetcher.fetch([offer])
+        offer.refresh_from_db()
+        source_name, last_check_at = offer.source_html.name, offer.last_check_at
+
+        fetcher.fetch([offer])
+
+        offer.refresh_from_db()
+        assert offer.source_html.name == source_name
+        assert offer.last_check_at > last_check_at
+
+    def test_not_modified_page_is_not_downloaded_again(self, settings, tmp_path):
+        settings.MEDIA_ROOT = tmp_path
+        offer = OfferFactory()
+        requests_headers = []
+
+        def fetch(url, headers):
+            requests_headers.append(headers)
+            if headers.get("If-None-Match") == '"v1"':
+                return SimpleNamespace(status_code=304, content=b"", headers={})
+            return SimpleNamespace(status_code=200, content=b"page", headers={"ETag": '"v1"'})
+
+        fetcher = SourceHtmlFetcher(concurrency=1, fetch=fetch)
+        assert fetcher.fetch([offer]) == [offer]
+        offer.refresh_from_db()
+        source_name = offer.source_html.name
+
+        assert fetcher.fetch([offer]) == []
+
+        offer.refresh_from_db()
+        assert requests_headers == [{}, {"If-None-Match": '"v1"'}]
+        assert offer.source_html.name == source_name
+        assert offer.http_etag == '"v1"'
+
+
+@pytest.mark.django_db
+class TestCollectSourceHtmlGarbage:
+    def test_deletes_old_files_without_offers(self, tmp_path):
+        storage = OfferSourceStorage(location=tmp_path)
+        referenced = storage.save("", ContentFile(b"<html>referenced</html>"))
+        replaced = storage.save("", ContentFile(b"<html>replaced</html>"))
+        OfferFactory(source_html=referenced)
+        now = timezone.now()
+
+        assert collect_source_html_garbage(timedelta(hours=1), now=now, storage=storage) == 0
+        assert collect_source_html_garbage(timedelta(hours=1), now=now + timedelta(hours=2), storage=storage) == 1
+
+        assert list(storage.iter_content_names()) == [referenced]
+        assert not storage.exists(replaced)
@@ -0,0 +1,138 @@
+import pytest
+from django.test import Client
+
+from shargain.commons.application.actor import Actor
+from shargain.offers.application.commands.add_scraping_url import add_scraping_url
+from shargain.offers.application.commands.delete_scraping_url import delete_scraping_url
+from shargain.offers.application.commands.set_scraping_url_active_status import set_scraping_url_active_status
+from shargain.offers.application.commands.toggle_target_active import toggle_target_active
+from shargain.offers.application.commands.update_scraping_url import update_scraping_url
+from shargain.offers.models import ScrapingUrlChange
+from shargain.offers.services.url_sync import ScrapingUrlSyncService
+from shargain.offers.tests.factories import ScrapingUrlFactory, ScrappingTargetFactory
+from shargain.quotas.tests.factories import ScrapingUrlQuotaFactory
+
+
+@pytest.mark.django_db
+class TestScrapingUrlSyncService:
+    def test_get_delta_without_cursor_returns_all_active_urls(self):
+        active_url = ScrapingUrlFactory()
+        ScrapingUrlFactory(is_active=False)
+        ScrapingUrlFactory(scraping_target__is_active=False)
+
+        delta = ScrapingUrlSyncService.get_delta(None)
+
+        assert delta.full
+        assert delta.changed == [active_url]
+
+    def test_get_delta_returns_changes_since_cursor(self):
+        target = ScrappingTargetFactory()
+        ScrapingUrlQuotaFactory(user=target.owner, max_urls=5)
+        actor = Actor(user_id=target.owner_id)
+        kept = ScrapingUrlFactory(scraping_target=target)
+        deactivated = ScrapingUrlFactory(scraping_target=target)
+        deleted = ScrapingUrlFactory(scraping_target=target)
+        ScrapingUrlFactory(scraping_target=target)
+        ScrapingUrlChange.record([kept.id])
+        cursor = ScrapingUrlChange.get_version()
+
+        added = add_scraping_url(actor, "https://www.olx.pl/rowery/", target_id=target.id)
+        update_scraping_url(actor, kept.id, name="Renamed")
+        set_scraping_url_active_status(actor, deactivated.id, target.id, is_active=False)
+        delete_scraping_url(actor, deleted.id)
+        delta = ScrapingUrlSyncService.get_delta(cursor)
+
+        assert not delta.full
+        assert delta.version == ScrapingUrlChange.get_version()
+        assert {scraping_url.id for scraping_url in delta.changed} == {added.id, kept.id}
+        assert delta.removed == sorted([deactivated.id, deleted.id])
+        assert ScrapingUrlSyncService.get_delta(delta.version).changed == []
+
+    def test_get_delta_with_cursor_of_empty_change_log(self):
+        scraping_url = ScrapingUrlFactory()
+        ScrapingUrlChange.record([scraping_url.id])
+
+        delta = ScrapingUrlSyncService.get_delta(0)
+
+        assert not delta.full
+        assert delta.changed == [scraping_url]
+
+    def test_deactivated_target_removes_its_urls(self):
+        scraping_url = ScrapingUrlFactory()
+        cursor = ScrapingUrlChange.get_version()
+
+        toggle_target_active(
+            Actor(user_id=scraping_url.scraping_target.owner_id), scraping_url.scraping_target_id, False
+        )
+
+        assert ScrapingUrlSyncService.get_delta(cursor).removed == [scraping_url.id]
+
+    def test_cascade_deletion_removes_urls(self):
+        scraping_url = ScrapingUrlFactory()
+        cursor = ScrapingUrlChange.get_version()
+
+        scraping_url.scraping_target.owner.delete()
+
+        assert ScrapingUrlSyncService.get_delta(cursor).removed == [scraping_url.id]
+
+    def test_scheduling_is_not_a_change(self):
+        scraping_url = ScrapingUrlFactory()
+        cursor = ScrapingUrlChange.get_version()
+
+        scraping_url.save(update_fields=["next_scrape_at"])
+
+        assert ScrapingUrlChange.get_version() == cursor
+
+    def test_changes_recorded_together_share_version(self):
+        first, second = ScrapingUrlFactory.create_batch(2)
+        cursor = ScrapingUrlChange.get_version()
+
+        ScrapingUrlChange.record([first.id, second.id])
+
+        assert ScrapingUrlChange.get_version() == cursor + 1
+        assert set(ScrapingUrlChange.objects.filter(version=cursor + 1).values_list("scraping_url_id", flat=True)) == {
+            first.id,
+            second.id,
+        }
+
+
+@pytest.mark.django_db
+class TestScrapingUrlSyncView:
+    def test_sync_returns_delta_with_etag(self):
+        scraping_url = ScrapingUrlFactory()
+        ScrapingUrlChange.record([scraping_url.id])
+
+        response = Client().get("/api/scrapping-targets/sync/")
+
+        version = ScrapingUrlChange.get_version()
+        assert response.status_code == 200
+        assert response["ETag"] == f'"{version}"'
+        assert response.json()["version"] == version
+        assert [url["id"] for url in response.json()["changed"]] == [scraping_url.id]
+
+    def test_sync_of_up_to_date_client_is_not_modified(self, django_assert_num_queries):
+        ScrapingUrlChange.record([ScrapingUrlFactory().id])
+        version = ScrapingUrlChange.get_version()
+
+        with django_assert_num_queries(1):
+            response = Client().get(f"/api/scrapping-targets/sync/?cursor={version}", HTTP_IF_NONE_MATCH=f'"{version}"')
+
+        assert response.status_code == 304
+
+    def test_adding_target_url_is_synced(self):
+        scraping_url = ScrapingUrlFactory()
+        version = ScrapingUrlChange.get_version()
+
+        client = Client()
+
+        client.post(
+            f"/api/scrapping-targets/{scraping_url.scraping_target_id}/add-target-url/",
+            {"url": "https://www.olx.pl/rowery/"},
+            content_type="application/json",
+        )
+        response = client.get(f"/api/scrapping-targets/sync/?cursor={version}")
+
+        assert [url["url"] for url in response.json()["changed"]] == ["https://www.olx.pl/rowery/"]
+
+    def test_sync_with_invalid_cursor(self):
+        assert Client().get("/api/scrapping-targets/sync/?cursor=abc").status_code == 400
@@ -1,7 +1,8 @@
 import pytest
 from django.utils import timezone
 
-from shargain.offers.models import Offer, ScrappingTarget
+from shargain.offers.models import Offer, ScrappingTarget, normalize_scrape_url
+from shargain.offers.tests.factories import ScrapingUrlFactory
 
 
 @pytest.fixture
@@ -36,3 +37,35 @@ def test_create_offer_without_list_url(offer_data):
     offer = Offer.objects.create(**offer_data)
 
     assert offer.list_url == ""
+
+
+@pytest.mark.parametrize(
+    ("url", "normalized_url"),
+    [
+        ("https://www.olx.pl/rowery/krakow/", "https://www.olx.pl/rowery/krakow/"),
+        ("HTTPS://WWW.OLX.PL:443/rowery/krakow/#top", "https://www.olx.pl/rowery/krakow/"),
+        (
+            "https://www.olx.pl/rowery/?search%5Border%5D=created_at&page=&a=1",
+            "https://www.olx.pl/rowery/?a=1&search%5Border%5D=created_at",
+        ),
+        ("https://www.otodom.pl", "https://www.otodom.pl/"),
+    ],
+)
+def test_normalize_scrape_url(url, normalized_url):
+    assert normalize_scrape_url(url) == normalized_url
+
+
+@pytest.mark.django_db
+def test_scraping_urls_of_the_same_list_share_scrape_source():
+    first = ScrapingUrlFactory(url="https://www.olx.pl/rowery/?b=2&a=1")
+    second = ScrapingUrlFactory(url="https://www.olx.pl/rowery/?a=1&b=2#offers")
+    other = ScrapingUrlFactory(url="https://www.olx.pl/rowery/?a=1")
+
+    assert first.source == second.source
+    assert other.source != first.source
+
+    other.url = "https://www.olx.pl/rowery/?a=1&b=2"
+    other.save(update_fields=["url"])
+
+    other.refresh_from_db()
+    assert other.source == first.source
@@ -0,0 +1,61 @@
+import gzip
+import os
+
+import pytest
+from django.core.files.base import ContentFile
+
+from shargain.offers.storages import OfferSourceStorage
+
+PAGE = b"<html><body>" + b"<div>offer</div>" * 100 + b"</body></html>"
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return OfferSourceStorage(location=tmp_path)
+
+
+class TestOfferSourceStorage:
+    def test_save_compresses_content_under_content_hash(self, storage, tmp_path):
+        name = storage.save("offer.html", ContentFile(PAGE))
+
+        assert name == OfferSourceStorage.get_content_name(PAGE)
+        stored = (tmp_path / name).read_bytes()
+        assert len(stored) < len(PAGE)
+        assert gzip.decompress(stored) == PAGE
+
+    def test_save_deduplicates_identical_content(self, storage, tmp_path):
+        first = storage.save("first.html", ContentFile(PAGE))
+        second = storage.save("second.html", ContentFile(PAGE))
+
+        assert first == second
+        assert len(list(tmp_path.rglob("*.gz"))) == 1
+
+    def test_open_decompresses_content(self, storage):
+        name = storage.save("offer.html", ContentFile(PAGE))
+
+        with storage.open(name) as file:
+            assert file.read(12) == b"<html><body>"
+            assert file.read() == PAGE[12:]
+
+    def test_open_reads_legacy_uncompressed_file(self, storage, tmp_path):
+        (tmp_path / "offer_sources").mkdir()
+        (tmp_path / "offer_sources" / "legacy.html").write_bytes(PAGE)
+
+        with storage.open("offer_sources/legacy.html") as file:
+            assert file.read() == PAGE
+
+    def test_save_of_stored_content_touches_its_file(self, storage, tmp_path):
+        name = storage.save("offer.html", ContentFile(PAGE))
+        os.utime(tmp_path / name, (0, 0))
+
+        storage.save("offer.html", ContentFile(PAGE))
+
+        assert (tmp_path / name).stat().st_mtime > 0
+
+    def test_iter_and_delete_content(self, storage):
+        names = sorted(storage.save("offer.html", ContentFile(PAGE + bytes([i]))) for i in range(3))
+
+        assert list(storage.iter_content_names()) == names
+        storage.delete(names[0])
+        storage.delete_content(names[1])
+        assert list(storage.iter_content_names()) == [names[0], names[2]]
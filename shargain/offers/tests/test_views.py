@@ -0,0 +1,57 @@
+import pytest
+from django.test import Client
+
+from shargain.offers.tests.factories import ScrapingUrlFactory, ScrappingTargetFactory
+
+
+@pytest.mark.django_db
+class TestScrappingTargetViewSet:
+    @pytest.mark.parametrize("targets_count", [1, 10])
+    def test_list_runs_constant_number_of_queries(self, targets_count, django_assert_num_queries):
+        for _ in range(targets_count):
+            ScrapingUrlFactory.create_batch(2, scraping_target=ScrappingTargetFactory())
+
+        # count, targets and prefetched URLs
+        with django_assert_num_queries(3):
+            response = Client().get("/api/scrapping-targets/?include_inactive_urls=false")
+
+        assert response.json()["count"] == targets_count
+
+    def test_list_filters_urls(self):
+        target = ScrappingTargetFactory()
+        active_url = ScrapingUrlFactory(scraping_target=target, url="https://www.olx.pl/a/")
+        inactive_url = ScrapingUrlFactory(scraping_target=target, url="https://www.olx.pl/b/", is_active=False)
+        ScrapingUrlFactory(scraping_target=ScrappingTargetFactory(), url="https://www.olx.pl/c/", is_active=False)
+        ScrapingUrlFactory(scraping_target=ScrappingTargetFactory(), url="https://www.otomoto.pl/d/")
+        client = Client()
+
+        active = client.get("/api/scrapping-targets/?include_inactive_urls=false&domain=olx").json()
+        everything = client.get("/api/scrapping-targets/?include_inactive_urls=true&domain=olx").json()
+
+        assert [(result["id"], result["urls"]) for result in active["results"]] == [(target.id, [active_url.url])]
+        assert everything["count"] == 2
+        assert everything["results"][0]["urls"] == [active_url.url, inactive_url.url]
+
+    def test_list_is_cached_until_url_changes(self, django_assert_num_queries):
+        scraping_url = ScrapingUrlFactory()
+        client = Client()
+        client.get("/api/scrapping-targets/?include_inactive_urls=false")
+
+        with django_assert_num_queries(0):
+            cached = client.get("/api/scrapping-targets/?include_inactive_urls=false")
+        scraping_url.is_active = False
+        scraping_url.save(update_fields=["is_active"])
+        response = client.get("/api/scrapping-targets/?include_inactive_urls=false")
+
+        assert cached.json()["count"] == 1
+        assert response.json()["count"] == 0
+
+    def test_list_is_not_invalidated_by_scheduling(self, django_assert_num_queries):
+        scraping_url = ScrapingUrlFactory()
+        client = Client()
+        client.get("/api/scrapping-targets/")
+
+        scraping_url.save(update_fields=["next_scrape_at"])
+
+        with django_assert_num_queries(0):
+            client.get("/api/scrapping-targets/")
@@ -1,18 +1,23 @@
+from django.db.models import Prefetch
 from django_filters import rest_framework as filters
-from rest_framework import mixins, viewsets
+from rest_framework import mixins, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from shargain.offers.caches import ScrappingTargetListCache
 from shargain.offers.filters import ScrappingTargetFilterSet
-from shargain.offers.models import Offer, ScrappingTarget
+from shargain.offers.models import Offer, ScrapingUrl, ScrapingUrlChange, ScrappingTarget
 from shargain.offers.serializers import (
     AddTargetUrlSerializer,
     OfferSerializer,
+    ScrapingUrlSyncQuerySerializer,
     ScrappingTargetSerializer,
+    SyncScrapingUrlSerializer,
 )
 from shargain.offers.services import OfferBatchCreateService
+from shargain.offers.services.url_sync import ScrapingUrlSyncService
 
 
 class OfferViewSet(viewsets.ModelViewSet):
@@ -49,10 +54,28 @@ class ScrappingTargetViewSet(mixins.CreateModelMixin, viewsets.ReadOnlyModelView
     def get_serializer_class(self):
         if self.action == "add_target_url":
             return AddTargetUrlSerializer
+        if self.action == "sync":
+            return SyncScrapingUrlSerializer
         return super().get_serializer_class()
 
     def get_queryset(self):
-        return super().get_queryset().distinct()
+        scraping_urls = ScrapingUrl.objects.order_by("id")
+        if self.request.query_params.get("include_inactive_urls") != "true":
+            scraping_urls = scraping_urls.filter(is_active=True)
+        return (
+            super()
+            .get_queryset()
+            .order_by("id")
+            .prefetch_related(Prefetch("scrapingurl_set", queryset=scraping_urls, to_attr="listed_scraping_urls"))
+        )
+
+    def list(self, request, *args, **kwargs):
+        uri = request.build_absolute_uri()
+        if (data := ScrappingTargetListCache.get(uri)) is not None:
+            return Response(data)
+        response = super().list(request, *args, **kwargs)
+        ScrappingTargetListCache.set(uri, response.data)
+        return response
 
     @action(methods=["POST"], detail=True, url_path="add-target-url")
     def add_target_url(self, request, pk=None):
@@ -62,6 +85,28 @@ class ScrappingTargetViewSet(mixins.CreateModelMixin, viewsets.ReadOnlyModelView
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         obj = self.get_object()
-        obj.url = serializer.validated_data["url"]
-        obj.save(update_fields=["url"])
-        return Response(ScrappingTargetSerializer(obj).data)
+        ScrapingUrl.objects.create(url=serializer.validated_data["url"], scraping_target=obj, name="")
+        return Response(ScrappingTargetSerializer(obj, context=self.get_serializer_context()).data)
+
+    @action(methods=["GET"], detail=False)
+    def sync(self, request):
+        """
+        Action which returns scraping URLs added, changed or removed since the version given as ?cursor=
+        (all active URLs without it). The response carries the current version as ETag, so polls with
+        If-None-Match of an up to date client are answered with 304.
+        """
+        query_serializer = ScrapingUrlSyncQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+        version = ScrapingUrlChange.get_version()
+        etag = f'"{version}"'
+        if request.headers.get("If-None-Match") == etag:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        delta = ScrapingUrlSyncService.get_delta(query_serializer.validated_data.get("cursor"), version=version)
+        data = {
+            "version": delta.version,
+            "full": delta.full,
+            "changed": self.get_serializer(delta.changed, many=True).data,
+            "removed": delta.removed,
+        }
+        return Response(data, headers={"ETag": etag})
@@ -0,0 +1,46 @@
+"""
+Compares the fast (byte scanning) and the full (BeautifulSoup) OLX page parsing.
+
+Usage: python -m shargain.parsers.benchmark [PAGE ...]
+
+Without arguments, the pages used by the parser tests are benchmarked.
+"""
+
+import sys
+import timeit
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from shargain.parsers.olx import OlxOffer, extract_prerendered_state, is_offer_removed
+
+DEFAULT_PAGES_DIR = Path(__file__).parent / "tests" / "pages"
+
+
+def full_parse(content: bytes):
+    soup = BeautifulSoup(content, "html.parser")
+    return OlxOffer.from_soup(soup), bool(soup.select("#offer_removed_by_user"))
+
+
+def fast_parse(content: bytes):
+    return extract_prerendered_state(content), is_offer_removed(content)
+
+
+def benchmark(path: Path, number: int = 20) -> tuple[float, float]:
+    content = path.read_bytes()
+    full = min(timeit.repeat(lambda: full_parse(content), number=number, repeat=3)) / number
+    fast = min(timeit.repeat(lambda: fast_parse(content), number=number, repeat=3)) / number
+    return full, fast
+
+
+def main(paths: list[Path]):
+    print(f"{'page':<40} {'size':>8} {'full [ms]':>10} {'fast [ms]':>10} {'speedup':>8}")
+    for path in paths:
+        full, fast = benchmark(path)
+        print(
+            f"{path.name:<40} {path.stat().st_size:>8} {full * 1000:>10.3f} {fast * 1000:>10.3f} {full / fast:>7.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main([Path(arg) for arg in sys.argv[1:]] or sorted(DEFAULT_PAGES_DIR.glob("*.html")))
@@ -0,0 +1,165 @@
+"""
+Detection of closed offers from their pages.
+
+Every supported site has a ``ClosureDetector`` registered for its exact domains (netlocs). A detector declares
+the cheapest ``FetchStrategy`` which is enough to tell whether an offer is closed, so that the checker downloads
+only as much of the page as the site needs.
+
+This module doesn't depend on Django. Pages are passed as ``FetchedPage`` objects, which the offer checker sends to
+the parsing queue (see ``shargain.offers.services.closure_detection``).
+"""
+
+import abc
+import dataclasses
+import enum
+import logging
+import re
+from urllib.parse import urlparse
+
+from shargain.parsers.olx import OlxOffer, is_offer_removed
+
+logger = logging.getLogger(__name__)
+
+TITLE_RE = re.compile(rb"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+
+
+class FetchStrategy(enum.Enum):
+    STATUS = "status"
+    """Only the status code is needed, redirects are not followed and the body is not downloaded"""
+    REDIRECT = "redirect"
+    """Redirects are followed and the final URL (and status code) is needed, the body is not downloaded"""
+    PARTIAL = "partial"
+    """The first ``ClosureDetector.partial_size`` bytes of the body are needed"""
+    FULL = "full"
+    """The whole page is needed"""
+
+
+@dataclasses.dataclass(frozen=True)
+class FetchedPage:
+    url: str
+    """URL of the offer"""
+    final_url: str
+    """URL of the page after following redirects"""
+    status_code: int
+    content: bytes
+    """Downloaded part of the body, empty for strategies which don't need it"""
+
+    @classmethod
+    def from_response(cls, url: str, response) -> "FetchedPage":
+        return cls(url=url, final_url=response.url, status_code=response.status_code, content=response.content)
+
+
+class ClosureDetector(abc.ABC):
+    domains: tuple[str, ...] = ()
+    strategy: FetchStrategy = FetchStrategy.FULL
+    partial_size: int = 64 * 1024
+
+    @abc.abstractmethod
+    def is_closed(self, page: FetchedPage) -> bool:
+        """Checks whether the page, fetched according to the detector's strategy, belongs to a closed offer."""
+
+    def is_source_closed(self, url: str, content: bytes) -> bool:
+        """Checks whether the stored (complete) source HTML of the offer belongs to a closed offer."""
+        return self.is_closed(FetchedPage(url=url, final_url=url, status_code=200, content=content))
+
+
+CLOSURE_DETECTORS: dict[str, ClosureDetector] = {}
+
+
+def register_closure_detector(detector_class: type[ClosureDetector]) -> type[ClosureDetector]:
+    detector = detector_class()
+    for domain in detector_class.domains:
+        CLOSURE_DETECTORS[domain] = detector
+    return detector_class
+
+
+def get_closure_detector(url: str) -> ClosureDetector | None:
+    return CLOSURE_DETECTORS.get(urlparse(url).netloc)
+
+
+@register_closure_detector
+class OlxClosureDetector(ClosureDetector):
+    """
+    Closed OLX offers either redirect to a list with ``#from404`` or show the "removed by user" box. The box can
+    be anywhere in the page, so the whole page is needed.
+    """
+
+    domains = ("www.olx.pl", "olx.pl", "m.olx.pl")
+    strategy = FetchStrategy.FULL
+
+    def is_closed(self, page: FetchedPage) -> bool:
+        return page.final_url.endswith("#from404") or is_offer_removed(page.content)
+
+    def is_source_closed(self, url: str, content: bytes) -> bool:
+        return not OlxOffer.from_content(content).is_active
+
+
+@register_closure_detector
+class OtomotoClosureDetector(ClosureDetector):
+    """
+    Closed Otomoto offers respond with 404 (possibly after redirects) or redirect to a listing, i.e. a page which
+    is not an offer page.
+    """
+
+    domains = ("www.otomoto.pl", "otomoto.pl")
+    strategy = FetchStrategy.REDIRECT
+    NOT_FOUND_TITLE = "Nie znaleziono strony"
+    OFFER_PATH_RE = re.compile(r"/oferta/")
+
+    def is_closed(self, page: FetchedPage) -> bool:
+        if page.status_code in (404, 410):
+            return True
+        return is_redirected(page) and not self.OFFER_PATH_RE.search(urlparse(page.final_url).path)
+
+    def is_source_closed(self, url: str, content: bytes) -> bool:
+        title = TITLE_RE.search(content)
+        return title is not None and self.NOT_FOUND_TITLE in title.group(1).decode(errors="replace")
+
+
+@register_closure_detector
+class OtodomClosureDetector(ClosureDetector):
+    """
+    Closed Otodom offers respond with 404/410 or redirect to search results. Other redirects (e.g. to a canonical
+    slug or another locale of the offer) keep the offer open.
+    """
+
+    domains = ("www.otodom.pl", "otodom.pl")
+    strategy = FetchStrategy.REDIRECT
+    SEARCH_PATH_RE = re.compile(r"^(/[a-z]{2})?/(wyniki|results)(/|$)")
+
+    def is_closed(self, page: FetchedPage) -> bool:
+        if page.status_code in (404, 410):
+            return True
+        return is_redirected(page) and bool(self.SEARCH_PATH_RE.match(urlparse(page.final_url).path))
+
+
+def is_redirected(page: FetchedPage) -> bool:
+    return bool(page.final_url) and page.final_url != page.url
+
+
+def is_page_of_closed_offer(page: FetchedPage) -> bool:
+    if (detector := get_closure_detector(page.url)) is None:
+        return False
+    return detector.is_closed(page)
+
+
+def is_source_of_closed_offer(url: str, content: bytes) -> bool | None:
+    """
+    Checks whether a stored source HTML of the offer is a page of closed offer.
+    Returns None if the offer's domain is not supported.
+    """
+    if (detector := get_closure_detector(url)) is None:
+        return None
+    return detector.is_source_closed(url, content)
+
+
+def detect_closed_batch(pages: list[FetchedPage]) -> list[bool | None]:
+    """Runs closure detection for a batch of pages. None means that the page couldn't be parsed."""
+    results: list[bool | None] = []
+    for page in pages:
+        try:
+            results.append(is_page_of_closed_offer(page))
+        except Exception:
+            logger.exception("Couldn't check if offer is closed [url=%s]", page.url)
+            results.append(None)
+    return results
@@ -1,4 +1,6 @@
 import json
+import logging
+import re
 from dataclasses import dataclass
 from typing import Any
 
@@ -6,6 +8,65 @@ import requests
 from bs4 import BeautifulSoup
 from requests import Response
 
+logger = logging.getLogger(__name__)
+
+INIT_CONFIG_SCRIPT_RE = re.compile(rb"""id=["']?olx-init-config\b[^>]*>""")
+PRERENDERED_STATE_MARKER = b"window.__PRERENDERED_STATE__"
+SCRIPT_END = b"</script>"
+OFFER_REMOVED_MARKER = b"offer_removed_by_user"
+OFFER_REMOVED_ELEMENT_RE = re.compile(rb"""<[a-zA-Z][^<>]*\bid=["']?offer_removed_by_user\b""")
+
+_json_decoder = json.JSONDecoder()
+
+
+def _as_bytes(content: bytes | str) -> bytes:
+    return content.encode() if isinstance(content, str) else content
+
+
+def extract_prerendered_state(content: bytes | str) -> dict[str, Any] | None:
+    """
+    Extracts ``window.__PRERENDERED_STATE__`` from the ``#olx-init-config`` script by scanning raw bytes.
+    Scanning stops at the end of the script tag, so the rest of the page is never decoded or parsed.
+
+    :return: prerendered state or None if it couldn't be found (the caller should fall back to the full parse)
+    """
+    content = _as_bytes(content)
+    if not (script := INIT_CONFIG_SCRIPT_RE.search(content)):
+        return None
+    script_end = content.find(SCRIPT_END, script.end())
+    if script_end == -1:
+        return None
+    return decode_prerendered_state(content[script.end() : script_end])
+
+
+def decode_prerendered_state(script: bytes | str) -> dict[str, Any] | None:
+    """Decodes the (JSON encoded) string assigned to ``window.__PRERENDERED_STATE__`` in the script's code."""
+    script = _as_bytes(script)
+    if (marker := script.find(PRERENDERED_STATE_MARKER)) == -1:
+        return None
+    if (assignment := script.find(b"=", marker + len(PRERENDERED_STATE_MARKER))) == -1:
+        return None
+    try:
+        value, _ = _json_decoder.raw_decode(script[assignment + 1 :].decode().lstrip())
+        state = json.loads(value) if isinstance(value, str) else value
+    except (UnicodeDecodeError, ValueError):
+        return None
+    return state if isinstance(state, dict) else None
+
+
+def is_offer_removed(content: bytes | str) -> bool:
+    """
+    Checks whether the page contains the ``#offer_removed_by_user`` element. The full parse is used only when
+    the marker is present but doesn't look like an element's id (e.g. it's mentioned in a script).
+    """
+    content = _as_bytes(content)
+    if OFFER_REMOVED_MARKER not in content:
+        return False
+    if OFFER_REMOVED_ELEMENT_RE.search(content):
+        return True
+    logger.info("Falling back to full parse to find removed offer marker")
+    return bool(BeautifulSoup(content, "html.parser").select("#offer_removed_by_user"))
+
 
 @dataclass
 class OlxOffer:
@@ -17,7 +78,16 @@ class OlxOffer:
 
     @classmethod
     def from_content(cls, content):
-        soup = BeautifulSoup(content, "html.parser")
+        if (state := extract_prerendered_state(content)) is not None:
+            return cls(state)
+        logger.info("Falling back to full parse to extract prerendered state")
+        return cls.from_soup(BeautifulSoup(content, "html.parser"))
+
+    @classmethod
+    def from_soup(cls, soup: BeautifulSoup):
+        script = cls.get_script_tag(soup)
+        if (state := decode_prerendered_state(script.string)) is not None:
+            return cls(state)
         parsed_prerendered_state = cls.get_parsed_prerendered_state(soup)
         return cls(json.loads(parsed_prerendered_state))
 
@@ -0,0 +1,81 @@
+import pytest
+
+from shargain.parsers.closure import (
+    FetchedPage,
+    FetchStrategy,
+    detect_closed_batch,
+    get_closure_detector,
+    is_source_of_closed_offer,
+)
+from shargain.parsers.tests.test_olx import read_page
+
+
+def _page(url, content=b"", status_code=200, final_url=None):
+    return FetchedPage(url=url, final_url=final_url or url, status_code=status_code, content=content)
+
+
+def test_detect_closed_batch():
+    pages = [
+        _page("https://www.olx.pl/d/oferta/a.html", read_page("olx_active_offer")),
+        _page("https://www.olx.pl/d/oferta/b.html", read_page("olx_removed_offer")),
+        _page("https://www.olx.pl/d/oferta/c.html", final_url="https://www.olx.pl/oferty/#from404"),
+        _page("https://www.otomoto.pl/oferta/d.html", status_code=404),
+        _page("https://www.otodom.pl/pl/oferta/e", final_url="https://www.otodom.pl/pl/wyniki/sprzedaz/mieszkanie"),
+        _page("https://www.otodom.pl/pl/oferta/f"),
+        _page("https://example.com/g"),
+    ]
+
+    assert detect_closed_batch(pages) == [False, True, True, True, True, False, False]
+
+
+@pytest.mark.parametrize(
+    ("url", "final_url", "status_code", "expected"),
+    [
+        ("https://www.otomoto.pl/osobowe/oferta/a.html", None, 200, False),
+        ("https://www.otomoto.pl/osobowe/oferta/a.html", "https://www.otomoto.pl/osobowe/oferta/a.html", 404, True),
+        ("https://www.otomoto.pl/osobowe/oferta/a.html", "https://www.otomoto.pl/osobowe/audi/a4", 200, True),
+        (
+            "https://www.otomoto.pl/osobowe/oferta/a.html",
+            "https://www.otomoto.pl/osobowe/oferta/a-new.html",
+            200,
+            False,
+        ),
+        ("https://www.otodom.pl/pl/oferta/b", "https://www.otodom.pl/pl/oferta/b/", 200, False),
+        ("https://www.otodom.pl/pl/oferta/b", "https://www.otodom.pl/en/oferta/b", 200, False),
+        ("https://www.otodom.pl/pl/oferta/b", "https://www.otodom.pl/pl/oferta/b-canonical-ID1", 200, False),
+        ("https://www.otodom.pl/pl/oferta/b", "https://www.otodom.pl/en/results/sale/flat", 200, True),
+        ("https://www.otodom.pl/pl/oferta/b", "https://www.otodom.pl/pl/oferta/b", 410, True),
+    ],
+)
+def test_redirect_closure_detection(url, final_url, status_code, expected):
+    assert detect_closed_batch([_page(url, status_code=status_code, final_url=final_url)]) == [expected]
+
+
+@pytest.mark.parametrize(
+    ("url", "strategy"),
+    [
+        ("https://www.olx.pl/d/oferta/a.html", FetchStrategy.FULL),
+        ("https://m.olx.pl/d/oferta/a.html", FetchStrategy.FULL),
+        ("https://www.otomoto.pl/oferta/b.html", FetchStrategy.REDIRECT),
+        ("https://www.otodom.pl/pl/oferta/c", FetchStrategy.REDIRECT),
+        ("https://notolx.pl/d/oferta/d.html", None),
+    ],
+)
+def test_get_closure_detector(url, strategy):
+    detector = get_closure_detector(url)
+
+    assert (detector and detector.strategy) == strategy
+
+
+@pytest.mark.parametrize(
+    ("url", "content", "expected"),
+    [
+        ("https://www.olx.pl/d/oferta/a.html", read_page("olx_active_offer"), False),
+        ("https://www.olx.pl/d/oferta/b.html", read_page("olx_inactive_offer"), True),
+        ("https://www.otomoto.pl/oferta/c.html", b"<html><title>Nie znaleziono strony</title></html>", True),
+        ("https://www.otomoto.pl/oferta/d.html", b"<html><title>Audi A4</title></html>", False),
+        ("https://example.com/e", b"<html></html>", None),
+    ],
+)
+def test_is_source_of_closed_offer(url, content, expected):
+    assert is_source_of_closed_offer(url, content) is expected
@@ -0,0 +1,64 @@
+import json
+from pathlib import Path
+
+import pytest
+from bs4 import BeautifulSoup
+
+from shargain.parsers.olx import OlxOffer, extract_prerendered_state, is_offer_removed
+
+PAGES_DIR = Path(__file__).parent / "pages"
+PAGES = sorted(path.stem for path in PAGES_DIR.glob("*.html"))
+
+
+def read_page(name: str) -> bytes:
+    return (PAGES_DIR / f"{name}.html").read_bytes()
+
+
+def read_golden_state(name: str):
+    return json.loads((PAGES_DIR / f"{name}.json").read_text())
+
+
+@pytest.mark.parametrize("page", PAGES)
+def test_extract_prerendered_state_matches_golden_file(page):
+    assert extract_prerendered_state(read_page(page)) == read_golden_state(page)
+
+
+@pytest.mark.parametrize("page", PAGES)
+def test_fast_path_and_full_parse_agree(page):
+    content = read_page(page)
+
+    fast = OlxOffer.from_content(content)
+    full = OlxOffer.from_soup(BeautifulSoup(content, "html.parser"))
+
+    assert (fast.title, fast.price, fast.photos, fast.is_active) == (
+        full.title,
+        full.price,
+        full.photos,
+        full.is_active,
+    )
+
+
+@pytest.mark.parametrize(
+    ("page", "expected"),
+    [
+        ("olx_active_offer", False),
+        ("olx_inactive_offer", False),
+        ("olx_removed_offer", True),
+        ("olx_removed_marker_in_script", False),
+    ],
+)
+def test_is_offer_removed(page, expected):
+    assert is_offer_removed(read_page(page)) is expected
+
+
+def test_extract_prerendered_state_returns_none_without_script():
+    assert extract_prerendered_state(b"<html><body><div id='offer'></div></body></html>") is None
+
+
+def test_from_content_falls_back_to_full_parse(monkeypatch):
+    content = read_page("olx_active_offer")
+    monkeypatch.setattr("shargain.parsers.olx.extract_prerendered_state", lambda content: None)
+
+    offer = OlxOffer.from_content(content)
+
+    assert offer.title == read_golden_state("olx_active_offer")["ad"]["ad"]["title"]
@@ -43,15 +43,19 @@ from shargain.offers.application.commands.update_scraping_url import update_scra
 from shargain.offers.application.dto import WaypointData
 from shargain.offers.application.exceptions import (
     ApplicationException,
+    InvalidCursor,
     QuotaExceeded,
     ScrapingUrlDoesNotExist,
     TargetDoesNotExist,
 )
+from shargain.offers.application.queries.get_checkin_stats import get_checkin_stats
 from shargain.offers.application.queries.get_target import (
     get_target,
     get_target_by_user,
 )
+from shargain.offers.application.queries.list_target_offers import OfferStatus, list_target_offers
 from shargain.offers.application.queries.list_targets import list_targets
+from shargain.offers.models import RollupPeriod
 from shargain.offers.schemas.offer_filter import validate_filters
 from shargain.quotas.services.quota import QuotaService
 from shargain.telegram.application.commands.generate_telegram_token import (
@@ -158,6 +162,8 @@ class ScrapingUrlResponse(BaseSchema):
     name: str
     is_active: bool
     last_checked_at: str | None = None
+    last_offers_count: int | None = None
+    last_new_offers_count: int | None = None
     filters: FiltersConfigSchema | None = None
     show_location_map_in_notifications: bool = False
     waypoints: list[WaypointSchema] | None = None
@@ -172,6 +178,31 @@ class TargetResponse(BaseSchema):
     urls: list[ScrapingUrlResponse]
 
 
+class CheckinStatsResponse(BaseSchema):
+    bucket_start: str
+    checkins_count: int
+    offers_count: int
+    new_offers_count: int
+    max_gap_seconds: float | None = None
+
+
+class OfferResponse(BaseSchema):
+    id: int
+    url: str
+    title: str
+    price: int | None = None
+    main_image_url: str
+    list_url: str
+    created_at: str
+    published_at: str | None = None
+    closed_at: str | None = None
+
+
+class OfferPageResponse(BaseSchema):
+    offers: list[OfferResponse]
+    next_cursor: str | None = None
+
+
 class ToggleNotificationsRequest(BaseSchema):
     enable: bool | None = None
 
@@ -381,6 +412,49 @@ def update_scraping_url_view(request: HttpRequest, target_id: int, url_id: int,
         raise HttpError(404, "Scraping URL not found") from exc
 
 
+@router.get(
+    "/targets/{target_id}/urls/{url_id}/checkin-stats",
+    operation_id="get_checkin_stats",
+    by_alias=True,
+    response={200: list[CheckinStatsResponse], 404: ErrorSchema},
+)
+def get_checkin_stats_endpoint(
+    request: HttpRequest, target_id: int, url_id: int, period: RollupPeriod = RollupPeriod.HOUR, days: int = 7
+):
+    """Checkins of the scraping URL aggregated per hour or day."""
+    actor = get_actor(request)
+    try:
+        return get_checkin_stats(actor, target_id, url_id, period=period, days=min(max(days, 1), 365))
+    except ScrapingUrlDoesNotExist as e:
+        raise HttpError(404, "Scraping url not found") from e
+
+
+@router.get(
+    "/targets/{target_id}/offers",
+    operation_id="list_target_offers",
+    by_alias=True,
+    response={200: OfferPageResponse, 400: ErrorSchema, 404: ErrorSchema},
+)
+def list_target_offers_endpoint(
+    request: HttpRequest,
+    target_id: int,
+    cursor: str | None = None,
+    limit: int = 50,
+    list_url: str | None = None,
+    status: OfferStatus | None = None,
+):
+    """Offers of the target, newest first. Pass ``nextCursor`` of a page as ``cursor`` to get the next one."""
+    actor = get_actor(request)
+    try:
+        return list_target_offers(
+            actor, target_id, cursor=cursor, limit=min(max(limit, 1), 100), list_url=list_url, status=status
+        )
+    except TargetDoesNotExist as e:
+        raise HttpError(404, "Target not found") from e
+    except InvalidCursor as e:
+        raise HttpError(400, str(e)) from e
+
+
 @router.post(
     "/targets/{target_id}/urls/{url_id}/activate",
     operation_id="activate_scraping_url",
@@ -0,0 +1,43 @@
+import pytest
+from django.test import Client
+
+from shargain.accounts.tests.factories import UserFactory
+from shargain.offers.tests.factories import OfferFactory, ScrappingTargetFactory
+
+
+class TestTargetOffersEndpoint:
+    pytestmark = pytest.mark.django_db
+
+    def test_returns_pages_of_offers(self):
+        user = UserFactory()
+        target = ScrappingTargetFactory(owner=user)
+        offers = OfferFactory.create_batch(3, target=target)
+        client = Client()
+        client.force_login(user)
+
+        first_page = client.get(f"/api/public/targets/{target.id}/offers?limit=2").json()
+        second_page = client.get(
+            f"/api/public/targets/{target.id}/offers", {"limit": 2, "cursor": first_page["nextCursor"]}
+        ).json()
+
+        assert [offer["id"] for offer in first_page["offers"]] == [offers[2].id, offers[1].id]
+        assert [offer["id"] for offer in second_page["offers"]] == [offers[0].id]
+        assert second_page["nextCursor"] is None
+        assert {"listUrl", "createdAt", "closedAt"} <= first_page["offers"][0].keys()
+
+    def test_returns_404_for_other_users_target(self):
+        client = Client()
+        client.force_login(UserFactory())
+
+        response = client.get(f"/api/public/targets/{ScrappingTargetFactory().id}/offers")
+
+        assert response.status_code == 404
+
+    def test_returns_400_for_invalid_cursor(self):
+        user = UserFactory()
+        client = Client()
+        client.force_login(user)
+
+        response = client.get(f"/api/public/targets/{ScrappingTargetFactory(owner=user).id}/offers?cursor=abc")
+
+        assert response.status_code == 400
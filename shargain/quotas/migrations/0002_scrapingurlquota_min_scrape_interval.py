@@ -0,0 +1,22 @@
+# Generated by Django 4.1.4 on 2026-10-19 15:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("quotas", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="scrapingurlquota",
+            name="min_scrape_interval",
+            field=models.DurationField(
+                blank=True,
+                help_text="Minimal interval between scrapes of the user's URLs; empty means no plan limit",
+                null=True,
+                verbose_name="Minimal scrape interval",
+            ),
+        ),
+    ]
@@ -35,6 +35,12 @@ class OfferQuota(TimeStampedModel):
 class ScrapingUrlQuota(TimeStampedModel):
     user = models.OneToOneField(CustomUser, on_delete=models.CASCADE, related_name="scraping_url_quota")
     max_urls = models.PositiveIntegerField()
+    min_scrape_interval = models.DurationField(
+        _("Minimal scrape interval"),
+        help_text=_("Minimal interval between scrapes of the user's URLs; empty means no plan limit"),
+        blank=True,
+        null=True,
+    )
 
     class Meta:
         verbose_name = _("Scraping URL quota")
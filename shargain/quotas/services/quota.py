@@ -5,6 +5,7 @@ from django.conf import settings
 from django.db.models import F
 from django.utils import timezone
 
+from shargain.accounts.models import CustomUser
 from shargain.offers.models import ScrapingUrl, ScrappingTarget
 from shargain.quotas.models import OfferQuota, ScrapingUrlQuota
 
@@ -80,10 +81,26 @@ class QuotaService:
     def _get_or_create_url_quota(user_id: int) -> ScrapingUrlQuota:
         quota, _ = ScrapingUrlQuota.objects.get_or_create(
             user_id=user_id,
-            defaults={"max_urls": settings.QUOTA_FREE_TIER_MAX_URLS},
+            defaults={
+                "max_urls": settings.QUOTA_FREE_TIER_MAX_URLS,
+                "min_scrape_interval": settings.QUOTA_FREE_TIER_MIN_SCRAPE_INTERVAL,
+            },
         )
         return quota
 
+    @staticmethod
+    def get_min_scrape_interval(user: CustomUser | None) -> timedelta | None:
+        """
+        Returns the minimal interval between scrapes allowed by the user's plan. Users without URL quota are on
+        the free tier. Targets without owner have no plan limit.
+        """
+        if user is None:
+            return None
+        try:
+            return user.scraping_url_quota.min_scrape_interval
+        except ScrapingUrlQuota.DoesNotExist:
+            return settings.QUOTA_FREE_TIER_MIN_SCRAPE_INTERVAL
+
     @staticmethod
     def check_can_create_offers(user_id: int, target_id: int) -> bool:
         quota = QuotaService._get_or_create_active_offer_quota(user_id=user_id, target_id=target_id)
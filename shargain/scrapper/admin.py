@@ -0,0 +1,9 @@
+from django.contrib import admin
+
+from shargain.scrapper.models import ScraperNode
+
+
+@admin.register(ScraperNode)
+class ScraperNodeAdmin(admin.ModelAdmin):
+    list_display = ("name", "last_heartbeat_at")
+    search_fields = ("name",)
@@ -1,6 +1,26 @@
-import djclick
+import djclick as click
+from django.conf import settings
 
+from shargain.scrapper.services.engine import ScrapingEngine, ScrapingStats
 
-@djclick.command()
-def main():
-    print("Sztos")
+
+def echo_stats(stats: ScrapingStats):
+    click.echo(
+        f"Scraped {stats.fetched}/{stats.urls} list pages in {stats.duration:.1f}s "
+        f"({stats.pages_per_second:.1f} pages/s, {stats.offers_per_second:.1f} offers/s): "
+        f"{stats.offers} offers, {stats.new_offers} new, {stats.errors} errors, {stats.unsupported} unsupported URLs"
+    )
+
+
+@click.command()
+@click.option("--workers", type=int, default=None, help="Number of list pages downloaded at once")
+@click.option("--once/--loop", default=True, help="Run a single scraping round or keep scraping")
+@click.option("--interval", type=float, default=None, help="Seconds between starts of scraping rounds in loop mode")
+@click.option("--node", default=None, help="Name of the scraper node; only URLs of its shard are scraped")
+def main(workers: int | None, once: bool, interval: float | None, node: str | None):
+    """Scrapes list pages of active scraping URLs and saves new offers."""
+    engine = ScrapingEngine.from_settings(workers=workers, node=node)
+    if once:
+        echo_stats(engine.run_once())
+        return
+    engine.run_forever(interval=interval or settings.SCRAPER_LOOP_INTERVAL, on_round=echo_stats)
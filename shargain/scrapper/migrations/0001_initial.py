@@ -0,0 +1,24 @@
+# Generated by Django 4.1.4 on 2026-10-19 15:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="ScraperNode",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("name", models.CharField(max_length=255, unique=True, verbose_name="Name")),
+                ("last_heartbeat_at", models.DateTimeField(db_index=True, verbose_name="Last heartbeat at")),
+            ],
+            options={
+                "verbose_name": "Scraper node",
+                "verbose_name_plural": "Scraper nodes",
+            },
+        ),
+    ]
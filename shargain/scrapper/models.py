@@ -0,0 +1,14 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class ScraperNode(models.Model):
+    name = models.CharField(_("Name"), max_length=255, unique=True)
+    last_heartbeat_at = models.DateTimeField(_("Last heartbeat at"), db_index=True)
+
+    class Meta:
+        verbose_name = _("Scraper node")
+        verbose_name_plural = _("Scraper nodes")
+
+    def __str__(self):
+        return self.name
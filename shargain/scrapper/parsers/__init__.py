@@ -0,0 +1,4 @@
+from shargain.scrapper.parsers import olx, otodom, otomoto  # noqa: F401  (registers parsers)
+from shargain.scrapper.parsers.base import ListPageParser, ScrapedOffer, get_list_page_parser
+
+__all__ = ["ListPageParser", "ScrapedOffer", "get_list_page_parser"]
@@ -0,0 +1,91 @@
+"""
+List page parsers.
+
+A list page (e.g. search results) of every supported site is parsed by a ``ListPageParser`` registered for the site's
+exact domains (netlocs). Parsers read the data embedded by the site's frontend into the page instead of its markup,
+so they don't depend on CSS classes.
+"""
+
+import abc
+import dataclasses
+import json
+import re
+from datetime import datetime
+from typing import Any
+from urllib.parse import urlparse
+
+NEXT_DATA_SCRIPT_RE = re.compile(rb"""<script[^>]*\bid=["']?__NEXT_DATA__\b[^>]*>(.*?)</script>""", re.DOTALL)
+
+
+@dataclasses.dataclass(frozen=True)
+class ScrapedOffer:
+    url: str
+    title: str
+    price: int | None = None
+    published_at: datetime | None = None
+    main_image_url: str = ""
+    extra: dict[str, Any] = dataclasses.field(default_factory=dict)
+    """Unstructured data of the offer, stored in ``metadata.extra``"""
+
+    def as_offer_data(self, list_url: str) -> dict[str, Any]:
+        """Returns data of the offer in the format accepted by ``OfferBatchCreateSerializer``."""
+        return {
+            "url": self.url,
+            "title": self.title[:200],
+            "price": self.price,
+            "published_at": self.published_at,
+            "main_image_url": self.main_image_url,
+            "list_url": list_url,
+            "metadata": {"extra": self.extra},
+        }
+
+
+class ListPageParser(abc.ABC):
+    domains: tuple[str, ...] = ()
+
+    @abc.abstractmethod
+    def parse(self, url: str, content: bytes) -> list[ScrapedOffer]:
+        """Parses offers listed on the page. Returns an empty list if the page doesn't contain expected data."""
+
+
+LIST_PAGE_PARSERS: dict[str, ListPageParser] = {}
+
+
+def register_list_page_parser(parser_class: type[ListPageParser]) -> type[ListPageParser]:
+    parser = parser_class()
+    for domain in parser_class.domains:
+        LIST_PAGE_PARSERS[domain] = parser
+    return parser_class
+
+
+def get_list_page_parser(url: str) -> ListPageParser | None:
+    return LIST_PAGE_PARSERS.get(urlparse(url).netloc)
+
+
+def extract_next_data(content: bytes) -> dict[str, Any] | None:
+    """Extracts the JSON state embedded by Next.js into the ``#__NEXT_DATA__`` script."""
+    if not (script := NEXT_DATA_SCRIPT_RE.search(content)):
+        return None
+    try:
+        data = json.loads(script.group(1))
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def parse_datetime(value: Any) -> datetime | None:
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def parse_price(value: Any) -> int | None:
+    if isinstance(value, bool) or not isinstance(value, int | float | str):
+        return None
+    try:
+        return round(float(value))
+    except ValueError:
+        return None
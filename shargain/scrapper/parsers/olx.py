@@ -0,0 +1,43 @@
+from typing import Any
+from urllib.parse import urljoin
+
+from shargain.parsers.olx import extract_prerendered_state
+from shargain.scrapper.parsers.base import (
+    ListPageParser,
+    ScrapedOffer,
+    parse_datetime,
+    parse_price,
+    register_list_page_parser,
+)
+
+PHOTO_SIZE = "644x461"
+
+
+@register_list_page_parser
+class OlxListPageParser(ListPageParser):
+    """Reads ads from ``listing.listing.ads`` of the prerendered state."""
+
+    domains = ("www.olx.pl", "olx.pl", "m.olx.pl")
+
+    def parse(self, url: str, content: bytes) -> list[ScrapedOffer]:
+        if (state := extract_prerendered_state(content)) is None:
+            return []
+        ads = (state.get("listing") or {}).get("listing", {}).get("ads") or []
+        return [self._parse_ad(url, ad) for ad in ads if ad.get("url") and ad.get("title")]
+
+    @staticmethod
+    def _parse_ad(list_url: str, ad: dict[str, Any]) -> ScrapedOffer:
+        photos = ad.get("photos") or []
+        return ScrapedOffer(
+            url=urljoin(list_url, ad["url"]),
+            title=ad["title"],
+            price=parse_price(((ad.get("price") or {}).get("regularPrice") or {}).get("value")),
+            published_at=parse_datetime(ad.get("createdTime")),
+            main_image_url=photos[0].replace("{width}x{height}", PHOTO_SIZE) if photos else "",
+            extra={
+                "id": ad.get("id"),
+                "location": ad.get("location") or {},
+                "map": ad.get("map") or {},
+                "is_promoted": bool(ad.get("isPromoted")),
+            },
+        )
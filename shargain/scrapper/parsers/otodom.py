@@ -0,0 +1,43 @@
+from typing import Any
+
+from shargain.scrapper.parsers.base import (
+    ListPageParser,
+    ScrapedOffer,
+    extract_next_data,
+    parse_datetime,
+    parse_price,
+    register_list_page_parser,
+)
+
+OFFER_URL = "https://www.otodom.pl/pl/oferta/{slug}"
+
+
+@register_list_page_parser
+class OtodomListPageParser(ListPageParser):
+    """Reads ads from ``props.pageProps.data.searchAds.items`` of the Next.js state."""
+
+    domains = ("www.otodom.pl", "otodom.pl")
+
+    def parse(self, url: str, content: bytes) -> list[ScrapedOffer]:
+        if (data := extract_next_data(content)) is None:
+            return []
+        page_props = (data.get("props") or {}).get("pageProps") or {}
+        items = ((page_props.get("data") or {}).get("searchAds") or {}).get("items") or []
+        return [self._parse_item(item) for item in items if item.get("slug") and item.get("title")]
+
+    @staticmethod
+    def _parse_item(item: dict[str, Any]) -> ScrapedOffer:
+        images = item.get("images") or []
+        return ScrapedOffer(
+            url=OFFER_URL.format(slug=item["slug"]),
+            title=item["title"],
+            price=parse_price((item.get("totalPrice") or {}).get("value")),
+            published_at=parse_datetime(item.get("createdAtFirst") or item.get("dateCreatedFirst")),
+            main_image_url=(images[0].get("medium") or images[0].get("large") or "") if images else "",
+            extra={
+                "id": item.get("id"),
+                "location": item.get("location") or {},
+                "area": item.get("areaInSquareMeters"),
+                "rooms": item.get("roomsNumber"),
+            },
+        )
@@ -0,0 +1,54 @@
+import json
+from typing import Any
+
+from shargain.scrapper.parsers.base import (
+    ListPageParser,
+    ScrapedOffer,
+    extract_next_data,
+    parse_datetime,
+    parse_price,
+    register_list_page_parser,
+)
+
+
+@register_list_page_parser
+class OtomotoListPageParser(ListPageParser):
+    """
+    Reads ads from the Next.js state, where the results of the ``advertSearch`` GraphQL query are cached
+    (as JSON strings) in ``props.pageProps.urqlState``.
+    """
+
+    domains = ("www.otomoto.pl", "otomoto.pl")
+
+    def parse(self, url: str, content: bytes) -> list[ScrapedOffer]:
+        if (data := extract_next_data(content)) is None:
+            return []
+        urql_state = ((data.get("props") or {}).get("pageProps") or {}).get("urqlState") or {}
+        offers = []
+        for query in urql_state.values():
+            try:
+                result = json.loads(query.get("data") or "null")
+            except (AttributeError, ValueError):
+                continue
+            if not isinstance(result, dict) or not isinstance(result.get("advertSearch"), dict):
+                continue
+            for edge in result["advertSearch"].get("edges") or []:
+                node = edge.get("node") or {}
+                if node.get("url") and node.get("title"):
+                    offers.append(self._parse_node(node))
+        return offers
+
+    @staticmethod
+    def _parse_node(node: dict[str, Any]) -> ScrapedOffer:
+        return ScrapedOffer(
+            url=node["url"],
+            title=node["title"],
+            price=parse_price(((node.get("price") or {}).get("amount") or {}).get("units")),
+            published_at=parse_datetime(node.get("createdAt")),
+            main_image_url=(node.get("thumbnail") or {}).get("x1") or "",
+            extra={
+                "id": node.get("id"),
+                "location": node.get("location") or {},
+                "short_description": node.get("shortDescription") or "",
+            },
+        )
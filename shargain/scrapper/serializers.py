@@ -0,0 +1,22 @@
+from typing import Any
+
+from rest_framework import serializers
+
+from shargain.offers.models import ScrapingUrl
+from shargain.scrapper.models import ScraperNode
+
+
+class ScraperNodeSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ScraperNode
+        fields = ("name", "last_heartbeat_at")
+        read_only_fields = ("last_heartbeat_at",)
+        extra_kwargs: dict[str, dict[str, Any]] = {"name": {"validators": []}}
+
+
+class ShardScrapingUrlSerializer(serializers.ModelSerializer):
+    source_url = serializers.CharField(source="source.url")
+
+    class Meta:
+        model = ScrapingUrl
+        fields = ("id", "url", "source_url", "scraping_target", "next_scrape_at")
@@ -0,0 +1,245 @@
+"""
+In-process scraping engine.
+
+Every round, scraping URLs which are due (see ``shargain.offers.services.scrape_scheduler``) are claimed with
+``SELECT ... FOR UPDATE SKIP LOCKED``, which also moves their ``next_scrape_at`` by ``CLAIM_LEASE``, so concurrently
+running scrapers claim different URLs and URLs which couldn't be scraped are retried once the lease expires. Their
+checkins reschedule them according to the rate of new offers. URLs of domains without a list page parser are not
+fetched, and are claimed again only after ``unsupported_interval``. List pages are downloaded concurrently on an asyncio
+event loop, where HTTP requests are executed in a thread pool, with the same global and per-domain limits as
+the offer checker (see ``shargain.offers.services.offer_checker``). Scraping URLs of the same list share
+a ``ScrapeSource`` (keyed by the normalized URL), which is fetched and parsed once for all of its due subscribers.
+The offers are passed straight to ``OfferFanOutService``, which saves them for every subscriber's target in one
+pass, the same way batches posted to the API are saved. Batches carry the fingerprint of their offer URLs, so lists
+which didn't change since a subscriber's last scrape are not processed again. Engines started with a node name
+report a heartbeat every round and claim only URLs of their shard (see ``shargain.scrapper.services.sharding``).
+"""
+
+import asyncio
+import dataclasses
+import logging
+import time
+from collections import defaultdict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from urllib.parse import urlparse
+
+import requests
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, transaction
+from django.utils import timezone
+from requests.adapters import HTTPAdapter
+from rest_framework.exceptions import ValidationError
+
+from shargain.offers.models import ScrapeSource, ScrapingUrl
+from shargain.offers.services import OfferFanOutService
+from shargain.offers.services.offer_checker import DomainLimiter, DomainPolicy
+from shargain.scrapper.parsers import get_list_page_parser
+from shargain.scrapper.services.sharding import ShardingService
+
+logger = logging.getLogger(__name__)
+
+CLAIM_LEASE = timedelta(minutes=10)
+
+
+@dataclasses.dataclass
+class ScrapingStats:
+    urls: int = 0
+    fetched: int = 0
+    errors: int = 0
+    unsupported: int = 0
+    offers: int = 0
+    new_offers: int = 0
+    duration: float = 0.0
+
+    @property
+    def pages_per_second(self) -> float:
+        return self.fetched / self.duration if self.duration else 0.0
+
+    @property
+    def offers_per_second(self) -> float:
+        return self.offers / self.duration if self.duration else 0.0
+
+
+class ScrapingEngine:
+    def __init__(
+        self,
+        workers: int,
+        default_domain_policy: DomainPolicy,
+        domain_policies: dict[str, DomainPolicy] | None = None,
+        timeout: float = 10,
+        fetch: Callable[[str], requests.Response] | None = None,
+        node: str | None = None,
+        sharding: ShardingService | None = None,
+        unsupported_interval: timedelta = timedelta(hours=6),
+    ):
+        """
+        :param workers: maximal number of requests in flight
+        :param default_domain_policy: limits for domains not listed in domain_policies
+        :param domain_policies: per-domain (netloc) limits
+        :param fetch: function downloading the page; by default GET through a pooled session
+        :param node: name of the scraper node; if given, only URLs of its shard are scraped
+        :param unsupported_interval: time after which URLs of domains without a list page parser are claimed again
+        """
+        self._workers = workers
+        self._default_domain_policy = default_domain_policy
+        self._domain_policies = domain_policies or {}
+        self._timeout = timeout
+        self._fetch = fetch or self._get
+        self._session: requests.Session | None = None
+        self._node = node
+        self._sharding = sharding or ShardingService.from_settings()
+        self._unsupported_interval = unsupported_interval
+
+    @classmethod
+    def from_settings(cls, workers: int | None = None, node: str | None = None) -> "ScrapingEngine":
+        return cls(
+            workers=workers or settings.SCRAPER_WORKERS,
+            default_domain_policy=DomainPolicy(
+                max_concurrency=settings.SCRAPER_DOMAIN_CONCURRENCY, delay=settings.SCRAPER_DOMAIN_DELAY
+            ),
+            domain_policies={
+                domain: DomainPolicy.from_dict(policy) for domain, policy in settings.SCRAPER_DOMAIN_POLICIES.items()
+            },
+            node=node or settings.SCRAPER_NODE_NAME or None,
+            unsupported_interval=settings.SCRAPE_MAX_INTERVAL,
+        )
+
+    def _get_session(self) -> requests.Session:
+        if self._session is None:
+            self._session = requests.Session()
+            self._session.headers["User-Agent"] = settings.SCRAPER_USER_AGENT
+            adapter = HTTPAdapter(pool_connections=10, pool_maxsize=self._workers)
+            self._session.mount("http://", adapter)
+            self._session.mount("https://", adapter)
+        return self._session
+
+    def _get(self, url: str) -> requests.Response:
+        response = self._get_session().get(url, timeout=self._timeout)
+        response.raise_for_status()
+        return response
+
+    def _fetch_url_sync(self, url: str) -> bytes | None:
+        try:
+            return self._fetch(url).content
+        except requests.RequestException:
+            logger.warning("Couldn't fetch list page [url=%s]", url, exc_info=True)
+            return None
+
+    async def _fetch_urls(self, urls: list[str], executor: ThreadPoolExecutor) -> dict[str, bytes | None]:
+        global_semaphore = asyncio.Semaphore(self._workers)
+        limiters: dict[str, DomainLimiter] = {}
+
+        async def fetch_url(url: str) -> bytes | None:
+            domain = urlparse(url).netloc
+            if domain not in limiters:
+                limiters[domain] = DomainLimiter(self._domain_policies.get(domain, self._default_domain_policy))
+            async with limiters[domain], global_semaphore:
+                return await asyncio.get_running_loop().run_in_executor(executor, self._fetch_url_sync, url)
+
+        results = await asyncio.gather(*(fetch_url(url) for url in urls))
+        return dict(zip(urls, results, strict=True))
+
+    def get_scraping_urls(self) -> dict[str, list[ScrapingUrl]]:
+        """Claims scraping URLs which are due (in the node's shard), grouped by their source URL."""
+        queryset = ScrapingUrl.objects.all()
+        if self._node:
+            self._sharding.heartbeat(self._node)
+            queryset = self._sharding.get_shard(self._node)
+        now = timezone.now()
+        scraping_urls = defaultdict(list)
+        with transaction.atomic():
+            claimed = list(
+                queryset.select_for_update(skip_locked=True, of=("self",))
+                .due_for_scrape(now)
+                .select_related("source", "scraping_target")
+            )
+            unsupported_ids = [
+                scraping_url.id for scraping_url in claimed if get_list_page_parser(scraping_url.source.url) is None
+            ]
+            ScrapingUrl.objects.filter(id__in=[scraping_url.id for scraping_url in claimed]).exclude(
+                id__in=unsupported_ids
+            ).update(next_scrape_at=now + CLAIM_LEASE)
+            # They won't be scraped, so no checkin reschedules them
+            ScrapingUrl.objects.filter(id__in=unsupported_ids).update(next_scrape_at=now + self._unsupported_interval)
+        for scraping_url in claimed:
+            scraping_urls[scraping_url.source.url].append(scraping_url)
+        return scraping_urls
+
+    def _ingest(
+        self,
+        url: str,
+        scraping_urls: list[ScrapingUrl],
+        offers_data: list[dict],
+        fingerprint: str,
+        stats: ScrapingStats,
+    ):
+        try:
+            new_offers_urls = OfferFanOutService(scraping_urls, offers_data, fingerprint).run()
+        except ValidationError as e:
+            logger.warning("Scraped offers are invalid [url=%s] [errors=%s]", url, e.detail)
+            stats.errors += 1
+            return
+        for new_offers in new_offers_urls.values():
+            if new_offers is None:
+                stats.errors += 1
+            else:
+                stats.new_offers += len(new_offers)
+
+    def run_once(self) -> ScrapingStats:
+        started_at = time.monotonic()
+        stats = ScrapingStats()
+        scraping_urls = self.get_scraping_urls()
+        urls = []
+        for url in scraping_urls:
+            if get_list_page_parser(url) is None:
+                logger.warning("Scraping URL has not supported domain [url=%s]", url)
+                stats.unsupported += 1
+            else:
+                urls.append(url)
+        stats.urls = len(urls)
+
+        with ThreadPoolExecutor(max_workers=self._workers) as executor, asyncio.Runner() as runner:
+            pages = runner.run(self._fetch_urls(urls, executor))
+        ScrapeSource.objects.filter(url__in=[url for url, content in pages.items() if content is not None]).update(
+            last_scraped_at=timezone.now()
+        )
+
+        for url, content in pages.items():
+            if content is None:
+                stats.errors += 1
+                continue
+            stats.fetched += 1
+            try:
+                offers = get_list_page_parser(url).parse(url, content)  # type: ignore[union-attr]
+            except Exception:
+                logger.exception("Couldn't parse list page [url=%s]", url)
+                stats.errors += 1
+                continue
+            if not offers:
+                logger.warning("No offers found on list page [url=%s]", url)
+                continue
+            stats.offers += len(offers)
+            offers_data = [offer.as_offer_data(url) for offer in offers]
+            fingerprint = OfferFanOutService.get_fingerprint([offer.url for offer in offers])
+            self._ingest(url, scraping_urls[url], offers_data, fingerprint, stats)
+
+        stats.duration = time.monotonic() - started_at
+        return stats
+
+    def run_forever(self, interval: float, on_round: Callable[[ScrapingStats], None] | None = None):
+        """Runs scraping rounds, starting a new one every interval seconds (or right away if a round takes longer)."""
+        while True:
+            # Like Django does between requests, connections which broke (e.g. when the database restarted) or
+            # exceeded CONN_MAX_AGE are closed, so the loop reconnects instead of failing on a dropped connection
+            close_old_connections()
+            try:
+                stats = self.run_once()
+            except DatabaseError:
+                logger.exception("Scraping round failed")
+                time.sleep(interval)
+                continue
+            if on_round is not None:
+                on_round(stats)
+            time.sleep(max(interval - stats.duration, 0))
@@ -0,0 +1,110 @@
+"""
+Sharding of scraping URLs across scraper nodes.
+
+Every scraper node reports a heartbeat; nodes whose last heartbeat is younger than ``SCRAPER_NODE_TTL`` are alive.
+Scrape sources are assigned to the alive nodes with consistent hashing: every node is placed on a hash ring
+``SCRAPER_HASH_RING_REPLICAS`` times and a source belongs to the first node following the hash of its URL. When
+a node joins or leaves, only sources between its points and their predecessors move (~1/N of them), so the other
+nodes keep scraping the same lists. All subscribers of a source land on the same node, so the list is still
+fetched once. Sources store their position on the ring (``ScrapeSource.ring_hash``), so a node's shard is selected
+in the database by the ranges of the ring the node owns.
+"""
+
+import bisect
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from shargain.offers.models import ScrapingUrl, ScrapingUrlQuerySet, get_ring_hash
+from shargain.scrapper.models import ScraperNode
+
+
+class HashRing:
+    def __init__(self, nodes: Iterable[str], replicas: int = 100):
+        points = sorted(
+            (get_ring_hash(f"{node}#{replica}"), node) for node in set(nodes) for replica in range(replicas)
+        )
+        self._hashes = [point_hash for point_hash, _ in points]
+        self._nodes = [node for _, node in points]
+
+    def __bool__(self) -> bool:
+        return bool(self._nodes)
+
+    @property
+    def nodes(self) -> set[str]:
+        return set(self._nodes)
+
+    def get_node(self, key: str) -> str | None:
+        if not self._nodes:
+            return None
+        index = bisect.bisect(self._hashes, get_ring_hash(key)) % len(self._hashes)
+        return self._nodes[index]
+
+    def get_ranges(self, node: str) -> list[tuple[int | None, int | None]]:
+        """
+        Returns ranges of hashes owned by the node as ``[start, end)`` pairs; None stands for an unbounded end.
+        Adjacent ranges of the node are merged.
+        """
+        ranges: list[tuple[int | None, int | None]] = []
+        for index, point_node in enumerate(self._nodes):
+            if point_node != node:
+                continue
+            start = self._hashes[index - 1] if index else None
+            if ranges and ranges[-1][1] == start:
+                start = ranges.pop()[0]
+            ranges.append((start, self._hashes[index]))
+        # The first point also owns hashes following the last point
+        if self._nodes and self._nodes[0] == node:
+            if self._nodes[-1] == node:
+                ranges[-1] = (ranges[-1][0], None)
+            else:
+                ranges.append((self._hashes[-1], None))
+        return ranges
+
+
+class ShardingService:
+    def __init__(self, node_ttl: int, replicas: int):
+        """
+        :param node_ttl: seconds after the last heartbeat after which the node is considered dead
+        :param replicas: number of points of every node on the hash ring
+        """
+        self._node_ttl = node_ttl
+        self._replicas = replicas
+
+    @classmethod
+    def from_settings(cls) -> "ShardingService":
+        return cls(node_ttl=settings.SCRAPER_NODE_TTL, replicas=settings.SCRAPER_HASH_RING_REPLICAS)
+
+    @staticmethod
+    def heartbeat(name: str) -> ScraperNode:
+        node, _ = ScraperNode.objects.update_or_create(name=name, defaults={"last_heartbeat_at": timezone.now()})
+        return node
+
+    @staticmethod
+    def leave(name: str):
+        ScraperNode.objects.filter(name=name).delete()
+
+    def get_alive_nodes(self, now: datetime | None = None) -> list[str]:
+        alive_since = (now or timezone.now()) - timedelta(seconds=self._node_ttl)
+        return list(ScraperNode.objects.filter(last_heartbeat_at__gte=alive_since).values_list("name", flat=True))
+
+    def get_ring(self) -> HashRing:
+        return HashRing(self.get_alive_nodes(), replicas=self._replicas)
+
+    def get_shard(self, name: str) -> ScrapingUrlQuerySet:
+        """Returns active scraping URLs assigned to the node; none if the node is not alive."""
+        ring = self.get_ring()
+        if name not in ring.nodes:
+            return ScrapingUrl.objects.none()
+        in_shard = Q()
+        for start, end in ring.get_ranges(name):
+            in_range = Q()
+            if start is not None:
+                in_range &= Q(source__ring_hash__gte=start)
+            if end is not None:
+                in_range &= Q(source__ring_hash__lt=end)
+            in_shard |= in_range
+        return ScrapingUrl.objects.active().filter(in_shard)
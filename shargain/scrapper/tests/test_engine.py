@@ -0,0 +1,154 @@
+from datetime import timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+import requests
+from django.db import OperationalError
+from django.utils import timezone
+
+from shargain.offers.models import Offer, ScrapeSource, ScrapingCheckin
+from shargain.offers.services.offer_checker import DomainPolicy
+from shargain.offers.tests.factories import ScrapingUrlFactory, ScrappingTargetFactory
+from shargain.scrapper.models import ScraperNode
+from shargain.scrapper.services.engine import ScrapingEngine, ScrapingStats
+from shargain.scrapper.services.sharding import ShardingService
+
+PAGES_DIR = Path(__file__).parent / "pages"
+OLX_LIST_URL = "https://www.olx.pl/rowery/krakow/"
+
+
+class FakeFetch:
+    def __init__(self, pages: dict[str, str]):
+        self.pages = pages
+        self.calls: list[str] = []
+
+    def __call__(self, url):
+        self.calls.append(url)
+        if url not in self.pages:
+            raise requests.HTTPError("404")
+        return SimpleNamespace(url=url, status_code=200, content=(PAGES_DIR / f"{self.pages[url]}.html").read_bytes())
+
+
+def _make_engine(fetch):
+    return ScrapingEngine(workers=4, default_domain_policy=DomainPolicy(max_concurrency=2), fetch=fetch)
+
+
+@pytest.mark.django_db
+class TestScrapingEngine:
+    def test_run_once_saves_offers_of_all_targets_tracking_url(self):
+        first_url = ScrapingUrlFactory(url=OLX_LIST_URL, scraping_target=ScrappingTargetFactory(owner=None))
+        second_url = ScrapingUrlFactory(url=OLX_LIST_URL, scraping_target=ScrappingTargetFactory(owner=None))
+        fetch = FakeFetch({OLX_LIST_URL: "olx_list"})
+
+        stats = _make_engine(fetch).run_once()
+
+        assert fetch.calls == [OLX_LIST_URL]
+        assert (stats.urls, stats.fetched, stats.offers, stats.new_offers, stats.errors) == (1, 1, 2, 4, 0)
+        for scraping_url in (first_url, second_url):
+            offers = Offer.objects.filter(target=scraping_url.scraping_target, list_url=OLX_LIST_URL)
+            assert set(offers.values_list("price", flat=True)) == {2300, 1800}
+            assert ScrapingCheckin.objects.filter(scraping_url=scraping_url, offers_count=2).exists()
+
+    def test_run_once_fetches_list_once_for_differently_written_urls(self):
+        ScrapingUrlFactory(url=f"{OLX_LIST_URL}?a=1&b=2", scraping_target=ScrappingTargetFactory(owner=None))
+        ScrapingUrlFactory(url=f"{OLX_LIST_URL}?b=2&a=1#top", scraping_target=ScrappingTargetFactory(owner=None))
+        fetch = FakeFetch({f"{OLX_LIST_URL}?a=1&b=2": "olx_list"})
+
+        stats = _make_engine(fetch).run_once()
+
+        assert fetch.calls == [f"{OLX_LIST_URL}?a=1&b=2"]
+        assert stats.new_offers == 4
+        assert ScrapeSource.objects.get().last_scraped_at is not None
+
+    def test_run_once_does_not_create_known_offers_again(self):
+        ScrapingUrlFactory(url=OLX_LIST_URL, scraping_target=ScrappingTargetFactory(owner=None))
+        engine = _make_engine(FakeFetch({OLX_LIST_URL: "olx_list"}))
+        engine.run_once()
+
+        stats = engine.run_once()
+
+        assert stats.new_offers == 0
+        assert Offer.objects.count() == 2
+
+    def test_run_once_scrapes_only_due_urls_and_leases_them(self):
+        now = timezone.now()
+        due_url = ScrapingUrlFactory(url="https://www.otomoto.pl/osobowe/gone", next_scrape_at=now)
+        ScrapingUrlFactory(url=OLX_LIST_URL, next_scrape_at=now + timedelta(hours=1))
+        fetch = FakeFetch({})
+
+        _make_engine(fetch).run_once()
+
+        due_url.refresh_from_db()
+        assert fetch.calls == [due_url.url]
+        assert due_url.next_scrape_at > now
+
+    def test_run_once_skips_inactive_unsupported_and_failing_urls(self):
+        ScrapingUrlFactory(url=OLX_LIST_URL, is_active=False)
+        ScrapingUrlFactory(url="https://example.com/offers")
+        ScrapingUrlFactory(url="https://www.otomoto.pl/osobowe/gone")
+        fetch = FakeFetch({})
+
+        stats = _make_engine(fetch).run_once()
+
+        assert fetch.calls == ["https://www.otomoto.pl/osobowe/gone"]
+        assert (stats.urls, stats.unsupported, stats.errors) == (1, 1, 1)
+        assert not Offer.objects.exists()
+
+    def test_unsupported_urls_are_claimed_again_after_unsupported_interval(self):
+        unsupported_url = ScrapingUrlFactory(url="https://example.com/offers")
+        engine = ScrapingEngine(
+            workers=4,
+            default_domain_policy=DomainPolicy(max_concurrency=2),
+            fetch=FakeFetch({}),
+            unsupported_interval=timedelta(hours=6),
+        )
+
+        engine.run_once()
+
+        unsupported_url.refresh_from_db()
+        assert unsupported_url.next_scrape_at > timezone.now() + timedelta(hours=5)
+        assert engine.get_scraping_urls() == {}
+
+    def test_run_once_with_node_scrapes_only_its_shard(self):
+        sharding = ShardingService(node_ttl=60, replicas=50)
+        sharding.heartbeat("other")
+        for i in range(10):
+            ScrapingUrlFactory(url=f"https://www.otomoto.pl/osobowe/{i}")
+        fetch = FakeFetch({})
+        engine = ScrapingEngine(
+            workers=4, default_domain_policy=DomainPolicy(max_concurrency=2), fetch=fetch, node="me", sharding=sharding
+        )
+
+        engine.run_once()
+
+        assert ScraperNode.objects.filter(name="me").exists()
+        assert 0 < len(fetch.calls) < 10
+        assert {sharding.get_ring().get_node(url) for url in fetch.calls} == {"me"}
+
+
+class StopLoop(Exception):
+    pass
+
+
+class TestScrapingEngineLoop:
+    def test_run_forever_reconnects_after_database_error(self):
+        engine = _make_engine(FakeFetch({}))
+        stats = ScrapingStats(duration=1)
+        rounds = []
+
+        def on_round(round_stats):
+            rounds.append(round_stats)
+            raise StopLoop()
+
+        with (
+            mock.patch.object(engine, "run_once", side_effect=[OperationalError("connection lost"), stats]),
+            mock.patch("shargain.scrapper.services.engine.close_old_connections") as m_close_old_connections,
+            mock.patch("shargain.scrapper.services.engine.time.sleep"),
+            pytest.raises(StopLoop),
+        ):
+            engine.run_forever(interval=5, on_round=on_round)
+
+        assert rounds == [stats]
+        assert m_close_old_connections.call_count == 2
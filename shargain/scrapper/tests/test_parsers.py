@@ -0,0 +1,89 @@
+from datetime import UTC, datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from shargain.scrapper.parsers import ScrapedOffer, get_list_page_parser
+
+PAGES_DIR = Path(__file__).parent / "pages"
+
+
+def parse_page(url: str, name: str) -> list[ScrapedOffer]:
+    return get_list_page_parser(url).parse(url, (PAGES_DIR / f"{name}.html").read_bytes())
+
+
+def test_olx_list_page_parser():
+    offers = parse_page("https://www.olx.pl/rowery/krakow/", "olx_list")
+
+    assert offers == [
+        ScrapedOffer(
+            url="https://www.olx.pl/d/oferta/rower-kross-CID767-ID1.html",
+            title='Rower Kross Level 29"',
+            price=2300,
+            published_at=datetime(2026, 10, 18, 12, 30, tzinfo=timezone(timedelta(hours=2))),
+            main_image_url="https://ireland.apollo.olxcdn.com:443/v1/files/abc-PL/image;s=644x461",
+            extra={
+                "id": 901,
+                "location": {"cityName": "Kraków", "districtName": "Podgórze"},
+                "map": {"lat": 50.04, "lon": 19.95, "show_detailed": False},
+                "is_promoted": True,
+            },
+        ),
+        ScrapedOffer(
+            url="https://www.olx.pl/d/oferta/rower-trek-CID767-ID2.html",
+            title="Rower Trek Marlin 5",
+            price=1800,
+            published_at=datetime(2026, 10, 19, 8, 0, tzinfo=timezone(timedelta(hours=2))),
+            extra={"id": 902, "location": {"cityName": "Kraków"}, "map": {}, "is_promoted": False},
+        ),
+    ]
+
+
+def test_otodom_list_page_parser():
+    offers = parse_page("https://www.otodom.pl/pl/wyniki/sprzedaz/mieszkanie/malopolskie/krakow", "otodom_list")
+
+    assert [(offer.url, offer.title, offer.price, offer.main_image_url) for offer in offers] == [
+        (
+            "https://www.otodom.pl/pl/oferta/mieszkanie-2-pokoje-ID4abc",
+            "Mieszkanie 2 pokoje, Kazimierz",
+            749000,
+            "https://ireland.apollo.olxcdn.com/v1/files/otodom-1/image;s=655x491",
+        ),
+        ("https://www.otodom.pl/pl/oferta/kawalerka-ID4abd", "Kawalerka", None, ""),
+    ]
+    assert offers[0].published_at == datetime(2026, 10, 17, 9, 15)
+
+
+def test_otomoto_list_page_parser():
+    offers = parse_page("https://www.otomoto.pl/osobowe/krakow", "otomoto_list")
+
+    assert [(offer.url, offer.price, offer.published_at) for offer in offers] == [
+        ("https://www.otomoto.pl/osobowe/oferta/audi-a4-ID6123.html", 45900, datetime(2026, 10, 19, 6, tzinfo=UTC)),
+        ("https://www.otomoto.pl/osobowe/oferta/bmw-3-ID6124.html", 61000, None),
+    ]
+    assert offers[0].main_image_url == "https://ireland.apollo.olxcdn.com/v1/files/otomoto-1/image;s=320x240"
+
+
+@pytest.mark.parametrize(
+    "url", ["https://www.olx.pl/rowery/", "https://www.otodom.pl/pl/wyniki", "https://www.otomoto.pl/"]
+)
+def test_list_page_parsers_return_no_offers_for_unexpected_pages(url):
+    assert get_list_page_parser(url).parse(url, b"<html><body>Captcha</body></html>") == []
+
+
+def test_get_list_page_parser_returns_none_for_unsupported_domain():
+    assert get_list_page_parser("https://example.com/offers") is None
+
+
+def test_scraped_offer_as_offer_data():
+    offer = ScrapedOffer(url="https://www.olx.pl/d/oferta/a.html", title="a" * 250, price=10, extra={"id": 1})
+
+    assert offer.as_offer_data("https://www.olx.pl/rowery/") == {
+        "url": "https://www.olx.pl/d/oferta/a.html",
+        "title": "a" * 200,
+        "price": 10,
+        "published_at": None,
+        "main_image_url": "",
+        "list_url": "https://www.olx.pl/rowery/",
+        "metadata": {"extra": {"id": 1}},
+    }
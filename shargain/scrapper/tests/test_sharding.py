@@ -0,0 +1,133 @@
+from collections import Counter
+from datetime import timedelta
+
+import pytest
+from django.test import Client
+from django.utils import timezone
+
+from shargain.accounts.tests.factories import UserFactory
+from shargain.offers.models import get_ring_hash
+from shargain.offers.tests.factories import ScrapingUrlFactory
+from shargain.scrapper.models import ScraperNode
+from shargain.scrapper.services.sharding import HashRing, ShardingService
+
+KEYS = [f"https://www.olx.pl/list/{i}/" for i in range(10000)]
+
+
+class TestHashRing:
+    def test_get_node_spreads_keys_evenly(self):
+        ring = HashRing([f"node-{i}" for i in range(4)])
+
+        counts = Counter(ring.get_node(key) for key in KEYS)
+
+        assert set(counts) == {"node-0", "node-1", "node-2", "node-3"}
+        assert all(1500 < count < 3500 for count in counts.values())
+
+    def test_node_join_moves_only_its_share_of_keys(self):
+        before = HashRing([f"node-{i}" for i in range(4)])
+        after = HashRing([f"node-{i}" for i in range(5)])
+
+        moved = [key for key in KEYS if before.get_node(key) != after.get_node(key)]
+
+        assert {after.get_node(key) for key in moved} == {"node-4"}
+        assert len(moved) < len(KEYS) * 0.3
+
+    def test_node_leave_moves_only_its_keys(self):
+        before = HashRing([f"node-{i}" for i in range(4)])
+        after = HashRing([f"node-{i}" for i in range(3)])
+
+        moved = [key for key in KEYS if before.get_node(key) != after.get_node(key)]
+
+        assert {before.get_node(key) for key in moved} == {"node-3"}
+
+    def test_get_node_of_empty_ring(self):
+        assert HashRing([]).get_node(KEYS[0]) is None
+
+    @pytest.mark.parametrize("nodes", [["node-0"], [f"node-{i}" for i in range(4)]])
+    def test_get_ranges_cover_keys_of_node(self, nodes):
+        ring = HashRing(nodes)
+
+        for node in nodes:
+            ranges = ring.get_ranges(node)
+            owned = [
+                key
+                for key in KEYS
+                if any(
+                    (start is None or start <= get_ring_hash(key)) and (end is None or get_ring_hash(key) < end)
+                    for start, end in ranges
+                )
+            ]
+            assert owned == [key for key in KEYS if ring.get_node(key) == node]
+
+
+@pytest.mark.django_db
+class TestShardingService:
+    def test_shards_of_alive_nodes_partition_active_urls(self):
+        now = timezone.now()
+        ScraperNode.objects.create(name="a", last_heartbeat_at=now)
+        ScraperNode.objects.create(name="b", last_heartbeat_at=now)
+        ScraperNode.objects.create(name="dead", last_heartbeat_at=now - timedelta(hours=1))
+        scraping_urls = ScrapingUrlFactory.create_batch(20)
+        ScrapingUrlFactory(is_active=False)
+        sharding = ShardingService(node_ttl=60, replicas=50)
+
+        shards = [set(sharding.get_shard(name).values_list("id", flat=True)) for name in ("a", "b", "dead")]
+
+        assert not shards[0] & shards[1]
+        assert shards[0] | shards[1] == {scraping_url.id for scraping_url in scraping_urls}
+        assert shards[2] == set()
+
+    def test_subscribers_of_source_land_on_same_node(self):
+        ShardingService.heartbeat("a")
+        ShardingService.heartbeat("b")
+        first = ScrapingUrlFactory(url="https://www.olx.pl/rowery/?a=1&b=2")
+        second = ScrapingUrlFactory(url="https://www.olx.pl/rowery/?b=2&a=1")
+        sharding = ShardingService(node_ttl=60, replicas=50)
+
+        shard_ids = [set(sharding.get_shard(name).values_list("id", flat=True)) for name in ("a", "b")]
+
+        assert {first.id, second.id} in shard_ids
+
+
+@pytest.fixture
+def admin_client():
+    client = Client()
+    client.force_login(UserFactory(is_staff=True))
+    return client
+
+
+@pytest.mark.django_db
+class TestScraperNodeViewSet:
+    def test_requires_admin(self):
+        client = Client()
+        client.force_login(UserFactory())
+
+        assert client.post("/api/scraper-nodes/heartbeat/", {"name": "node-1"}).status_code == 403
+        assert Client().post("/api/scraper-nodes/heartbeat/", {"name": "node-1"}).status_code == 403
+        assert not ScraperNode.objects.exists()
+
+    def test_heartbeat_registers_node(self, admin_client):
+        response = admin_client.post("/api/scraper-nodes/heartbeat/", {"name": "node-1"})
+
+        assert response.status_code == 200
+        assert ScraperNode.objects.get(name="node-1").last_heartbeat_at is not None
+
+    def test_shard_lists_urls_of_node(self, admin_client):
+        ShardingService.heartbeat("node-1")
+        scraping_urls = ScrapingUrlFactory.create_batch(3)
+
+        response = admin_client.get("/api/scraper-nodes/node-1/shard/")
+
+        assert response.status_code == 200
+        assert [result["id"] for result in response.json()["results"]] == [url.id for url in scraping_urls]
+
+    def test_shard_of_unknown_node(self, admin_client):
+        assert admin_client.get("/api/scraper-nodes/unknown/shard/").status_code == 404
+
+    def test_delete_leaves_ring(self, admin_client):
+        ShardingService.heartbeat("node-1")
+
+        response = admin_client.delete("/api/scraper-nodes/node-1/")
+
+        assert response.status_code == 204
+        assert not ScraperNode.objects.exists()
@@ -0,0 +1,7 @@
+from rest_framework.routers import DefaultRouter
+
+from shargain.scrapper.views import ScraperNodeViewSet
+
+router = DefaultRouter()
+
+router.register("scraper-nodes", ScraperNodeViewSet)
@@ -0,0 +1,49 @@
+from django.utils import timezone
+from rest_framework import mixins, permissions, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from shargain.scrapper.models import ScraperNode
+from shargain.scrapper.serializers import ScraperNodeSerializer, ShardScrapingUrlSerializer
+from shargain.scrapper.services.sharding import ShardingService
+
+
+class ScraperNodeViewSet(mixins.DestroyModelMixin, viewsets.GenericViewSet):
+    queryset = ScraperNode.objects.all()
+    serializer_class = ScraperNodeSerializer
+    lookup_field = "name"
+    lookup_value_regex = "[^/]+"
+    permission_classes = (permissions.IsAdminUser,)
+
+    def get_serializer_class(self):
+        if self.action == "shard":
+            return ShardScrapingUrlSerializer
+        return super().get_serializer_class()
+
+    @action(methods=["POST"], detail=False)
+    def heartbeat(self, request):
+        """
+        Action which registers the node or prolongs its membership in the hash ring.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        node = ShardingService.heartbeat(serializer.validated_data["name"])
+        return Response(ScraperNodeSerializer(node).data)
+
+    @action(methods=["GET"], detail=True)
+    def shard(self, request, name=None):
+        """
+        Action which lists active scraping URLs assigned to the node. With ?due=true only URLs due for scrape
+        are listed.
+        """
+        node = self.get_object()
+        queryset = ShardingService.from_settings().get_shard(node.name).select_related("source")
+        if request.query_params.get("due") == "true":
+            queryset = queryset.due_for_scrape(timezone.now())
+        else:
+            queryset = queryset.order_by("id")
+        page = self.paginate_queryset(queryset)
+        return self.get_paginated_response(self.get_serializer(page, many=True).data)
+
+    def perform_destroy(self, instance):
+        ShardingService.leave(instance.name)
@@ -1,3 +1,4 @@
+from datetime import timedelta
 from pathlib import Path
 
 from django.utils.translation import gettext_lazy as _
@@ -124,6 +125,18 @@ AUTH_PASSWORD_VALIDATORS = [
 # ------------- MODELS -------------
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# ------------- CACHES -------------
+# The cache is shared by all web and worker processes, so that an invalidation made in one of them is seen by the
+# others. Without REDIS_URL caching is disabled.
+REDIS_URL = env("REDIS_URL", "")
+CACHES = {
+    "default": (
+        {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": REDIS_URL}
+        if REDIS_URL
+        else {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+    )
+}
+
 # ------------- INTERNALIZATION -------------
 LANGUAGE_CODE = "en-us"
 LANGUAGES = [
@@ -172,8 +185,88 @@ CSRF_COOKIE_HTTPONLY = False
 TELEGRAM_BOT_TOKEN = env("TELEGRAM_BOT_TOKEN", "")
 TELEGRAM_WEBHOOK_URL = env("TELEGRAM_WEBHOOK_URL", "")
 TELEGRAM_SETUP_BOT = env.bool("TELEGRAM_SETUP_BOT", False)
+# Processed webhook updates are kept for this time, so that updates redelivered by Telegram are not processed twice
+TELEGRAM_UPDATE_RETENTION = timedelta(hours=env.int("TELEGRAM_UPDATE_RETENTION_HOURS", 24))
+# Time (in seconds) after which unfinished conversation steps (e.g. adding a link) expire
+TELEGRAM_CONVERSATION_TTL = env.int("TELEGRAM_CONVERSATION_TTL", 15 * 60)
 
 # ------------- QUOTAS -------------
 QUOTA_FREE_TIER_OFFERS_PER_TARGET = env.int("QUOTA_FREE_TIER_OFFERS_PER_TARGET", 50)
 QUOTA_FREE_TIER_MAX_URLS = env.int("QUOTA_FREE_TIER_MAX_URLS", 3)
+QUOTA_FREE_TIER_MIN_SCRAPE_INTERVAL = timedelta(minutes=env.int("QUOTA_FREE_TIER_MIN_SCRAPE_INTERVAL_MINUTES", 10))
 QUOTA_PERIOD_DAYS = env.int("QUOTA_PERIOD_DAYS", 30)
+
+# ------------- OFFER CHECKER -------------
+OFFER_CHECKER_CONCURRENCY = env.int("OFFER_CHECKER_CONCURRENCY", 20)
+OFFER_CHECKER_CHUNK_SIZE = env.int("OFFER_CHECKER_CHUNK_SIZE", 500)
+# Seconds after which a run stops taking new chunks. Keep it below the task's soft time limit (minus the time of one
+# chunk) and the beat interval of check_for_closed_offers, so that runs don't overlap.
+OFFER_CHECKER_TIME_BUDGET = env.int("OFFER_CHECKER_TIME_BUDGET", 4 * 60)
+# Default limits for a single domain; OFFER_CHECKER_DOMAIN_POLICIES overrides them for specific domains
+OFFER_CHECKER_DOMAIN_CONCURRENCY = env.int("OFFER_CHECKER_DOMAIN_CONCURRENCY", 4)
+OFFER_CHECKER_DOMAIN_DELAY = env.float("OFFER_CHECKER_DOMAIN_DELAY", 0.25)
+OFFER_CHECKER_DOMAIN_POLICIES = {
+    "www.olx.pl": {"max_concurrency": 8, "delay": 0.1},
+    "www.otomoto.pl": {"max_concurrency": 2, "delay": 0.5},
+}
+
+# Downloaded pages parsed by one task of the parsing queue
+OFFER_PARSER_BATCH_SIZE = env.int("OFFER_PARSER_BATCH_SIZE", 50)
+
+# ------------- OFFER CHECK SCHEDULING -------------
+# Open offers are rechecked when the probability that they were closed since the last check reaches the target,
+# based on historical closure rates of offers from the same domain and of the same age
+OFFER_CHECK_MIN_INTERVAL = timedelta(minutes=env.int("OFFER_CHECK_MIN_INTERVAL_MINUTES", 30))
+OFFER_CHECK_MAX_INTERVAL = timedelta(hours=env.int("OFFER_CHECK_MAX_INTERVAL_HOURS", 72))
+OFFER_CHECK_TARGET_PROBABILITY = env.float("OFFER_CHECK_TARGET_PROBABILITY", 0.1)
+OFFER_CHECK_DEFAULT_CLOSURE_RATE = env.float("OFFER_CHECK_DEFAULT_CLOSURE_RATE", 0.1)  # closures per day
+OFFER_CHECK_HISTORY_WINDOW = timedelta(days=env.int("OFFER_CHECK_HISTORY_WINDOW_DAYS", 60))
+OFFER_CHECK_MIN_EXPOSURE_DAYS = env.float("OFFER_CHECK_MIN_EXPOSURE_DAYS", 50)
+OFFER_CHECK_CLOSURE_RATES_TTL = env.int("OFFER_CHECK_CLOSURE_RATES_TTL", 60 * 60)
+
+# Offers missing from this many consecutive checkins of their list URL are closed as disappeared
+OFFER_DISAPPEARANCE_CHECKINS = env.int("OFFER_DISAPPEARANCE_CHECKINS", 3)
+
+# ------------- OFFER SOURCE HTML -------------
+# Number of offers claimed by a single get_offer_source_html run and number of pages it downloads at once
+OFFER_SOURCE_HTML_BATCH_SIZE = env.int("OFFER_SOURCE_HTML_BATCH_SIZE", 20)
+OFFER_SOURCE_HTML_CONCURRENCY = env.int("OFFER_SOURCE_HTML_CONCURRENCY", 10)
+# Stored pages which no offer points to are deleted once they weren't modified for the grace period
+OFFER_SOURCE_HTML_GC_GRACE_PERIOD = timedelta(hours=env.int("OFFER_SOURCE_HTML_GC_GRACE_PERIOD_HOURS", 6))
+
+# ------------- SCRAPE SCHEDULING -------------
+# Scraping URLs are scraped again when TARGET_NEW_OFFERS new offers are expected on them, based on the rate of new
+# offers in their checkins within the history window
+SCRAPE_MIN_INTERVAL = timedelta(minutes=env.int("SCRAPE_MIN_INTERVAL_MINUTES", 2))
+SCRAPE_MAX_INTERVAL = timedelta(hours=env.int("SCRAPE_MAX_INTERVAL_HOURS", 6))
+SCRAPE_TARGET_NEW_OFFERS = env.float("SCRAPE_TARGET_NEW_OFFERS", 1)
+SCRAPE_HISTORY_WINDOW = timedelta(days=env.int("SCRAPE_HISTORY_WINDOW_DAYS", 7))
+
+# ------------- CHECKIN ROLLUPS -------------
+# Checkins are rolled up into hourly and daily buckets; rolled up hours within the lookback are recomputed on every
+# run to count checkins committed late. Raw checkins are kept for the retention window and deleted in chunks.
+CHECKIN_ROLLUP_LOOKBACK = timedelta(hours=env.int("CHECKIN_ROLLUP_LOOKBACK_HOURS", 2))
+# Hours rolled up in one run at most; a longer backlog (e.g. the history on the first run) takes several runs
+CHECKIN_ROLLUP_MAX_HOURS = env.int("CHECKIN_ROLLUP_MAX_HOURS", 7 * 24)
+CHECKIN_RETENTION = timedelta(days=env.int("CHECKIN_RETENTION_DAYS", 30))
+CHECKIN_PRUNE_CHUNK_SIZE = env.int("CHECKIN_PRUNE_CHUNK_SIZE", 5000)
+
+# ------------- SCRAPER -------------
+# Number of list pages downloaded at once by the scrap command and seconds between its polls for due URLs (--loop)
+SCRAPER_WORKERS = env.int("SCRAPER_WORKERS", 10)
+SCRAPER_LOOP_INTERVAL = env.float("SCRAPER_LOOP_INTERVAL", 30)
+# Default limits for a single domain; SCRAPER_DOMAIN_POLICIES overrides them for specific domains
+SCRAPER_DOMAIN_CONCURRENCY = env.int("SCRAPER_DOMAIN_CONCURRENCY", 2)
+SCRAPER_DOMAIN_DELAY = env.float("SCRAPER_DOMAIN_DELAY", 0.5)
+SCRAPER_DOMAIN_POLICIES = {
+    "www.olx.pl": {"max_concurrency": 4, "delay": 0.25},
+}
+SCRAPER_USER_AGENT = env(
+    "SCRAPER_USER_AGENT",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36",
+)
+# Scraping URLs are split between scraper nodes with a heartbeat younger than SCRAPER_NODE_TTL seconds by consistent
+# hashing. SCRAPER_NODE_NAME makes the scrap command scrape only its shard; empty scrapes all due URLs.
+SCRAPER_NODE_NAME = env("SCRAPER_NODE_NAME", "")
+SCRAPER_NODE_TTL = env.int("SCRAPER_NODE_TTL", 120)
+SCRAPER_HASH_RING_REPLICAS = env.int("SCRAPER_HASH_RING_REPLICAS", 100)
@@ -8,3 +8,13 @@ CELERY_TASK_REJECT_ON_WORKER_LOST = True  # Enabling this can cause message loop
 
 CELERY_TASK_TIME_LIMIT = 60 * 5
 CELERY_TASK_SOFT_TIME_LIMIT = 60
+
+# CPU-bound tasks go to a separate queue, so that they can be consumed by workers scaled separately
+CELERY_TASK_ROUTES = {
+    "shargain.offers.tasks.check_if_is_closed": {"queue": "parsing"},
+    "shargain.offers.tasks.check_if_are_closed": {"queue": "parsing"},
+    "shargain.offers.tasks.close_offers_with_closed_pages": {"queue": "parsing"},
+}
+
+# Port of the exporter of worker metrics (0 disables it), requires PROMETHEUS_MULTIPROC_DIR (see commons.metrics)
+WORKER_METRICS_PORT = int(os.environ.get("WORKER_METRICS_PORT", 0))
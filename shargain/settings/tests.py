@@ -22,6 +22,9 @@ PASSWORD_HASHERS = [
     "django.contrib.auth.hashers.MD5PasswordHasher",
 ]
 
+# ------------- CACHES -------------
+CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
 # ------------- DATABASES -------------
 DATABASES = {
     "default": {
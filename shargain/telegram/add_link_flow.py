@@ -28,7 +28,17 @@ def callback_add_link(call: CallbackQuery) -> None:
     chat_id = call.message.chat.id
     msg = bot.send_message(chat_id, _("🔗 Please send me the URL you want to monitor:"), reply_markup=ForceReply())
 
-    bot.register_for_reply_by_message_id(msg.id, lambda m: process_url(bot, m))
+    bot.register_for_reply_by_message_id(msg.id, handle_url_reply)
+
+
+def handle_url_reply(message: TelebotMessage) -> None:
+    """Handle the reply with URL to monitor."""
+    process_url(TelegramBot.get_bot(), message)
+
+
+def handle_name_reply(message: TelebotMessage, url: str) -> None:
+    """Handle the reply with the name of the link."""
+    process_name(TelegramBot.get_bot(), message, url)
 
 
 def process_url(bot: TeleBot, message: TelebotMessage) -> None:
@@ -48,7 +58,7 @@ def process_url(bot: TeleBot, message: TelebotMessage) -> None:
             reply_markup=markup,
             reply_to_message_id=message.message_id,
         )
-        bot.register_next_step_handler(msg, lambda m: process_name(bot, m, url))
+        bot.register_next_step_handler(msg, handle_name_reply, url)
 
     except Exception:
         logger.warning("Error in process_url url=%s", url, exc_info=True)
@@ -57,7 +67,7 @@ def process_url(bot: TeleBot, message: TelebotMessage) -> None:
             _("❌ Invalid URL. Please send a valid URL:"),
             reply_markup=ForceReply(),
         )
-        bot.register_for_reply(msg, lambda m: process_url(bot, m))
+        bot.register_for_reply(msg, handle_url_reply)
 
 
 def process_name(bot: TeleBot, message: TelebotMessage, url: str) -> None:
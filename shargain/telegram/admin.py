@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from shargain.telegram.models import TelegramRegisterToken, TelegramUser
+from shargain.telegram.models import ConversationStep, TelegramRegisterToken, TelegramUpdate, TelegramUser
 
 
 @admin.register(TelegramRegisterToken)
@@ -11,3 +11,15 @@ class TelegramRegisterTokenAdmin(admin.ModelAdmin):
 @admin.register(TelegramUser)
 class TelegramUserAdmin(admin.ModelAdmin):
     pass
+
+
+@admin.register(ConversationStep)
+class ConversationStepAdmin(admin.ModelAdmin):
+    list_display = ("kind", "group_id", "callback", "expires_at")
+    list_filter = ("kind",)
+
+
+@admin.register(TelegramUpdate)
+class TelegramUpdateAdmin(admin.ModelAdmin):
+    list_display = ("update_id", "chat_id", "received_at", "processed_at")
+    search_fields = ("=chat_id",)
@@ -1,11 +1,14 @@
 from .add_scraping_link_handler import AddScrapingLinkHandler
 from .base import HandlerResult, MessageProtocol
+from .chat_target_resolver import ChatTarget, ChatTargetResolver
 from .delete_scraping_link_handler import DeleteScrapingLinkHandler
 from .list_scraping_links_handler import ListScrapingLinksHandler
 from .setup_scraping_target_handler import SetupScrapingTargetHandler
 
 __all__ = (
     "AddScrapingLinkHandler",
+    "ChatTarget",
+    "ChatTargetResolver",
     "DeleteScrapingLinkHandler",
     "ListScrapingLinksHandler",
     "SetupScrapingTargetHandler",
@@ -1,9 +1,10 @@
 import logging
 
-from shargain.notifications.models import NotificationConfig
-from shargain.offers.models import ScrapingUrl, ScrappingTarget
+from shargain.offers.application.query_cache import invalidate_target_owner_queries
+from shargain.offers.models import ScrapingUrl
 
 from .base import HandlerResult
+from .chat_target_resolver import ChatTargetResolver
 
 logger = logging.getLogger(__name__)
 
@@ -11,12 +12,14 @@ logger = logging.getLogger(__name__)
 class AddScrapingLinkHandler:
     @staticmethod
     def handle(chat_id: int, url: str, name: str) -> HandlerResult:
-        if not (notification_config := NotificationConfig.objects.filter(chatid=chat_id).first()):
+        chat_target = ChatTargetResolver.resolve(chat_id)
+        if not chat_target.is_configured:
             logger.info("Notification config does not exist [chat_id=%s]", chat_id)
             return HandlerResult.as_failure("You need to configure notifications first. Use /configure command")
-        if not (scraping_target := ScrappingTarget.objects.filter(notification_config=notification_config).first()):
+        if not chat_target.scraping_target_id:
             return HandlerResult.as_failure(
                 "You haven't configured this chat yet (use /configure command or contact administrator)"
             )
-        ScrapingUrl.objects.create(url=url, scraping_target=scraping_target, name=name)
+        ScrapingUrl.objects.create(url=url, scraping_target_id=chat_target.scraping_target_id, name=name)
+        invalidate_target_owner_queries(chat_target.scraping_target_id)
         return HandlerResult.as_success("Link added successfully. You will be notified about new offers soon")
@@ -0,0 +1,58 @@
+import dataclasses
+import logging
+
+from django.core.cache import cache
+
+from shargain.commons.cache import CacheNamespace
+from shargain.notifications.models import NotificationConfig
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass(frozen=True)
+class ChatTarget:
+    notification_config_id: int | None = None
+    scraping_target_id: int | None = None
+
+    @property
+    def is_configured(self) -> bool:
+        return self.notification_config_id is not None
+
+
+class ChatTargetResolver:
+    """
+    Resolves Telegram chat_id into the notification config and scraping target bound to it.
+
+    Results are cached for a short time. Cache keys contain a version which is bumped whenever a notification config
+    or a scraping target changes (see ``shargain.telegram.signals``), so stale entries are never read after a write.
+    Chats which are not configured aren't cached, so a chat is resolved as soon as it gets linked.
+    """
+
+    CACHE_TTL = 60
+    cache_namespace = CacheNamespace("telegram:chat-target")
+
+    @classmethod
+    def invalidate(cls) -> None:
+        cls.cache_namespace.invalidate()
+
+    @staticmethod
+    def _fetch(chat_id: int | str) -> ChatTarget:
+        row = (
+            NotificationConfig.objects.filter(chatid=chat_id)
+            .order_by("id", "scrappingtarget__id")
+            .values_list("id", "scrappingtarget__id")
+            .first()
+        )
+        if not row:
+            return ChatTarget()
+        return ChatTarget(notification_config_id=row[0], scraping_target_id=row[1])
+
+    @classmethod
+    def resolve(cls, chat_id: int | str) -> ChatTarget:
+        cache_key = cls.cache_namespace.make_key(chat_id)
+        if (chat_target := cache.get(cache_key)) is not None:
+            return chat_target
+        chat_target = cls._fetch(chat_id)
+        if chat_target.is_configured:
+            cache.set(cache_key, chat_target, timeout=cls.CACHE_TTL)
+        return chat_target
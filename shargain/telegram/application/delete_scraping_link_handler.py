@@ -3,10 +3,11 @@ import logging
 from django.db.models import QuerySet
 from django.utils.translation import gettext as _
 
-from shargain.notifications.models import NotificationConfig
-from shargain.offers.models import ScrapingUrl, ScrappingTarget
+from shargain.offers.application.query_cache import invalidate_target_owner_queries
+from shargain.offers.models import ScrapingUrl
 
 from .base import HandlerResult
+from .chat_target_resolver import ChatTargetResolver
 from .list_scraping_links_handler import ListScrapingLinksHandler
 
 logger = logging.getLogger(__name__)
@@ -15,16 +16,17 @@ logger = logging.getLogger(__name__)
 class DeleteScrapingLinkHandler:
     @staticmethod
     def handle(chat_id: int, index: int) -> HandlerResult:
-        if not (notification_config := NotificationConfig.objects.filter(chatid=chat_id).first()):
+        chat_target = ChatTargetResolver.resolve(chat_id)
+        if not chat_target.is_configured:
             logger.info("Notification config does not exist [chat_id=%s]", chat_id)
             return HandlerResult.as_failure(_("You need to configure notifications first. Use /configure command"))
 
-        if not (scraping_target := ScrappingTarget.objects.filter(notification_config=notification_config).first()):
+        if not chat_target.scraping_target_id:
             return HandlerResult.as_failure(
                 _("You haven't configured this chat yet (use /configure command or contact administrator)")
             )
 
-        scraping_urls = ListScrapingLinksHandler.get_scraping_urls(scraping_target)
+        scraping_urls = ListScrapingLinksHandler.get_scraping_urls(chat_target.scraping_target_id)
         return DeleteScrapingLinkHandler.delete_scraping_url_by_index(scraping_urls, index)
 
     @staticmethod
@@ -33,8 +35,9 @@ class DeleteScrapingLinkHandler:
             return HandlerResult.as_failure(_("Scraping url with this index does not exist. Check /list command"))
 
         list_scraping_urls = list(scraping_urls)
-        scraping_urls[index].delete()
-        list_scraping_urls.pop(index)
+        deleted_url = list_scraping_urls.pop(index)
+        deleted_url.delete()
+        invalidate_target_owner_queries(deleted_url.scraping_target_id)
 
         if not list_scraping_urls:
             return HandlerResult.as_success(_("Link deleted. No more links to display."))
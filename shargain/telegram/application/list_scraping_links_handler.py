@@ -4,17 +4,17 @@ from collections.abc import Iterable
 from django.db.models import QuerySet
 from django.utils.translation import gettext as _
 
-from shargain.notifications.models import NotificationConfig
-from shargain.offers.models import ScrapingUrl, ScrappingTarget
+from shargain.offers.models import ScrapingUrl
 from shargain.telegram.application.base import HandlerResult
+from shargain.telegram.application.chat_target_resolver import ChatTargetResolver
 
 logger = logging.getLogger(__name__)
 
 
 class ListScrapingLinksHandler:
     @staticmethod
-    def get_scraping_urls(scraping_target: ScrappingTarget) -> QuerySet[ScrapingUrl]:
-        return scraping_target.scrapingurl_set.order_by("id")
+    def get_scraping_urls(scraping_target_id: int) -> QuerySet[ScrapingUrl]:
+        return ScrapingUrl.objects.filter(scraping_target_id=scraping_target_id).order_by("id")
 
     @classmethod
     def format_output(cls, scraping_urls: Iterable[ScrapingUrl]) -> str:
@@ -31,15 +31,11 @@ class ListScrapingLinksHandler:
         return result
 
     def get_urls_by_chat_id(self, chat_id: int) -> Iterable[ScrapingUrl]:
-        notification_config = NotificationConfig.objects.filter(chatid=chat_id).first()
-        if not notification_config:
+        chat_target = ChatTargetResolver.resolve(chat_id)
+        if not chat_target.scraping_target_id:
             return []
 
-        scraping_target = ScrappingTarget.objects.filter(notification_config=notification_config).first()
-        if not scraping_target:
-            return []
-
-        return self.get_scraping_urls(scraping_target)
+        return self.get_scraping_urls(chat_target.scraping_target_id)
 
     def handle(self, chat_id: int) -> HandlerResult:
         """
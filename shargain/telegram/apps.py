@@ -8,6 +8,8 @@ class TelegramConfig(AppConfig):
     _TELEGRAM_INITIALIZED = False
 
     def ready(self):
+        from . import signals  # noqa: F401
+
         if not self.__class__._TELEGRAM_INITIALIZED:
             from . import add_link_flow, detect_list_url  # noqa: F401
 
@@ -29,6 +29,8 @@ from shargain.telegram.application import (
     MessageProtocol,
     SetupScrapingTargetHandler,
 )
+from shargain.telegram.handler_backends import DatabaseHandlerBackend
+from shargain.telegram.models import ConversationStepKind
 
 logger = logging.getLogger(__name__)
 
@@ -51,27 +53,38 @@ class TelegramBot:
 
     @classmethod
     def get_bot(cls):
+        """
+        Returns the bot instance used for registering handlers. It doesn't communicate with Telegram,
+        so it's safe to call at import time.
+        """
         if not cls._bot:
-            cls._bot = TeleBot(settings.TELEGRAM_BOT_TOKEN, threaded=False, use_class_middlewares=True)
+            cls._bot = TeleBot(
+                settings.TELEGRAM_BOT_TOKEN,
+                threaded=False,
+                use_class_middlewares=True,
+                next_step_backend=DatabaseHandlerBackend(ConversationStepKind.NEXT_STEP),
+                reply_backend=DatabaseHandlerBackend(ConversationStepKind.REPLY),
+            )
             cls._bot.setup_middleware(SetLanguageMiddleware())
-            cls._configure_bot()
-            return cls._bot
         return cls._bot
 
     @classmethod
-    def _configure_bot(cls):
-        if not settings.TELEGRAM_SETUP_BOT:
-            return
+    def configure_remote(cls):
+        """
+        Configures bot commands and webhook on Telegram's side. It performs network calls,
+        so it should be run once per deployment (see ``setup_telegram_bot`` management command).
+        """
+        bot = cls.get_bot()
         for lang in ["en", "pl"]:
             with override(lang):
-                cls._bot.set_my_commands(
+                bot.set_my_commands(
                     [
                         BotCommand("menu", _("Show menu")),
                     ],
                     language_code=lang,
                 )
         if settings.TELEGRAM_WEBHOOK_URL:
-            cls._bot.set_webhook(url=settings.TELEGRAM_WEBHOOK_URL)
+            bot.set_webhook(url=settings.TELEGRAM_WEBHOOK_URL)
 
     @classmethod
     def _set_logging_level(cls, logging_level: int):
@@ -238,7 +251,7 @@ def _ask_for_link_to_delete(message: Message):
 
     bot.send_message(
         chat_id,
-        ListScrapingLinksHandler().handle(chat_id=chat_id).message,
+        ListScrapingLinksHandler.format_output(urls),
         parse_mode="HTML",
     )
 
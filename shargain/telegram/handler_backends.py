@@ -0,0 +1,80 @@
+"""
+Storage for telebot's next step and reply handlers shared between processes.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from telebot import Handler
+from telebot.handler_backends import HandlerBackend
+
+from shargain.telegram.models import ConversationStep, ConversationStepKind
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseHandlerBackend(HandlerBackend):
+    """
+    Keeps pending handlers in the database, so that the next message of a conversation may be
+    processed by any worker.
+
+    Handlers are stored as an import path of the callback and its JSON serializable arguments, so
+    callbacks must be module level functions (not lambdas or closures). Handlers are popped atomically
+    with ``SELECT ... FOR UPDATE SKIP LOCKED``, hence only one worker executes them. Handlers which
+    weren't used within ``TELEGRAM_CONVERSATION_TTL`` seconds expire.
+    """
+
+    def __init__(self, kind: ConversationStepKind):
+        super().__init__()
+        self.kind = kind
+
+    @staticmethod
+    def get_callback_path(callback) -> str:
+        qualname = getattr(callback, "__qualname__", "")
+        if not qualname or "<" in qualname:
+            raise ValueError(f"Handler callback must be a module level function, got {callback!r}")
+        return f"{callback.__module__}.{qualname}"
+
+    def _get_queryset(self, handler_group_id):
+        return ConversationStep.objects.filter(kind=self.kind, group_id=str(handler_group_id))
+
+    def register_handler(self, handler_group_id, handler):
+        now = timezone.now()
+        ConversationStep.objects.filter(expires_at__lte=now).delete()
+        ConversationStep.objects.create(
+            kind=self.kind,
+            group_id=str(handler_group_id),
+            callback=self.get_callback_path(handler.callback),
+            args=list(handler.args),
+            kwargs=handler.kwargs,
+            expires_at=now + timedelta(seconds=settings.TELEGRAM_CONVERSATION_TTL),
+        )
+
+    def clear_handlers(self, handler_group_id):
+        self._get_queryset(handler_group_id).delete()
+
+    def get_handlers(self, handler_group_id):
+        with transaction.atomic():
+            steps = list(
+                self._get_queryset(handler_group_id)
+                .filter(expires_at__gt=timezone.now())
+                .select_for_update(skip_locked=True)
+                .order_by("id")
+            )
+            if not steps:
+                return None
+            ConversationStep.objects.filter(id__in=[step.id for step in steps]).delete()
+
+        handlers = []
+        for step in steps:
+            try:
+                callback = import_string(step.callback)
+            except ImportError:
+                logger.error("Conversation step handler does not exist [callback=%s]", step.callback)
+                continue
+            handlers.append(Handler(callback, *step.args, **step.kwargs))
+        return handlers
@@ -0,0 +1,15 @@
+import djclick as click
+from django.conf import settings
+
+from shargain.telegram.bot import TelegramBot
+
+
+@click.command()
+@click.option("--force", is_flag=True, help="Configure the bot even if TELEGRAM_SETUP_BOT is disabled")
+def main(force: bool):
+    """Registers bot commands and webhook in Telegram."""
+    if not (settings.TELEGRAM_SETUP_BOT or force):
+        click.echo("TELEGRAM_SETUP_BOT is disabled, skipping")
+        return
+    TelegramBot.configure_remote()
+    click.secho("Telegram bot configured", fg="green")
@@ -0,0 +1,45 @@
+# Generated by Django 4.1.4 on 2026-10-19 11:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("telegram", "0002_telegramregistertoken_name"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ConversationStep",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("next_step", "Next step"), ("reply", "Reply")], max_length=20, verbose_name="Kind"
+                    ),
+                ),
+                (
+                    "group_id",
+                    models.CharField(
+                        help_text="Chat ID for next step handlers, message ID for reply handlers",
+                        max_length=64,
+                        verbose_name="Group ID",
+                    ),
+                ),
+                (
+                    "callback",
+                    models.CharField(help_text="Import path of the handler", max_length=255, verbose_name="Callback"),
+                ),
+                ("args", models.JSONField(blank=True, default=list, verbose_name="Arguments")),
+                ("kwargs", models.JSONField(blank=True, default=dict, verbose_name="Keyword arguments")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("expires_at", models.DateTimeField(db_index=True, verbose_name="Expires at")),
+            ],
+            options={
+                "verbose_name": "Conversation step",
+                "verbose_name_plural": "Conversation steps",
+                "indexes": [models.Index(fields=["kind", "group_id"], name="telegram_step_kind_group_idx")],
+            },
+        ),
+    ]
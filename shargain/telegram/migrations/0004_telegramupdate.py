@@ -0,0 +1,38 @@
+# Generated by Django 4.1.4 on 2026-10-19 16:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("telegram", "0003_conversationstep"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TelegramUpdate",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("update_id", models.BigIntegerField(unique=True, verbose_name="Update ID")),
+                ("chat_id", models.BigIntegerField(blank=True, null=True, verbose_name="Chat ID")),
+                ("payload", models.JSONField(verbose_name="Payload")),
+                ("received_at", models.DateTimeField(auto_now_add=True, verbose_name="Received at")),
+                (
+                    "processed_at",
+                    models.DateTimeField(blank=True, db_index=True, null=True, verbose_name="Processed at"),
+                ),
+            ],
+            options={
+                "verbose_name": "Telegram update",
+                "verbose_name_plural": "Telegram updates",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="telegramupdate",
+            index=models.Index(
+                condition=models.Q(("processed_at", None)),
+                fields=["chat_id", "update_id"],
+                name="telegram_update_pending_idx",
+            ),
+        ),
+    ]
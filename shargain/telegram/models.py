@@ -2,6 +2,7 @@ import uuid
 
 from django.conf import settings
 from django.db import models
+from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
 
 
@@ -54,3 +55,64 @@ class TelegramRegisterToken(models.Model):
 
     def __str__(self):
         return f"Token for {self.user} - {'Used' if self.is_used else 'Active'}"
+
+
+class ConversationStepKind(models.TextChoices):
+    NEXT_STEP = "next_step", _("Next step")
+    REPLY = "reply", _("Reply")
+
+
+class ConversationStep(models.Model):
+    """
+    Pending next step (or reply) handler of a Telegram conversation.
+
+    Stored in the database so that the reply can be handled by any process, not only the one
+    which started the conversation.
+    """
+
+    kind = models.CharField(max_length=20, choices=ConversationStepKind.choices, verbose_name=_("Kind"))
+    group_id = models.CharField(
+        max_length=64,
+        verbose_name=_("Group ID"),
+        help_text=_("Chat ID for next step handlers, message ID for reply handlers"),
+    )
+    callback = models.CharField(max_length=255, verbose_name=_("Callback"), help_text=_("Import path of the handler"))
+    args = models.JSONField(default=list, blank=True, verbose_name=_("Arguments"))
+    kwargs = models.JSONField(default=dict, blank=True, verbose_name=_("Keyword arguments"))
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(verbose_name=_("Expires at"), db_index=True)
+
+    class Meta:
+        verbose_name = _("Conversation step")
+        verbose_name_plural = _("Conversation steps")
+        indexes = [models.Index(fields=["kind", "group_id"], name="telegram_step_kind_group_idx")]
+
+    def __str__(self) -> str:
+        return f"{self.kind} {self.group_id} -> {self.callback}"
+
+
+class TelegramUpdate(models.Model):
+    """
+    Webhook update received from Telegram.
+
+    Updates are stored before they are acknowledged, so that none is lost when a process dies, and are processed by
+    Celery tasks in order of update_id within their chat (see ``shargain.telegram.update_queue``).
+    """
+
+    update_id = models.BigIntegerField(unique=True, verbose_name=_("Update ID"))
+    chat_id = models.BigIntegerField(null=True, blank=True, verbose_name=_("Chat ID"))
+    payload = models.JSONField(verbose_name=_("Payload"))
+    received_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Received at"))
+    processed_at = models.DateTimeField(null=True, blank=True, db_index=True, verbose_name=_("Processed at"))
+
+    class Meta:
+        verbose_name = _("Telegram update")
+        verbose_name_plural = _("Telegram updates")
+        indexes = [
+            models.Index(
+                fields=["chat_id", "update_id"], name="telegram_update_pending_idx", condition=Q(processed_at=None)
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.update_id} ({self.chat_id})"
@@ -0,0 +1,14 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from shargain.notifications.models import NotificationConfig
+from shargain.offers.models import ScrappingTarget
+from shargain.telegram.application.chat_target_resolver import ChatTargetResolver
+
+
+@receiver(post_save, sender=NotificationConfig)
+@receiver(post_delete, sender=NotificationConfig)
+@receiver(post_save, sender=ScrappingTarget)
+@receiver(post_delete, sender=ScrappingTarget)
+def invalidate_chat_targets(sender, **kwargs):
+    ChatTargetResolver.invalidate()
@@ -0,0 +1,21 @@
+import logging
+
+from celery import shared_task
+from django.conf import settings
+
+from shargain.telegram import update_queue
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def process_telegram_chat_updates(chat_id=None):
+    update_queue.process_chat_updates(chat_id)
+
+
+@shared_task
+def process_pending_telegram_updates():
+    """Processes updates whose task was lost and deletes old processed updates."""
+    processed = sum(update_queue.process_chat_updates(chat_id) for chat_id in update_queue.get_pending_chat_ids())
+    pruned = update_queue.prune_processed_updates(settings.TELEGRAM_UPDATE_RETENTION)
+    logger.info("Processed pending telegram updates [processed=%s] [pruned=%s]", processed, pruned)
@@ -0,0 +1,59 @@
+import pytest
+from django.core.cache import cache
+
+from shargain.notifications.models import NotificationConfig
+from shargain.notifications.tests.factories import NotificationConfigFactory
+from shargain.offers.tests.factories import ScrappingTargetFactory
+from shargain.telegram.application import ChatTarget, ChatTargetResolver
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.mark.django_db
+class TestChatTargetResolver:
+    def test_resolve_returns_config_and_target(self):
+        config = NotificationConfigFactory(chatid="111")
+        target = ScrappingTargetFactory(notification_config=config)
+
+        assert ChatTargetResolver.resolve(111) == ChatTarget(
+            notification_config_id=config.id, scraping_target_id=target.id
+        )
+
+    def test_resolve_returns_config_without_target(self):
+        config = NotificationConfigFactory(chatid="111")
+
+        result = ChatTargetResolver.resolve(111)
+
+        assert result.is_configured
+        assert result == ChatTarget(notification_config_id=config.id)
+
+    def test_resolve_returns_empty_result_for_unknown_chat(self):
+        assert not ChatTargetResolver.resolve(999).is_configured
+
+    def test_resolve_uses_cache(self, django_assert_num_queries):
+        NotificationConfigFactory(chatid="111")
+        ChatTargetResolver.resolve(111)
+
+        with django_assert_num_queries(0):
+            ChatTargetResolver.resolve(111)
+
+    def test_resolve_does_not_cache_unknown_chat(self):
+        assert not ChatTargetResolver.resolve(111).is_configured
+
+        # linked without signals, e.g. by a bulk update
+        NotificationConfig.objects.filter(id=NotificationConfigFactory(chatid="222").id).update(chatid="111")
+
+        assert ChatTargetResolver.resolve(111).is_configured
+
+    def test_target_change_invalidates_cache(self):
+        config = NotificationConfigFactory(chatid="111")
+        assert ChatTargetResolver.resolve(111).scraping_target_id is None
+
+        target = ScrappingTargetFactory(notification_config=config)
+
+        assert ChatTargetResolver.resolve(111).scraping_target_id == target.id
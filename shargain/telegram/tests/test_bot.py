@@ -0,0 +1,21 @@
+from unittest import mock
+
+from shargain.telegram.bot import TelegramBot
+
+
+class TestTelegramBot:
+    def test_get_bot_does_not_call_telegram(self):
+        with mock.patch("telebot.apihelper._make_request") as m_make_request:
+            TelegramBot.get_bot()
+
+        m_make_request.assert_not_called()
+
+    def test_configure_remote_sets_commands_and_webhook(self, settings):
+        settings.TELEGRAM_WEBHOOK_URL = "https://example.com/api/webhooks/telegram/token/"
+        bot = mock.Mock()
+
+        with mock.patch.object(TelegramBot, "get_bot", return_value=bot):
+            TelegramBot.configure_remote()
+
+        assert [call.kwargs["language_code"] for call in bot.set_my_commands.call_args_list] == ["en", "pl"]
+        bot.set_webhook.assert_called_once_with(url=settings.TELEGRAM_WEBHOOK_URL)
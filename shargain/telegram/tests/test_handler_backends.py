@@ -0,0 +1,52 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from telebot import Handler
+
+from shargain.telegram.add_link_flow import handle_name_reply
+from shargain.telegram.handler_backends import DatabaseHandlerBackend
+from shargain.telegram.models import ConversationStep, ConversationStepKind
+
+
+@pytest.fixture
+def backend() -> DatabaseHandlerBackend:
+    return DatabaseHandlerBackend(ConversationStepKind.NEXT_STEP)
+
+
+class TestDatabaseHandlerBackend:
+    def test_lambda_callback_is_rejected(self, backend):
+        with pytest.raises(ValueError, match="module level function"):
+            backend.get_callback_path(lambda message: None)
+
+    @pytest.mark.django_db
+    def test_registered_handler_is_returned_once(self, backend):
+        backend.register_handler(42, Handler(handle_name_reply, "https://www.olx.pl/nieruchomosci/"))
+
+        handlers = backend.get_handlers(42)
+
+        assert len(handlers) == 1
+        assert handlers[0].callback is handle_name_reply
+        assert handlers[0].args == ("https://www.olx.pl/nieruchomosci/",)
+        assert backend.get_handlers(42) is None
+
+    @pytest.mark.django_db
+    def test_handlers_are_separated_by_kind(self, backend):
+        backend.register_handler(42, Handler(handle_name_reply, "url"))
+
+        assert DatabaseHandlerBackend(ConversationStepKind.REPLY).get_handlers(42) is None
+
+    @pytest.mark.django_db
+    def test_expired_handler_is_not_returned(self, backend):
+        backend.register_handler(42, Handler(handle_name_reply, "url"))
+        ConversationStep.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+
+        assert backend.get_handlers(42) is None
+
+    @pytest.mark.django_db
+    def test_clear_handlers(self, backend):
+        backend.register_handler(42, Handler(handle_name_reply, "url"))
+
+        backend.clear_handlers(42)
+
+        assert not ConversationStep.objects.exists()
@@ -0,0 +1,154 @@
+import threading
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.db import connection, transaction
+from django.test import Client, TestCase
+from django.utils import timezone
+
+from shargain.telegram import update_queue
+from shargain.telegram.models import TelegramUpdate
+from shargain.telegram.update_queue import PendingUpdatesCollector, get_update_chat_id
+
+
+def _message_update(update_id: int, chat_id: int) -> dict:
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": 0,
+            "chat": {"id": chat_id, "type": "private"},
+            "text": f"message {update_id}",
+        },
+    }
+
+
+@pytest.fixture
+def m_delay():
+    with mock.patch("shargain.telegram.tasks.process_telegram_chat_updates.delay") as m_delay:
+        yield m_delay
+
+
+@pytest.fixture
+def m_bot():
+    with mock.patch.object(update_queue.TelegramBot, "get_bot") as m_get_bot:
+        yield m_get_bot.return_value
+
+
+class TestGetUpdateChatId:
+    def test_message_update(self):
+        assert get_update_chat_id(_message_update(1, 42)) == 42
+
+    def test_callback_query_update(self):
+        raw_update = {"update_id": 1, "callback_query": {"id": "1", "message": {"chat": {"id": 42}}}}
+
+        assert get_update_chat_id(raw_update) == 42
+
+    def test_unknown_update(self):
+        assert get_update_chat_id({"update_id": 1, "poll": {}}) is None
+
+
+@pytest.mark.django_db
+class TestPutUpdate:
+    def test_stores_update_and_schedules_its_chat(self, m_delay):
+        with TestCase.captureOnCommitCallbacks(execute=True):
+            update_queue.put_update(_message_update(1, 42))
+
+        assert TelegramUpdate.objects.get().chat_id == 42
+        m_delay.assert_called_once_with(42)
+
+    def test_ignores_redelivered_update(self, m_delay):
+        update_queue.put_update(_message_update(1, 42))
+
+        with TestCase.captureOnCommitCallbacks(execute=True):
+            update_queue.put_update(_message_update(1, 42))
+
+        assert TelegramUpdate.objects.count() == 1
+        m_delay.assert_not_called()
+
+    def test_rejects_update_without_id(self):
+        with pytest.raises(ValueError, match="update_id"):
+            update_queue.put_update({"message": {}})
+
+    def test_webhook_acknowledges_stored_update(self, m_delay):
+        response = Client().post(
+            "/api/webhooks/telegram/token/", _message_update(1, 42), content_type="application/json"
+        )
+
+        assert response.status_code == 200
+        assert TelegramUpdate.objects.filter(update_id=1).exists()
+
+
+@pytest.mark.django_db
+class TestProcessChatUpdates:
+    def test_processes_updates_of_chat_in_order(self, m_bot):
+        for update_id, chat_id in [(3, 42), (1, 42), (2, 7), (2_000, 42)]:
+            update_queue.put_update(_message_update(update_id, chat_id))
+
+        assert update_queue.process_chat_updates(42) == 3
+
+        processed = [call.args[0][0].update_id for call in m_bot.process_new_updates.call_args_list]
+        assert processed == [1, 3, 2_000]
+        assert list(TelegramUpdate.objects.filter(processed_at=None).values_list("update_id", flat=True)) == [2]
+
+    def test_failed_update_does_not_block_chat(self, m_bot):
+        m_bot.process_new_updates.side_effect = [Exception("handler error"), None]
+        update_queue.put_update(_message_update(1, 42))
+        update_queue.put_update(_message_update(2, 42))
+
+        assert update_queue.process_chat_updates(42) == 2
+        assert not TelegramUpdate.objects.filter(processed_at=None).exists()
+
+    def test_pending_updates_are_processed_and_old_ones_pruned(self, m_bot):
+        update_queue.put_update(_message_update(1, 42))
+        update_queue.put_update(_message_update(2, 7))
+        update_queue.put_update({"update_id": 3, "poll": {"id": "1"}})
+        TelegramUpdate.objects.filter(update_id=1).update(processed_at=timezone.now() - timedelta(days=2))
+
+        assert sorted(update_queue.get_pending_chat_ids(), key=str) == [7, None]
+        assert update_queue.prune_processed_updates(timedelta(days=1)) == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_chat_locked_by_another_task_is_left_to_it(m_bot):
+    update_queue.put_update(_message_update(1, 42))
+    locked, release = threading.Event(), threading.Event()
+
+    def process_in_another_task():
+        with transaction.atomic():
+            TelegramUpdate.objects.select_for_update().filter(chat_id=42).first()
+            locked.set()
+            release.wait(timeout=5)
+        connection.close()
+
+    another_task = threading.Thread(target=process_in_another_task)
+    another_task.start()
+    locked.wait(timeout=5)
+    try:
+        assert update_queue.process_chat_updates(42) == 0
+    finally:
+        release.set()
+        another_task.join()
+
+    m_bot.process_new_updates.assert_not_called()
+    assert update_queue.process_chat_updates(42) == 1
+
+
+@pytest.mark.django_db
+class TestPendingUpdatesCollector:
+    def test_collects_pending_updates(self):
+        update_queue.put_update(_message_update(1, 42))
+        update_queue.put_update(_message_update(2, 42))
+        TelegramUpdate.objects.filter(update_id=1).update(received_at=timezone.now() - timedelta(minutes=5))
+        TelegramUpdate.objects.filter(update_id=2).update(processed_at=timezone.now())
+
+        pending, oldest_age = PendingUpdatesCollector().collect()
+
+        assert pending.samples[0].value == 1
+        assert oldest_age.samples[0].value == pytest.approx(5 * 60, abs=5)
+
+    def test_no_pending_updates(self):
+        pending, oldest_age = PendingUpdatesCollector().collect()
+
+        assert (pending.samples[0].value, oldest_age.samples[0].value) == (0, 0)
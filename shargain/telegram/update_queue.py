@@ -0,0 +1,167 @@
+"""
+Persistent queue of Telegram webhook updates.
+
+The webhook stores the raw update in the database and only then acknowledges it, so accepted updates survive
+restarts and deploys. Updates are processed by the ``process_telegram_chat_updates`` Celery task of their chat. Every
+update is processed in its own transaction which locks the oldest pending update of the chat: updates from one chat
+are handled strictly in order of update_id, while different chats are processed in parallel. A task which finds
+the chat locked returns at once, as the task holding the lock processes the chat's remaining updates, including
+the ones stored in the meantime. Updates whose task was lost (e.g. because the broker was unavailable) are picked up
+by the periodic ``process_pending_telegram_updates`` task.
+
+Handlers run inside the transaction, so it stays open during their requests to the Telegram API (bounded by
+telebot's timeouts). That's the price of committing changes made by a handler together with marking its update
+processed: an update interrupted by a crash is processed again without leftovers of the first attempt. The lock
+only concerns the chat's pending updates, which couldn't be processed earlier anyway, and no task waits for it.
+
+``shargain_telegram_update_processing_lag_seconds`` is observed in Celery workers and exported by their metrics
+exporter (see ``shargain.commons.metrics``), while the number and the age of pending updates are computed from
+the database when the web process is scraped, so a stalled queue is visible even when no update is processed.
+"""
+
+import logging
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+from typing import Any
+
+from django.db import IntegrityError, OperationalError, transaction
+from django.db.models import Count, Min
+from django.utils import timezone
+from prometheus_client import REGISTRY, Histogram
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import Collector
+from telebot.types import Update
+
+from shargain.telegram.bot import TelegramBot
+from shargain.telegram.models import TelegramUpdate
+
+logger = logging.getLogger(__name__)
+
+UPDATE_PROCESSING_LAG = Histogram(
+    "shargain_telegram_update_processing_lag_seconds",
+    "Time between receiving a Telegram update and finishing its processing",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+LOCK_NOT_AVAILABLE = "55P03"
+
+
+class PendingUpdatesCollector(Collector):
+    """Exports the number of pending updates and the age of the oldest one, queried when metrics are collected."""
+
+    def describe(self) -> Iterator[GaugeMetricFamily]:
+        # Without it the registry would collect the metrics (i.e. query the database) on registration
+        yield GaugeMetricFamily("shargain_telegram_pending_updates", "")
+        yield GaugeMetricFamily("shargain_telegram_oldest_pending_update_age_seconds", "")
+
+    def collect(self) -> Iterator[GaugeMetricFamily]:
+        pending = TelegramUpdate.objects.filter(processed_at=None).aggregate(
+            count=Count("id"), oldest=Min("received_at")
+        )
+        yield GaugeMetricFamily(
+            "shargain_telegram_pending_updates", "Telegram updates waiting for processing", value=pending["count"]
+        )
+        yield GaugeMetricFamily(
+            "shargain_telegram_oldest_pending_update_age_seconds",
+            "Time since the oldest pending Telegram update was received",
+            value=(timezone.now() - pending["oldest"]).total_seconds() if pending["oldest"] else 0.0,
+        )
+
+
+REGISTRY.register(PendingUpdatesCollector())
+
+
+def get_update_chat_id(raw_update: dict[str, Any]) -> int | None:
+    """Extracts chat_id from a raw (JSON) Telegram update."""
+    for key in ("message", "edited_message", "channel_post", "edited_channel_post"):
+        if chat := (raw_update.get(key) or {}).get("chat"):
+            return chat.get("id")
+    if callback_query := raw_update.get("callback_query"):
+        if chat := (callback_query.get("message") or {}).get("chat"):
+            return chat.get("id")
+        return (callback_query.get("from") or {}).get("id")
+    return None
+
+
+def put_update(raw_update: dict[str, Any]) -> None:
+    """
+    Stores a raw update and schedules processing of its chat. Updates redelivered by Telegram are ignored.
+
+    :raises ValueError: if the update has no update_id
+    """
+    try:
+        update_id = int(raw_update["update_id"])
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError("Telegram update without update_id") from e
+    chat_id = get_update_chat_id(raw_update)
+    try:
+        with transaction.atomic():
+            TelegramUpdate.objects.create(update_id=update_id, chat_id=chat_id, payload=raw_update)
+    except IntegrityError:
+        logger.info("Ignoring redelivered telegram update [update_id=%s]", update_id)
+        return
+    transaction.on_commit(lambda: _schedule_chat(chat_id))
+
+
+def _schedule_chat(chat_id: int | None) -> None:
+    from shargain.telegram.tasks import process_telegram_chat_updates
+
+    try:
+        process_telegram_chat_updates.delay(chat_id)
+    except Exception:
+        # The update is stored, it will be processed by process_pending_telegram_updates
+        logger.exception("Couldn't schedule processing of telegram updates [chat_id=%s]", chat_id)
+
+
+def process_chat_updates(chat_id: int | None) -> int:
+    """
+    Processes pending updates of the chat one by one, oldest first. Returns at once if another task processes
+    the chat.
+
+    :return: number of processed updates
+    """
+    processed = 0
+    while True:
+        try:
+            with transaction.atomic():
+                update = (
+                    TelegramUpdate.objects.select_for_update(nowait=True)
+                    .filter(chat_id=chat_id, processed_at=None)
+                    .order_by("update_id")
+                    .first()
+                )
+                if update is None:
+                    return processed
+                _process(update.payload, update.received_at)
+                update.processed_at = timezone.now()
+                update.save(update_fields=["processed_at"])
+        except OperationalError as e:
+            if getattr(e.__cause__, "pgcode", None) != LOCK_NOT_AVAILABLE:
+                raise
+            logger.info("Telegram updates of the chat are processed by another task [chat_id=%s]", chat_id)
+            return processed
+        processed += 1
+
+
+def _process(raw_update: dict[str, Any], received_at: datetime) -> None:
+    try:
+        # A failed handler must not break the transaction holding the lock of the chat
+        with transaction.atomic():
+            TelegramBot.get_bot().process_new_updates([Update.de_json(raw_update)])
+    except Exception:
+        logger.exception("Error processing telegram update [update_id=%s]", raw_update.get("update_id"))
+    finally:
+        UPDATE_PROCESSING_LAG.observe((timezone.now() - received_at).total_seconds())
+
+
+def get_pending_chat_ids() -> list[int | None]:
+    return list(TelegramUpdate.objects.filter(processed_at=None).values_list("chat_id", flat=True).distinct())
+
+
+def prune_processed_updates(retention: timedelta, now: datetime | None = None) -> int:
+    """
+    Deletes updates processed before the retention window.
+
+    :return: number of deleted updates
+    """
+    cutoff = (now or timezone.now()) - retention
+    return TelegramUpdate.objects.filter(processed_at__lt=cutoff).delete()[0]
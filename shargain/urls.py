@@ -10,6 +10,7 @@ from rest_framework.routers import DefaultRouter
 from shargain.notifications.urls import router as notifications_router
 from shargain.offers.urls import router as offers_router
 from shargain.public_api.api import router as ninja_router
+from shargain.scrapper.urls import router as scrapper_router
 
 schema_view = get_schema_view(
     openapi.Info(
@@ -25,6 +26,7 @@ router = DefaultRouter()
 
 router.registry.extend(offers_router.registry)
 router.registry.extend(notifications_router.registry)
+router.registry.extend(scrapper_router.registry)
 
 urlpatterns = [
     path("admin/", admin.site.urls),